@@ -0,0 +1,30 @@
+"""add rate limit buckets table
+
+Revision ID: a8f7b9c0d1e2
+Revises: f7e6a8b9c0d1
+Create Date: 2026-10-17 13:41:27.602519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8f7b9c0d1e2'
+down_revision: Union[str, Sequence[str], None] = 'f7e6a8b9c0d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rate_limit_buckets",
+        sa.Column("bucket_key", sa.String(length=256), primary_key=True, nullable=False),
+        sa.Column("tokens", sa.Float(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("rate_limit_buckets")
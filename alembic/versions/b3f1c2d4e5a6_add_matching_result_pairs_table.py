@@ -0,0 +1,53 @@
+"""add matching result pairs table
+
+Revision ID: b3f1c2d4e5a6
+Revises: 027cad371351
+Create Date: 2026-10-17 09:12:40.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f1c2d4e5a6'
+down_revision: Union[str, Sequence[str], None] = '027cad371351'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "matching_result_pairs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column(
+            "matching_result_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("matching_results.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("workflow", sa.String(length=32), nullable=False),
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("t", sa.Integer(), nullable=False),
+        sa.Column("rank", sa.Integer(), nullable=False),
+        sa.Column("ask_bid_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("quote_bid_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("units", sa.Numeric(20, 4), nullable=False),
+        sa.Column("ask_unit_price_inr", sa.Numeric(20, 2), nullable=False),
+        sa.Column("quote_inr", sa.Numeric(20, 2), nullable=False),
+        sa.UniqueConstraint(
+            "matching_result_id", "rank", name="uq_matching_result_pair_rank"
+        ),
+    )
+    op.create_index(
+        "ix_matching_result_pair_scope",
+        "matching_result_pairs",
+        ["workflow", "project_id", "t"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_matching_result_pair_scope", table_name="matching_result_pairs")
+    op.drop_table("matching_result_pairs")
@@ -0,0 +1,51 @@
+"""add round market depths table
+
+Revision ID: b9c8d0e1f2a3
+Revises: a8f7b9c0d1e2
+Create Date: 2026-10-17 16:05:12.418220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9c8d0e1f2a3'
+down_revision: Union[str, Sequence[str], None] = 'a8f7b9c0d1e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "round_market_depths",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("workflow", sa.String(length=32), nullable=False),
+        sa.Column(
+            "project_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("projects.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "round_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("rounds.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("t", sa.Integer(), nullable=False),
+        sa.Column(
+            "stats_json",
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=False,
+            server_default=sa.text("'{}'::jsonb"),
+        ),
+        sa.Column("computed_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.UniqueConstraint("workflow", "project_id", "t", name="uq_round_market_depth_scope"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("round_market_depths")
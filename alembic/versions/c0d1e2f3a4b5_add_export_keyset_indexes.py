@@ -0,0 +1,36 @@
+"""add export keyset indexes
+
+Revision ID: c0d1e2f3a4b5
+Revises: b9c8d0e1f2a3
+Create Date: 2026-10-17 17:20:44.903157
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c0d1e2f3a4b5'
+down_revision: Union[str, Sequence[str], None] = 'b9c8d0e1f2a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # exports stream in (created_at, id) order and resume with a row-value
+    # comparison on the same pair
+    op.create_index(
+        "ix_audit_export_keyset",
+        "audit_log_records",
+        ["workflow", "project_id", "created_at", "id"],
+    )
+    op.create_index(
+        "ix_contract_export_keyset",
+        "tokenized_contract_records",
+        ["workflow", "project_id", "created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_contract_export_keyset", table_name="tokenized_contract_records")
+    op.drop_index("ix_audit_export_keyset", table_name="audit_log_records")
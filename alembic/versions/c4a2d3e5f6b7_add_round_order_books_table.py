@@ -0,0 +1,51 @@
+"""add round order books table
+
+Revision ID: c4a2d3e5f6b7
+Revises: b3f1c2d4e5a6
+Create Date: 2026-10-17 10:05:12.402981
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a2d3e5f6b7'
+down_revision: Union[str, Sequence[str], None] = 'b3f1c2d4e5a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "round_order_books",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("workflow", sa.String(length=32), nullable=False),
+        sa.Column(
+            "project_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("projects.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "round_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("rounds.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("t", sa.Integer(), nullable=False),
+        sa.Column("quotes_json", postgresql.JSONB, nullable=False, server_default=sa.text("'[]'::jsonb")),
+        sa.Column("asks_json", postgresql.JSONB, nullable=False, server_default=sa.text("'[]'::jsonb")),
+        sa.Column("locked_quote_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("locked_ask_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("locked_preference_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.UniqueConstraint("workflow", "project_id", "t", name="uq_round_order_book_scope"),
+        sa.UniqueConstraint("round_id", name="uq_round_order_book_round"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("round_order_books")
@@ -0,0 +1,59 @@
+"""add export jobs table
+
+Revision ID: d1e2f3a4b5c6
+Revises: c0d1e2f3a4b5
+Create Date: 2026-10-17 18:02:37.114806
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1e2f3a4b5c6'
+down_revision: Union[str, Sequence[str], None] = 'c0d1e2f3a4b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "export_jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("params_hash", sa.String(length=64), nullable=False),
+        sa.Column("kind", sa.String(length=32), nullable=False),
+        sa.Column("format", sa.String(length=16), nullable=False),
+        sa.Column(
+            "params_json",
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=False,
+            server_default=sa.text("'{}'::jsonb"),
+        ),
+        sa.Column("status", sa.String(length=16), nullable=False, server_default=sa.text("'queued'")),
+        sa.Column("requested_by", sa.String(length=128), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("file_name", sa.String(length=128), nullable=True),
+        sa.Column("row_count", sa.Integer(), nullable=True),
+        sa.Column("byte_size", sa.BigInteger(), nullable=True),
+        sa.Column("sha256", sa.String(length=64), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+    )
+    # one live job per parameter set (dedup); failed / expired ones may repeat
+    op.create_index(
+        "uq_export_job_live_params",
+        "export_jobs",
+        ["params_hash"],
+        unique=True,
+        postgresql_where=sa.text("status IN ('queued', 'running', 'succeeded')"),
+    )
+    op.create_index("ix_export_job_status", "export_jobs", ["status"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_export_job_status", table_name="export_jobs")
+    op.drop_index("uq_export_job_live_params", table_name="export_jobs")
+    op.drop_table("export_jobs")
@@ -0,0 +1,52 @@
+"""add quote bid qbundle_inr column
+
+Revision ID: d5b3e4f6a7c8
+Revises: c4a2d3e5f6b7
+Create Date: 2026-10-17 10:48:31.774520
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5b3e4f6a7c8'
+down_revision: Union[str, Sequence[str], None] = 'c4a2d3e5f6b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "quote_bids",
+        sa.Column("qbundle_inr", sa.Numeric(20, 2), nullable=True),
+    )
+
+    # Backfill from the JSONB payload (same cast the ranking queries used)
+    op.execute(
+        """
+        UPDATE quote_bids
+        SET qbundle_inr = (payload_json ->> 'qbundle_inr')::numeric(20, 2)
+        WHERE payload_json ? 'qbundle_inr'
+          AND qbundle_inr IS NULL
+        """
+    )
+
+    op.create_index(
+        "ix_quote_bid_rank",
+        "quote_bids",
+        [
+            "workflow",
+            "project_id",
+            "t",
+            "state",
+            sa.text("qbundle_inr DESC"),
+            "id",
+        ],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_quote_bid_rank", table_name="quote_bids")
+    op.drop_column("quote_bids", "qbundle_inr")
@@ -0,0 +1,28 @@
+"""add ask total to matching result pairs
+
+Revision ID: e2f3a4b5c6d7
+Revises: d1e2f3a4b5c6
+Create Date: 2026-10-17 21:40:12.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2f3a4b5c6d7'
+down_revision: Union[str, Sequence[str], None] = 'd1e2f3a4b5c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "matching_result_pairs",
+        sa.Column("ask_total_inr", sa.Numeric(20, 2), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("matching_result_pairs", "ask_total_inr")
@@ -0,0 +1,47 @@
+"""add contract ledger checkpoints table
+
+Revision ID: e6c4f5a7b8d9
+Revises: d5b3e4f6a7c8
+Create Date: 2026-10-17 11:32:08.115634
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6c4f5a7b8d9'
+down_revision: Union[str, Sequence[str], None] = 'd5b3e4f6a7c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "contract_ledger_checkpoints",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("workflow", sa.String(length=32), nullable=False),
+        sa.Column(
+            "project_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("projects.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("seq", sa.Integer(), nullable=False),
+        sa.Column("entry_hash", sa.String(length=128), nullable=False),
+        sa.Column("signature", sa.String(length=128), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.UniqueConstraint("workflow", "project_id", "seq", name="uq_contract_ledger_checkpoint_seq"),
+    )
+    op.create_index(
+        "ix_contract_ledger_checkpoint_scope",
+        "contract_ledger_checkpoints",
+        ["workflow", "project_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_contract_ledger_checkpoint_scope", table_name="contract_ledger_checkpoints")
+    op.drop_table("contract_ledger_checkpoints")
@@ -0,0 +1,43 @@
+"""add contract ledger merkle batches table
+
+Revision ID: f7e6a8b9c0d1
+Revises: e6c4f5a7b8d9
+Create Date: 2026-10-17 12:20:44.930217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7e6a8b9c0d1'
+down_revision: Union[str, Sequence[str], None] = 'e6c4f5a7b8d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "contract_ledger_merkle_batches",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("workflow", sa.String(length=32), nullable=False),
+        sa.Column(
+            "project_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("projects.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("batch_index", sa.Integer(), nullable=False),
+        sa.Column("first_seq", sa.Integer(), nullable=False),
+        sa.Column("last_seq", sa.Integer(), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("root_hash", sa.String(length=64), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.UniqueConstraint("workflow", "project_id", "batch_index", name="uq_contract_ledger_merkle_batch"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("contract_ledger_merkle_batches")
@@ -3,13 +3,14 @@ from __future__ import annotations
 import uuid
 from fastapi import APIRouter, Depends, HTTPException, Request, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import select, cast, Numeric, desc
+from sqlalchemy import select, func, desc
 
 from app.db.session import get_db
 from app.core.auth_deps import get_current_principal
 from app.core.deps_params import require_workflow_project_scope
 from app.models.quote_bid import QuoteBid
 from app.models.ask_bid import AskBid
+from app.services.order_book_service import OrderBookService
 
 router = APIRouter(
     prefix="/authority/settlement/diagnostics",
@@ -37,56 +38,71 @@ def settlement_diagnostics(
     workflow = request.state.workflow
     project_id = uuid.UUID(request.state.project_id)
 
-    # -----------------------
-    # QUOTES (LOCKED)
-    # -----------------------
-    q_val = cast(
-        QuoteBid.payload_json["qbundle_inr"].astext,
-        Numeric(20, 2),
-    )
-
-    locked_quotes = db.execute(
-        select(q_val)
-        .where(
-            QuoteBid.workflow == workflow,
-            QuoteBid.project_id == project_id,
-            QuoteBid.t == t,
-            QuoteBid.state == "locked",
-            QuoteBid.payload_json.has_key("qbundle_inr"),
-        )
-        .order_by(desc(q_val))
-    ).scalars().all()
-
-    max_quote = locked_quotes[0] if locked_quotes else None
-    second_quote = locked_quotes[1] if len(locked_quotes) > 1 else None
-
-    # -----------------------
-    # ASKS (LOCKED)
-    # -----------------------
-    locked_asks = db.execute(
-        select(AskBid)
-        .where(
-            AskBid.workflow == workflow,
-            AskBid.project_id == project_id,
-            AskBid.t == t,
-            AskBid.state == "locked",
-        )
-    ).scalars().all()
-
-    ask_totals = [
-        a.total_ask_inr
-        for a in locked_asks
-        if a.total_ask_inr is not None
-    ]
-
-    min_ask_total = min(ask_totals) if ask_totals else None
+    book = OrderBookService().get_snapshot(db, workflow, project_id, t)
+
+    if book is not None:
+        # -----------------------
+        # RANKED SNAPSHOT (written at lock)
+        # -----------------------
+        quote_ranks = OrderBookService.ranked_quotes(book)
+        locked_quote_count = len(quote_ranks)
+        max_quote = quote_ranks[0][1] if quote_ranks else None
+        second_quote = quote_ranks[1][1] if len(quote_ranks) > 1 else None
+
+        ask_ranks = OrderBookService.ranked_asks(book)
+        locked_ask_count = book.locked_ask_count
+        min_ask_total = ask_ranks[0][1] if ask_ranks else None
+    else:
+        # -----------------------
+        # QUOTES (LOCKED)
+        # -----------------------
+        top_quotes = db.execute(
+            select(QuoteBid.qbundle_inr)
+            .where(
+                QuoteBid.workflow == workflow,
+                QuoteBid.project_id == project_id,
+                QuoteBid.t == t,
+                QuoteBid.state == "locked",
+                QuoteBid.qbundle_inr.is_not(None),
+            )
+            .order_by(desc(QuoteBid.qbundle_inr))
+            .limit(2)
+        ).scalars().all()
+
+        locked_quote_count = db.execute(
+            select(func.count())
+            .select_from(QuoteBid)
+            .where(
+                QuoteBid.workflow == workflow,
+                QuoteBid.project_id == project_id,
+                QuoteBid.t == t,
+                QuoteBid.state == "locked",
+                QuoteBid.qbundle_inr.is_not(None),
+            )
+        ).scalar_one()
+
+        max_quote = top_quotes[0] if top_quotes else None
+        second_quote = top_quotes[1] if len(top_quotes) > 1 else None
+
+        # -----------------------
+        # ASKS (LOCKED)
+        # -----------------------
+        locked_ask_count, min_ask_total = db.execute(
+            select(func.count(), func.min(AskBid.total_ask_inr))
+            .where(
+                AskBid.workflow == workflow,
+                AskBid.project_id == project_id,
+                AskBid.t == t,
+                AskBid.state == "locked",
+            )
+        ).one()
 
     # -----------------------
     # CONDITIONS
     # -----------------------
     conditions = {
-        "has_locked_quotes": len(locked_quotes) > 0,
-        "has_locked_asks": len(locked_asks) > 0,
+        "has_locked_quotes": locked_quote_count > 0,
+        "has_locked_asks": locked_ask_count > 0,
         "has_computable_asks": min_ask_total is not None,
         "has_second_price": second_quote is not None,
         "price_crossed": (
@@ -101,12 +117,12 @@ def settlement_diagnostics(
     return {
         "round": t,
         "quotes": {
-            "locked_count": len(locked_quotes),
+            "locked_count": locked_quote_count,
             "max_quote_inr": str(max_quote) if max_quote else None,
             "second_quote_inr": str(second_quote) if second_quote else None,
         },
         "asks": {
-            "locked_count": len(locked_asks),
+            "locked_count": locked_ask_count,
             "min_ask_total_inr": str(min_ask_total) if min_ask_total else None,
         },
         "settlement_conditions": conditions,
@@ -6,11 +6,12 @@ import secrets
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.deps import strict_workflow_scope
 from app.core.auth_deps import get_current_principal
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db
 
 from app.models.ask_bid import AskBid
 from app.models.bid_enums import BidState
@@ -94,7 +95,7 @@ def _reject_non_dcu_fields(payload_dict: dict) -> None:
 async def post_ask_bid(
     request: Request,
     payload: AskBidPayload,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     principal: Principal = Depends(get_current_principal),
 ):
     wf = request.state.workflow
@@ -108,18 +109,22 @@ async def post_ask_bid(
     try:
         require_action(principal, ACTION_SUBMIT_ASK)
 
-        enforce_active_clearland_membership(
-            db=db,
-            workflow=wf,
-            project_id=project_uuid,
-            participant_id=principal.participant_id,
+        await db.run_sync(
+            lambda s: enforce_active_clearland_membership(
+                db=s,
+                workflow=wf,
+                project_id=project_uuid,
+                participant_id=principal.participant_id,
+            )
         )
 
-        enforce_phase_allows_action(
-            db=db,
-            workflow=wf,
-            project_id=project_uuid,
-            action=ACTION_SUBMIT_ASK,
+        await db.run_sync(
+            lambda s: enforce_phase_allows_action(
+                db=s,
+                workflow=wf,
+                project_id=project_uuid,
+                action=ACTION_SUBMIT_ASK,
+            )
         )
 
         enforce_developer_dcu_only(principal)
@@ -133,13 +138,15 @@ async def post_ask_bid(
 
     _reject_non_dcu_fields(payload.model_dump())
 
-    row = AskBidsService().submit_ask_bid(
-        db,
-        workflow=wf,
-        project_id=project_uuid,
-        t=payload.t,
-        participant_id=principal.participant_id,
-        payload=payload.model_dump(),
+    row = await db.run_sync(
+        lambda s: AskBidsService().submit_ask_bid(
+            s,
+            workflow=wf,
+            project_id=project_uuid,
+            t=payload.t,
+            participant_id=principal.participant_id,
+            payload=payload.model_dump(),
+        )
     )
 
     response = {
@@ -1,10 +1,11 @@
 # app/api/v1/bids_my.py
 from __future__ import annotations
 import uuid
-from fastapi import APIRouter, Depends, Request, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Request, Response, HTTPException, Query
+from sqlalchemy import and_, null, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.models.round import Round
 from app.models.ask_bid import AskBid
 from app.models.quote_bid import QuoteBid
@@ -12,6 +13,7 @@ from app.models.preference_bid import PreferenceBid
 from app.core.auth_deps import get_current_principal
 from app.policies.rbac import Principal
 from app.core.deps import strict_workflow_scope
+from app.core.etag import client_has, not_modified, set_etag, version_etag
 
 router = APIRouter(prefix="/bids")
 
@@ -40,14 +42,68 @@ def _normalize_round(r: Round) -> dict:
     }
 
 
+async def _latest_bid(db: AsyncSession, model, *, workflow, project_id, t, participant_id):
+    return (
+        await db.execute(
+            select(model)
+            .filter_by(
+                workflow=workflow,
+                project_id=project_id,
+                t=t,
+                participant_id=participant_id,
+            )
+            .order_by(model.created_at.desc())
+            .limit(1)
+        )
+    ).scalars().first()
+
+
+def _bid_model(wf: str, portalType: str):
+    """Bid table for the caller's portal, None for unknown slum portals."""
+    if wf == "slum":
+        return {
+            "SLUM_DWELLER": PreferenceBid,
+            "SLUM_LAND_DEVELOPER": AskBid,
+            "AFFORDABLE_HOUSING_DEV": QuoteBid,
+        }.get(portalType)
+    # Non-slum workflows: be conservative.
+    # Try to find any QuoteBid for this participant (saleable & others typically use quote).
+    return QuoteBid
+
+
+async def _versions(db: AsyncSession, model, *, workflow, project_id, participant_id) -> tuple:
+    """
+    (round id, round updated_at, bid id, bid updated_at) of the current
+    round and the caller's bid in it; Nones when absent.
+    """
+    if model is None:
+        stmt = select(Round.id, Round.updated_at, null(), null())
+    else:
+        stmt = select(Round.id, Round.updated_at, model.id, model.updated_at).outerjoin(
+            model,
+            and_(
+                model.workflow == Round.workflow,
+                model.project_id == Round.project_id,
+                model.t == Round.t,
+                model.participant_id == participant_id,
+            ),
+        )
+    stmt = stmt.where(Round.workflow == workflow, Round.project_id == project_id).order_by(Round.t.desc())
+    if model is not None:
+        stmt = stmt.order_by(model.created_at.desc())
+    row = (await db.execute(stmt.limit(1))).first()
+    return tuple(row) if row else (None, None, None, None)
+
+
 @router.get(
     "/my-current",
     dependencies=[Depends(strict_workflow_scope)],
 )
-def get_my_bid_for_current_round(
+async def get_my_bid_for_current_round(
     request: Request,
+    response: Response,
     portalType: str = Query(..., min_length=1),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     principal: Principal = Depends(get_current_principal),
 ):
     """
@@ -72,13 +128,28 @@ def get_my_bid_for_current_round(
     except Exception:
         raise HTTPException(status_code=400, detail="projectId must be UUID")
 
+    participant_id = principal.participant_id
+    model = _bid_model(wf, portalType)
+
+    # round + bid versions in one indexed lookup; answers polling with 304
+    # without loading either row
+    etag = version_etag(
+        "bids/my-current", wf, project_uuid, participant_id, portalType,
+        *(await _versions(db, model, workflow=wf, project_id=project_uuid, participant_id=participant_id)),
+    )
+    if client_has(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
     # Current round (most recent t)
     rnd = (
-        db.query(Round)
-        .filter(Round.workflow == wf, Round.project_id == project_uuid)
-        .order_by(Round.t.desc())
-        .first()
-    )
+        await db.execute(
+            select(Round)
+            .where(Round.workflow == wf, Round.project_id == project_uuid)
+            .order_by(Round.t.desc())
+            .limit(1)
+        )
+    ).scalars().first()
 
     round_payload = _normalize_round(rnd)
 
@@ -87,62 +158,16 @@ def get_my_bid_for_current_round(
         return {"workflow": wf, "projectId": pid_raw, "round": None, "bid": None}
 
     t = rnd.t
-    participant_id = principal.participant_id
 
-    # Choose table by workflow/portalType
     row = None
-    # SLUM specifics
-    if wf == "slum":
-        if portalType == "SLUM_DWELLER":
-            row = (
-                db.query(PreferenceBid)
-                .filter_by(
-                    workflow=wf,
-                    project_id=project_uuid,
-                    t=t,
-                    participant_id=participant_id,
-                )
-                .order_by(PreferenceBid.created_at.desc())
-                .first()
-            )
-        elif portalType == "SLUM_LAND_DEVELOPER":
-            row = (
-                db.query(AskBid)
-                .filter_by(
-                    workflow=wf,
-                    project_id=project_uuid,
-                    t=t,
-                    participant_id=participant_id,
-                )
-                .order_by(AskBid.created_at.desc())
-                .first()
-            )
-        elif portalType == "AFFORDABLE_HOUSING_DEV":
-            row = (
-                db.query(QuoteBid)
-                .filter_by(
-                    workflow=wf,
-                    project_id=project_uuid,
-                    t=t,
-                    participant_id=participant_id,
-                )
-                .order_by(QuoteBid.created_at.desc())
-                .first()
-            )
-        else:
-            # Unknown portal for slum — safe fallback
-            row = None
-
-    else:
-        # Non-slum workflows: be conservative.
-        # Try to find any QuoteBid for this participant (saleable & others typically use quote).
-        row = (
-            db.query(QuoteBid)
-            .filter_by(
-                workflow=wf, project_id=project_uuid, t=t, participant_id=participant_id
-            )
-            .order_by(QuoteBid.created_at.desc())
-            .first()
+    if model is not None:
+        row = await _latest_bid(
+            db,
+            model,
+            workflow=wf,
+            project_id=project_uuid,
+            t=t,
+            participant_id=participant_id,
         )
 
     if not row:
@@ -6,11 +6,12 @@ import secrets
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.deps import strict_workflow_scope
 from app.core.auth_deps import get_current_principal
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db
 
 from app.models.quote_bid import QuoteBid
 from app.models.bid_enums import BidState
@@ -69,7 +70,7 @@ def _anti_leak_assert_no_orderbook(response_obj: dict) -> None:
 async def post_quote_bid(
     request: Request,
     payload: QuoteBidPayload,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     principal: Principal = Depends(get_current_principal),
 ):
     wf = request.state.workflow
@@ -84,19 +85,23 @@ async def post_quote_bid(
         require_action(principal, ACTION_SUBMIT_QUOTE)
 
         # 🔐 membership guard (clearland only, authority bypassed upstream)
-        enforce_active_clearland_membership(
-            db=db,
-            workflow=wf,
-            project_id=project_uuid,
-            participant_id=principal.participant_id,
+        await db.run_sync(
+            lambda s: enforce_active_clearland_membership(
+                db=s,
+                workflow=wf,
+                project_id=project_uuid,
+                participant_id=principal.participant_id,
+            )
         )
 
         # 🔐 phase guard (clearland only)
-        enforce_phase_allows_action(
-            db=db,
-            workflow=wf,
-            project_id=project_uuid,
-            action=ACTION_SUBMIT_QUOTE,
+        await db.run_sync(
+            lambda s: enforce_phase_allows_action(
+                db=s,
+                workflow=wf,
+                project_id=project_uuid,
+                action=ACTION_SUBMIT_QUOTE,
+            )
         )
 
         enforce_quote_payload_role(principal)
@@ -108,13 +113,15 @@ async def post_quote_bid(
     if payload.projectId != pid_raw:
         raise HTTPException(status_code=400, detail="Payload projectId mismatch.")
 
-    row = QuoteBidsService().submit_quote_bid(
-        db,
-        workflow=wf,
-        project_id=project_uuid,
-        t=payload.t,
-        participant_id=principal.participant_id,
-        payload=payload.model_dump(),
+    row = await db.run_sync(
+        lambda s: QuoteBidsService().submit_quote_bid(
+            s,
+            workflow=wf,
+            project_id=project_uuid,
+            t=payload.t,
+            participant_id=principal.participant_id,
+            payload=payload.model_dump(),
+        )
     )
 
     response = {
@@ -2,9 +2,10 @@
 from __future__ import annotations
 
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query
 from sqlalchemy.orm import Session
 
+from app.core.etag import client_has, not_modified, set_etag, version_etag
 from app.db.session import get_db
 from app.core.deps_params import require_workflow_project_scope
 from app.schemas.contracts import TokenizedContractResponse, ContractListResponse
@@ -36,6 +37,7 @@ def _to_resp(c: TokenizedContractRecord) -> dict:
 @router.get("/byProject", response_model=ContractListResponse, dependencies=[Depends(require_workflow_project_scope)])
 async def list_contracts_by_project(
     request: Request,
+    response: Response,
     db: Session = Depends(get_db),
 ):
     workflow = request.state.workflow
@@ -54,6 +56,11 @@ async def list_contracts_by_project(
         # If settlement not ready, we still return an empty list (no invention)
         pass
 
+    etag = version_etag("contracts/byProject", workflow, pid, *svc.project_version(db, workflow=workflow, project_id=pid))
+    if client_has(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
     rows = svc.list_by_project(db, workflow=workflow, project_id=pid)
     return {
         "workflow": workflow,
@@ -65,6 +72,8 @@ async def list_contracts_by_project(
 @router.get("/{contractId}", response_model=TokenizedContractResponse)
 async def get_contract(
     contractId: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
 ):
     try:
@@ -72,9 +81,16 @@ async def get_contract(
     except Exception:
         raise HTTPException(status_code=400, detail="contractId must be UUID.")
 
-    row = ContractService().get_contract(db, cid)
-    if not row:
+    svc = ContractService()
+    contract_hash = svc.get_contract_hash(db, cid)
+    if not contract_hash:
         raise HTTPException(status_code=404, detail="Contract not found.")
-    return _to_resp(row)
+
+    etag = version_etag("contracts", cid, contract_hash)
+    if client_has(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    return _to_resp(svc.get_contract(db, cid))
 
 
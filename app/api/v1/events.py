@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query
 from sqlalchemy.orm import Session
 
+from app.core.artifact_cache import ARTIFACT_CACHE, PENALTY_EVENT
+from app.core.etag import client_has, content_etag, not_modified, set_etag
 from app.db.session import get_db
 from app.core.deps_params import require_workflow_project_scope
 from app.core.auth_deps import get_current_principal
@@ -71,6 +73,7 @@ async def declare_default(
 @router.get("/penalty", response_model=PenaltyEventResponse, dependencies=[Depends(require_workflow_project_scope)])
 async def get_penalty_event(
     request: Request,
+    response: Response,
     t: int = Query(..., ge=0),
     db: Session = Depends(get_db),
 ):
@@ -82,8 +85,22 @@ async def get_penalty_event(
         raise HTTPException(status_code=400, detail="projectId must be UUID.")
 
     svc = PenaltyService()
-    try:
+
+    def load() -> dict:
         row = svc.compute_and_store_penalty_if_needed(db, workflow=workflow, project_id=project_uuid, t=t)
+        return {
+            "winner_quote_bid_id": str(row.winner_quote_bid_id),
+            "second_price_quote_bid_id": str(row.second_price_quote_bid_id),
+            "bmax_inr": str(row.bmax_inr),
+            "bsecond_inr": str(row.bsecond_inr),
+            "penalty_inr": str(row.penalty_inr),
+            "enforcement_status": row.enforcement_status,
+            "computed_at_iso": _iso(row.computed_at),
+            "notes": row.notes_json or {},
+        }
+
+    try:
+        penalty = ARTIFACT_CACHE.get_or_load(workflow, project_uuid, t, PENALTY_EVENT, load)
     except ValueError as e:
         # deterministic: if no default recorded, penalty not applicable
         msg = str(e)
@@ -91,16 +108,15 @@ async def get_penalty_event(
             raise HTTPException(status_code=404, detail=msg)
         raise HTTPException(status_code=409, detail=msg)
 
-    return {
+    body = {
         "workflow": workflow,
         "projectId": pid_raw,
         "t": t,
-        "winner_quote_bid_id": str(row.winner_quote_bid_id),
-        "second_price_quote_bid_id": str(row.second_price_quote_bid_id),
-        "bmax_inr": str(row.bmax_inr),
-        "bsecond_inr": str(row.bsecond_inr),
-        "penalty_inr": str(row.penalty_inr),
-        "enforcement_status": row.enforcement_status,
-        "computed_at_iso": _iso(row.computed_at),
-        "notes": row.notes_json or {},
+        **penalty,
     }
+
+    etag = content_etag(body)
+    if client_has(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    return body
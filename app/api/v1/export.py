@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse
+from typing import Any, Iterable, Iterator, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
@@ -10,7 +11,9 @@ from app.core.auth_deps import get_current_principal
 from app.policies.rbac import Principal
 from app.policies.export_policy import export_scope
 
-from app.core.streaming import csv_stream
+from app.core.keyset import Cursor, decode_cursor
+from app.core.streaming import coalesce, csv_stream, export_response
+from app.db.pg_copy import copy_available
 from app.services.export_audit_service import ExportAuditService
 from app.services.export_contracts_service import ExportContractsService
 from app.services.export_settlement_service import ExportSettlementService
@@ -25,51 +28,87 @@ def _uuid(s: str) -> uuid.UUID:
         raise HTTPException(status_code=400, detail="projectId must be UUID.")
 
 
+def _cursor(token: Optional[str]) -> Optional[Cursor]:
+    if token is None:
+        return None
+    try:
+        return decode_cursor(token)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _closing(db: Session, rows: Iterable[Any]) -> Iterator[Any]:
+    """
+    Close the session when the stream ends. get_db's cleanup runs before a
+    StreamingResponse body is sent; the rows then run on a reopened
+    connection (holding the server-side cursor) that nothing else closes.
+    """
+    try:
+        yield from rows
+    finally:
+        db.close()
+
+
 @router.get("/audit.csv")
 async def export_audit_csv(
+    request: Request,
     workflow: str = Query(..., min_length=1),
     projectId: str = Query(..., min_length=1),
+    after: Optional[str] = Query(None, description="cursor of the last row received, to resume"),
     db: Session = Depends(get_db),
     principal: Principal = Depends(get_current_principal),
 ):
     pid = _uuid(projectId)
     scope = export_scope(principal)
+    cursor = _cursor(after)
 
     svc = ExportAuditService()
-    rows = svc.iter_rows(db, scope=scope, workflow=workflow, project_id=pid)
-    fieldnames = svc.fieldnames()
+    if scope.allow_full and copy_available(db):
+        # nothing to filter per participant: Postgres writes the CSV
+        chunks = svc.copy_csv(db, scope=scope, workflow=workflow, project_id=pid, after=cursor)
+    else:
+        rows = svc.iter_rows(db, scope=scope, workflow=workflow, project_id=pid, after=cursor)
+        chunks = csv_stream(rows, svc.fieldnames())
 
     filename = f"audit_{workflow}_{projectId}.csv"
-    return StreamingResponse(
-        csv_stream(rows, fieldnames),
+    return export_response(
+        request,
+        _closing(db, chunks),
         media_type="text/csv; charset=utf-8",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        filename=filename,
     )
 
 
 @router.get("/contracts.json")
 async def export_contracts_json(
+    request: Request,
     workflow: str = Query(..., min_length=1),
     projectId: str = Query(..., min_length=1),
+    after: Optional[str] = Query(None, description="cursor of the last row received, to resume"),
     db: Session = Depends(get_db),
     principal: Principal = Depends(get_current_principal),
 ):
     pid = _uuid(projectId)
     scope = export_scope(principal)
+    cursor = _cursor(after)
 
     svc = ExportContractsService()
-    contracts = svc.iter_contract_dicts(db, scope=scope, workflow=workflow, project_id=pid)
+    contracts = _closing(
+        db, svc.iter_contract_dicts(db, scope=scope, workflow=workflow, project_id=pid, after=cursor)
+    )
     filename = f"contracts_{workflow}_{projectId}.json"
 
-    return StreamingResponse(
-        svc.json_stream(contracts),
+    return export_response(
+        request,
+        coalesce(svc.json_stream(contracts)),
         media_type="application/json; charset=utf-8",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        filename=filename,
     )
 
 
 @router.get("/settlement.csv")
 async def export_settlement_csv(
+    request: Request,
     workflow: str = Query(..., min_length=1),
     projectId: str = Query(..., min_length=1),
     t: int = Query(..., ge=0),
@@ -80,13 +119,14 @@ async def export_settlement_csv(
     scope = export_scope(principal)
 
     svc = ExportSettlementService()
-    rows = svc.iter_rows(db, scope=scope, workflow=workflow, project_id=pid, t=t)
+    rows = _closing(db, svc.iter_rows(db, scope=scope, workflow=workflow, project_id=pid, t=t))
     fieldnames = svc.fieldnames()
     filename = f"settlement_{workflow}_{projectId}_t{t}.csv"
 
-    return StreamingResponse(
+    return export_response(
+        request,
         csv_stream(rows, fieldnames),
         media_type="text/csv; charset=utf-8",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        filename=filename,
     )
 
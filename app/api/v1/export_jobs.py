@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import os
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.core.auth_deps import get_current_principal
+from app.core.etag import CACHE_CONTROL, client_has, not_modified
+from app.policies.rbac import Principal
+
+from app.models.export_job import ExportJob
+from app.schemas.export_jobs import ExportJobRequest, ExportJobResponse
+from app.services.export_job_service import (
+    EXPORT_JOB_RUNNER,
+    MEDIA_TYPES,
+    ExportJobService,
+    artifact_path,
+    job_params,
+    manifest_for,
+)
+
+router = APIRouter(prefix="/export/jobs")
+
+
+def _require_authority(principal: Principal) -> None:
+    # jobs export every participant's rows: authority/auditor only
+    if principal.role.value not in {"GOV_AUTHORITY", "AUDITOR"}:
+        raise HTTPException(status_code=403, detail="Only authority/auditor may run export jobs.")
+
+
+def _uuid(s: str, field: str) -> uuid.UUID:
+    try:
+        return uuid.UUID(s)
+    except Exception:
+        raise HTTPException(status_code=400, detail=f"{field} must be UUID.")
+
+
+def _iso(dt):
+    return dt.isoformat() if dt else None
+
+
+def _job_out(job: ExportJob, *, deduplicated: bool = False) -> dict:
+    return {
+        "jobId": str(job.id),
+        "kind": job.kind,
+        "format": job.format,
+        "status": job.status,
+        "params": job.params_json,
+        "created_at_iso": _iso(job.created_at),
+        "started_at_iso": _iso(job.started_at),
+        "finished_at_iso": _iso(job.finished_at),
+        "error": job.error,
+        "deduplicated": deduplicated,
+        "manifest": manifest_for(job) if job.status == "succeeded" else None,
+    }
+
+
+def _load(db: Session, job_id: str) -> ExportJob:
+    job = ExportJobService().get(db, _uuid(job_id, "jobId"))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found.")
+    return job
+
+
+@router.post("", response_model=ExportJobResponse, status_code=202)
+def submit_export_job(
+    payload: ExportJobRequest,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(get_current_principal),
+):
+    _require_authority(principal)
+
+    project_id = _uuid(payload.projectId, "projectId") if payload.projectId else None
+    try:
+        params = job_params(
+            kind=payload.kind,
+            fmt=payload.format,
+            workflow=payload.workflow.value if payload.workflow else None,
+            project_id=project_id,
+            t=payload.t,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    job, created = ExportJobService().submit(db, params=params, requested_by=principal.participant_id)
+    if created:
+        EXPORT_JOB_RUNNER.submit(job.id)
+
+    response.headers["Location"] = str(request.url_for("get_export_job", job_id=str(job.id)))
+    return _job_out(job, deduplicated=not created)
+
+
+@router.get("/{job_id}", response_model=ExportJobResponse)
+def get_export_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(get_current_principal),
+):
+    _require_authority(principal)
+    return _job_out(_load(db, job_id))
+
+
+@router.get("/{job_id}/download")
+def download_export_job(
+    job_id: str,
+    request: Request,
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(get_current_principal),
+):
+    _require_authority(principal)
+    job = _load(db, job_id)
+    if job.status == "expired":
+        raise HTTPException(status_code=410, detail="Export job artifact has expired.")
+    if job.status != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Export job is {job.status}.")
+
+    path = artifact_path(job)
+    if path is None or not os.path.exists(path):
+        raise HTTPException(status_code=410, detail="Export job artifact is gone.")
+
+    # the artifact never changes once written: its sha256 is a strong ETag
+    etag = f'"{job.sha256}"'
+    if client_has(request, etag):
+        return not_modified(etag)
+    return FileResponse(
+        path,
+        media_type=MEDIA_TYPES[job.format],
+        filename=job.file_name,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query
 from sqlalchemy.orm import Session
 
+from app.core.artifact_cache import ARTIFACT_CACHE, MARKET_DEPTH
 from app.core.auth_deps import get_current_principal
+from app.core.etag import client_has, content_etag, not_modified, set_etag
 from app.db.session import get_db
 from app.core.deps_params import require_workflow_project_scope
-from app.schemas.feedback import FeedbackRoundResponse, RoundWindowStatus
+from app.policies.rbac import Principal
+from app.schemas.feedback import FeedbackRoundResponse, MarketDepthResponse, RoundWindowStatus
 from app.services.feedback_service import FeedbackService
 
 router = APIRouter(prefix="/feedback")
@@ -40,7 +43,7 @@ async def feedback_round(
     flags = svc.user_submission_flags(
         db, workflow=workflow, project_id=project_uuid, t=t, participant_id=principal.participant_id
     )
-    aggregates = svc.aggregate_stats(db, workflow=workflow, project_id=project_uuid, t=t)
+    aggregates = svc.aggregate_stats(db, workflow=workflow, project_id=project_uuid, t=t, rnd=rnd)
 
     # Adjustment window: allowed only if round open and not locked
     if rnd.is_locked:
@@ -80,3 +83,50 @@ async def feedback_round(
         raise RuntimeError("Privacy violation: forbidden key present in feedback response.")
     return response
 
+
+
+@router.get("/depth", response_model=MarketDepthResponse, dependencies=[Depends(require_workflow_project_scope)])
+async def market_depth(
+    request: Request,
+    response: Response,
+    t: int = Query(..., ge=0),
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(get_current_principal),
+):
+    # percentiles and buckets describe the book itself: authority/auditor only
+    if principal.role.value not in {"GOV_AUTHORITY", "AUDITOR"}:
+        raise HTTPException(status_code=403, detail="Only authority/auditor may view market depth.")
+
+    workflow = request.state.workflow
+    pid_raw = request.state.project_id
+    try:
+        project_uuid = uuid.UUID(pid_raw)
+    except Exception:
+        raise HTTPException(status_code=400, detail="projectId must be UUID (Project.id).")
+
+    svc = FeedbackService()
+
+    def load() -> dict:
+        row = svc.market_depth(db, workflow=workflow, project_id=project_uuid, t=t)
+        return {**row.stats_json, "computed_at_iso": _iso(row.computed_at)}
+
+    try:
+        depth = ARTIFACT_CACHE.get_or_load(workflow, project_uuid, t, MARKET_DEPTH, load)
+    except ValueError as e:
+        msg = str(e)
+        if "not found" in msg:
+            raise HTTPException(status_code=404, detail=msg)
+        raise HTTPException(status_code=409, detail=msg)
+
+    body = {
+        "workflow": workflow,
+        "projectId": pid_raw,
+        "t": t,
+        **depth,
+    }
+
+    etag = content_etag(body)
+    if client_has(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    return body
@@ -4,13 +4,14 @@ from __future__ import annotations
 
 import logging
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
 from app.core.auth_deps import get_current_principal
 from app.core.deps_params import require_workflow_project_scope
 from app.services.ledger_service import LedgerService
+from app.services.ledger_merkle_service import LedgerMerkleService
 
 logger = logging.getLogger(__name__)
 
@@ -81,12 +82,16 @@ async def list_ledger_entries(
 )
 async def verify_ledger_chain(
     request: Request,
+    full: bool = Query(False, description="Re-verify from genesis instead of the last checkpoint"),
     db: Session = Depends(get_db),
     principal=Depends(get_current_principal),
 ):
     """
     Verifies hash-chain integrity.
     Auditor-grade endpoint.
+
+    Incremental by default (from the last signed checkpoint); ?full=true
+    re-hashes the whole chain.
     """
     logger.info("[ledger/verify] principal=%s workflow-state=%s", getattr(principal, "participant_id", "<none>"), getattr(request.state, "workflow", "<none>"))
     _authority_or_auditor(principal)
@@ -99,16 +104,77 @@ async def verify_ledger_chain(
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid projectId UUID.")
 
-    ok = LedgerService().verify_chain(
+    report = LedgerService().verify_chain_report(
         db,
         workflow=workflow,
         project_id=project_uuid,
+        full=full,
+    )
+
+    logger.info(
+        "[ledger/verify] project=%s full=%s valid=%s first_broken_seq=%s checked=%d",
+        project_id_raw,
+        full,
+        report.valid,
+        report.first_broken_seq,
+        report.entries_checked,
     )
 
-    logger.info("[ledger/verify] project=%s valid=%s", project_id_raw, ok)
+    return {
+        "workflow": workflow,
+        "projectId": project_id_raw,
+        "full": full,
+        "valid": report.valid,
+        "firstBrokenSeq": report.first_broken_seq,
+        "verifiedThroughSeq": report.verified_through_seq,
+        "entriesChecked": report.entries_checked,
+    }
+
+
+@router.get(
+    "/proof",
+    dependencies=[Depends(require_workflow_project_scope)],
+)
+async def ledger_inclusion_proof(
+    request: Request,
+    entryId: uuid.UUID = Query(...),
+    db: Session = Depends(get_db),
+    principal=Depends(get_current_principal),
+):
+    """
+    Merkle inclusion proof for one ledger entry.
+
+    Returns hashes only (no payload), so any authenticated participant may
+    check that a contract's entry is committed without the full ledger.
+    """
+    workflow = request.state.workflow
+    project_id_raw = request.state.project_id
+
+    try:
+        project_uuid = uuid.UUID(project_id_raw)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid projectId UUID.")
+
+    try:
+        proof = LedgerMerkleService().get_proof(
+            db,
+            workflow=workflow,
+            project_id=project_uuid,
+            entry_id=entryId,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    logger.info(
+        "[ledger/proof] project=%s entry=%s seq=%s persisted=%s",
+        project_id_raw,
+        entryId,
+        proof["seq"],
+        proof["rootPersisted"],
+    )
 
     return {
         "workflow": workflow,
         "projectId": project_id_raw,
-        "valid": ok,
+        **proof,
     }
@@ -2,13 +2,20 @@
 from __future__ import annotations
 
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, Request, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.core.artifact_cache import ARTIFACT_CACHE, MATCHING_PAIRS, MATCHING_RESULT
+from app.core.etag import client_has, content_etag, not_modified, set_etag
+from app.db.session import get_async_db
 from app.core.deps_params import require_workflow_project_scope
 from app.schemas.matching import MatchingResultResponse
-from app.services.matching_service import MatchingService
+from app.services.matching_service import (
+    MatchingService,
+    MATCHING_MODE_SINGLE,
+    MATCHING_MODE_BOOK,
+    matching_mode,
+)
 
 router = APIRouter(prefix="/matching")
 
@@ -17,6 +24,19 @@ def _iso(dt):
     return dt.isoformat() if dt else None
 
 
+def _match_dict(match) -> dict:
+    return {
+        "status": match.status,
+        "matched": bool(match.matched),
+        "selected_ask_bid_id": str(match.selected_ask_bid_id) if match.selected_ask_bid_id else None,
+        "selected_quote_bid_id": str(match.selected_quote_bid_id) if match.selected_quote_bid_id else None,
+        "min_ask_total_inr": str(match.min_ask_total_inr) if match.min_ask_total_inr else None,
+        "max_quote_inr": str(match.max_quote_inr) if match.max_quote_inr else None,
+        "computed_at_iso": _iso(match.computed_at),
+        "notes": match.notes_json or {},
+    }
+
+
 @router.post(
     "/run",
     dependencies=[Depends(require_workflow_project_scope)],
@@ -24,7 +44,11 @@ def _iso(dt):
 async def run_matching(
     request: Request,
     t: int = Query(..., ge=0),
-    db: Session = Depends(get_db),
+    mode: str = Query(
+        default=MATCHING_MODE_SINGLE,
+        pattern=f"^({MATCHING_MODE_SINGLE}|{MATCHING_MODE_BOOK})$",
+    ),
+    db: AsyncSession = Depends(get_async_db),
 ):
     workflow = request.state.workflow
     pid_raw = request.state.project_id
@@ -34,34 +58,49 @@ async def run_matching(
     except Exception:
         raise HTTPException(status_code=400, detail="projectId must be UUID.")
 
+    if mode == MATCHING_MODE_BOOK:
+        # settlement prices one pair per round: cleared book pairs would
+        # never become settlements, contracts or ledger entries
+        raise HTTPException(
+            status_code=400,
+            detail="Book clearing cannot be settled yet; run matching in single mode.",
+        )
+
     match_svc = MatchingService()
+
+    async def load() -> dict:
+        return _match_dict(
+            await match_svc.compute_and_store_if_needed_async(
+                db,
+                workflow=workflow,
+                project_id=project_uuid,
+                t=t,
+                mode=mode,
+            )
+        )
+
     try:
-        match = match_svc.compute_and_store_if_needed(
-            db,
-            workflow=workflow,
-            project_id=project_uuid,
-            t=t,
+        match = await ARTIFACT_CACHE.get_or_load_async(
+            workflow, project_uuid, t, MATCHING_RESULT, load
         )
     except ValueError as e:
         msg = str(e)
-        if "only after round lock" in msg:
+        if "only after round lock" in msg or "already matched" in msg:
             raise HTTPException(status_code=409, detail=msg)
         if "Round not found" in msg:
             raise HTTPException(status_code=404, detail=msg)
         raise HTTPException(status_code=400, detail=msg)
 
+    # a cached result skips the service's own mode check
+    stored_mode = match["notes"].get("mode", MATCHING_MODE_SINGLE)
+    if stored_mode != mode:
+        raise HTTPException(status_code=409, detail=f"Round already matched in {stored_mode} mode.")
+
     return {
         "workflow": workflow,
         "projectId": pid_raw,
         "t": t,
-        "status": match.status,
-        "matched": bool(match.matched),
-        "selected_ask_bid_id": str(match.selected_ask_bid_id) if match.selected_ask_bid_id else None,
-        "selected_quote_bid_id": str(match.selected_quote_bid_id) if match.selected_quote_bid_id else None,
-        "min_ask_total_inr": str(match.min_ask_total_inr) if match.min_ask_total_inr else None,
-        "max_quote_inr": str(match.max_quote_inr) if match.max_quote_inr else None,
-        "computed_at_iso": _iso(match.computed_at),
-        "notes": match.notes_json or {},
+        **match,
     }
 
 
@@ -72,8 +111,9 @@ async def run_matching(
 )
 async def get_matching_result(
     request: Request,
+    response: Response,
     t: int = Query(..., ge=0),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     workflow = request.state.workflow
     pid_raw = request.state.project_id
@@ -84,12 +124,20 @@ async def get_matching_result(
         raise HTTPException(status_code=400, detail="projectId must be UUID.")
 
     match_svc = MatchingService()
+
+    async def load() -> dict:
+        return _match_dict(
+            await match_svc.compute_and_store_if_needed_async(
+                db,
+                workflow=workflow,
+                project_id=project_uuid,
+                t=t,
+            )
+        )
+
     try:
-        match = match_svc.compute_and_store_if_needed(
-            db,
-            workflow=workflow,
-            project_id=project_uuid,
-            t=t,
+        match = await ARTIFACT_CACHE.get_or_load_async(
+            workflow, project_uuid, t, MATCHING_RESULT, load
         )
     except ValueError as e:
         msg = str(e)
@@ -99,16 +147,81 @@ async def get_matching_result(
             raise HTTPException(status_code=404, detail=msg)
         raise HTTPException(status_code=400, detail=msg)
 
-    return {
+    body = {
         "workflow": workflow,
         "projectId": pid_raw,
         "t": t,
-        "status": match.status,
-        "matched": bool(match.matched),
-        "selected_ask_bid_id": str(match.selected_ask_bid_id) if match.selected_ask_bid_id else None,
-        "selected_quote_bid_id": str(match.selected_quote_bid_id) if match.selected_quote_bid_id else None,
-        "min_ask_total_inr": str(match.min_ask_total_inr) if match.min_ask_total_inr else None,
-        "max_quote_inr": str(match.max_quote_inr) if match.max_quote_inr else None,
-        "computed_at_iso": _iso(match.computed_at),
-        "notes": match.notes_json or {},
+        **match,
+    }
+
+    etag = content_etag(body)
+    if client_has(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    return body
+
+
+@router.get(
+    "/pairs",
+    dependencies=[Depends(require_workflow_project_scope)],
+)
+async def get_matching_pairs(
+    request: Request,
+    response: Response,
+    t: int = Query(..., ge=0),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Cleared pairs of a book-mode matching result (empty for single mode).
+    """
+    workflow = request.state.workflow
+    pid_raw = request.state.project_id
+
+    try:
+        project_uuid = uuid.UUID(pid_raw)
+    except Exception:
+        raise HTTPException(status_code=400, detail="projectId must be UUID.")
+
+    match_svc = MatchingService()
+
+    async def load() -> dict:
+        match = await match_svc.get_existing_async(db, workflow, project_uuid, t)
+        if not match:
+            raise LookupError("Matching result not found.")
+
+        pairs = await match_svc.list_pairs_async(db, matching_result_id=match.id)
+        return {
+            "mode": matching_mode(match),
+            "pairs": [
+                {
+                    "rank": p.rank,
+                    "ask_bid_id": str(p.ask_bid_id),
+                    "quote_bid_id": str(p.quote_bid_id),
+                    "units": str(p.units),
+                    "ask_total_inr": str(p.ask_total_inr) if p.ask_total_inr is not None else None,
+                    "ask_unit_price_inr": str(p.ask_unit_price_inr),
+                    "quote_inr": str(p.quote_inr),
+                }
+                for p in pairs
+            ],
+        }
+
+    try:
+        cleared = await ARTIFACT_CACHE.get_or_load_async(
+            workflow, project_uuid, t, MATCHING_PAIRS, load
+        )
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    body = {
+        "workflow": workflow,
+        "projectId": pid_raw,
+        "t": t,
+        **cleared,
     }
+
+    etag = content_etag(body)
+    if client_has(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    return body
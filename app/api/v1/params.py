@@ -66,7 +66,7 @@ async def params_init(
         raise HTTPException(status_code=404, detail="Project not found for workflow/projectId.")
 
     service = ParamsService()
-    t0_snap, current_snap = service.get_or_create_snapshots(
+    t0_payload, cur_payload = service.get_or_create_snapshot_payloads(
         db=db,
         workflow=workflow,
         project_uuid=project_uuid,
@@ -77,9 +77,6 @@ async def params_init(
     is_privileged = principal.role.value in {"GOV_AUTHORITY", "AUDITOR"}
     visibility = "AUTHORITY/AUDITOR" if is_privileged else "PUBLIC"
 
-    t0_payload = t0_snap.payload_json
-    cur_payload = current_snap.payload_json
-
     if not is_privileged:
         t0_payload = _sanitize_for_public(t0_payload)
         cur_payload = _sanitize_for_public(cur_payload)
@@ -4,11 +4,12 @@ import uuid
 import secrets
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.deps import strict_workflow_scope
 from app.core.auth_deps import get_current_principal
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db
 from app.schemas.preferences import PreferenceBidPayload, MyPreferenceResponse
 from app.schemas.bid_receipts import BidReceipt
 from app.policies.rbac import ACTION_SUBMIT_PREFERENCES, require_action, Principal
@@ -39,7 +40,7 @@ def _iso(dt):
 async def post_preferences(
     request: Request,
     payload: PreferenceBidPayload,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     principal: Principal = Depends(get_current_principal),
 ):
     wf = request.state.workflow
@@ -57,27 +58,33 @@ async def post_preferences(
     except Exception:
         raise HTTPException(status_code=400, detail="projectId must be UUID.")
 
-    enforce_active_clearland_membership(
-        db=db,
-        workflow=wf,
-        project_id=project_uuid,
-        participant_id=principal.participant_id,
+    await db.run_sync(
+        lambda s: enforce_active_clearland_membership(
+            db=s,
+            workflow=wf,
+            project_id=project_uuid,
+            participant_id=principal.participant_id,
+        )
     )
 
-    enforce_phase_allows_action(
-        db=db,
-        workflow=wf,
-        project_id=project_uuid,
-        action=ACTION_SUBMIT_PREFERENCES,
+    await db.run_sync(
+        lambda s: enforce_phase_allows_action(
+            db=s,
+            workflow=wf,
+            project_id=project_uuid,
+            action=ACTION_SUBMIT_PREFERENCES,
+        )
     )
 
-    row = PreferencesService().submit_preference(
-        db,
-        workflow=wf,
-        project_id=project_uuid,
-        t=payload.t,
-        participant_id=principal.participant_id,
-        payload=payload.model_dump(),
+    row = await db.run_sync(
+        lambda s: PreferencesService().submit_preference(
+            s,
+            workflow=wf,
+            project_id=project_uuid,
+            t=payload.t,
+            participant_id=principal.participant_id,
+            payload=payload.model_dump(),
+        )
     )
 
     return {
@@ -1,14 +1,22 @@
 # app/api/v1/rounds.py
 from __future__ import annotations
 
+import asyncio
+import json
 import uuid
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.auth_deps import get_current_principal
+from app.core.config import get_settings
 from app.core.deps_params import require_workflow_project_scope
-from app.db.session import get_db
+from app.core.etag import client_has, not_modified, set_etag, version_etag
+from app.core.round_events import ROUND_EVENTS
+from app.db.session import AsyncSessionLocal, get_db, get_async_db
 
 from app.models.project import Project
 from app.models.round import Round
@@ -60,6 +68,14 @@ def _normalize_state(r: Round) -> str:
     return "new"
 
 
+async def _project_exists(db: AsyncSession, workflow: str, project_uuid: uuid.UUID) -> bool:
+    return (
+        await db.execute(
+            select(Project.id).where(Project.workflow == workflow, Project.id == project_uuid)
+        )
+    ).first() is not None
+
+
 def _round_to_schema(r: Round) -> BidRound:
     return BidRound(
         id=str(r.id),
@@ -83,7 +99,8 @@ def _round_to_schema(r: Round) -> BidRound:
 )
 async def get_current_round(
     request: Request,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     principal=Depends(get_current_principal),
 ):
     workflow = request.state.workflow
@@ -94,16 +111,21 @@ async def get_current_round(
     except Exception:
         raise HTTPException(status_code=400, detail="projectId must be UUID (Project.id).")
 
-    project = (
-        db.query(Project)
-        .filter(Project.workflow == workflow, Project.id == project_uuid)
-        .first()
-    )
-    if not project:
+    svc = RoundService()
+    rnd = await svc.get_current_round_async(db, workflow, project_uuid)
+
+    # a round implies its project exists
+    if not rnd and not await _project_exists(db, workflow, project_uuid):
         raise HTTPException(status_code=404, detail="Project not found.")
 
-    svc = RoundService()
-    rnd = svc.get_current_round(db, workflow, project_uuid)
+    # every round transition bumps updated_at
+    etag = version_etag(
+        "rounds/current", workflow, project_uuid,
+        rnd.id if rnd else None, rnd.updated_at if rnd else None,
+    )
+    if client_has(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
 
     if not rnd:
         return RoundResponse(
@@ -127,7 +149,7 @@ async def get_current_round(
 async def open_round(
     req: RoundOpenRequest,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     principal=Depends(get_current_principal),
 ):
     _authority_only(principal)
@@ -135,35 +157,37 @@ async def open_round(
     workflow = req.workflow.value
     project_uuid = uuid.UUID(req.projectId)
 
-    project = (
-        db.query(Project)
-        .filter(Project.workflow == workflow, Project.id == project_uuid)
-        .first()
-    )
-    if not project:
+    if not await _project_exists(db, workflow, project_uuid):
         raise HTTPException(status_code=404, detail="Project not found.")
 
+    window_start = _parse_iso(req.bidding_window_start_iso)
+    window_end = _parse_iso(req.bidding_window_end_iso)
+
     svc = RoundService()
     try:
-        rnd = svc.open_next_round(
-            db,
-            workflow=workflow,
-            project_id=project_uuid,
-            window_start=_parse_iso(req.bidding_window_start_iso),
-            window_end=_parse_iso(req.bidding_window_end_iso),
+        rnd = await db.run_sync(
+            lambda s: svc.open_next_round(
+                s,
+                workflow=workflow,
+                project_id=project_uuid,
+                window_start=window_start,
+                window_end=window_end,
+            )
         )
     except ValueError as e:
         raise HTTPException(status_code=409, detail=str(e))
 
-    AuditService().write(
-        db,
-        workflow=workflow,
-        project_id=str(project_uuid),
-        t=rnd.t,
-        actor_participant_id=principal.participant_id,
-        action="ROUND_OPENED",
-        request_id=getattr(request.state, "request_id", None),
-        details={"t": rnd.t},
+    await db.run_sync(
+        lambda s: AuditService().write(
+            s,
+            workflow=workflow,
+            project_id=str(project_uuid),
+            t=rnd.t,
+            actor_participant_id=principal.participant_id,
+            action="ROUND_OPENED",
+            request_id=getattr(request.state, "request_id", None),
+            details={"t": rnd.t},
+        )
     )
 
     return RoundResponse(
@@ -181,7 +205,7 @@ async def open_round(
 async def close_round(
     req: RoundCloseRequest,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     principal=Depends(get_current_principal),
 ):
     _authority_only(principal)
@@ -191,24 +215,28 @@ async def close_round(
 
     svc = RoundService()
     try:
-        rnd = svc.close_round(
-            db,
-            workflow=workflow,
-            project_id=project_uuid,
-            t=req.t,
+        rnd = await db.run_sync(
+            lambda s: svc.close_round(
+                s,
+                workflow=workflow,
+                project_id=project_uuid,
+                t=req.t,
+            )
         )
     except ValueError as e:
         raise HTTPException(status_code=409, detail=str(e))
 
-    AuditService().write(
-        db,
-        workflow=workflow,
-        project_id=str(project_uuid),
-        t=req.t,
-        actor_participant_id=principal.participant_id,
-        action="ROUND_CLOSED",
-        request_id=getattr(request.state, "request_id", None),
-        details={"t": req.t},
+    await db.run_sync(
+        lambda s: AuditService().write(
+            s,
+            workflow=workflow,
+            project_id=str(project_uuid),
+            t=req.t,
+            actor_participant_id=principal.participant_id,
+            action="ROUND_CLOSED",
+            request_id=getattr(request.state, "request_id", None),
+            details={"t": req.t},
+        )
     )
 
     return RoundResponse(
@@ -222,8 +250,11 @@ async def close_round(
 # LOCK ROUND
 # ─────────────────────────────────────────────────────────────
 
+# Plain `def` on purpose: locking hashes every bid and waits on the CPU
+# pool, so it runs in the threadpool on the sync session instead of
+# holding the event loop.
 @router.post("/lock", response_model=RoundResponse)
-async def lock_round(
+def lock_round(
     req: RoundLockRequest,
     request: Request,
     db: Session = Depends(get_db),
@@ -264,6 +295,71 @@ async def lock_round(
     )
 
 
+# ─────────────────────────────────────────────────────────────
+# LIVE EVENT STREAM (SSE)
+# ─────────────────────────────────────────────────────────────
+
+def _sse(event: str, data: str) -> bytes:
+    return f"event: {event}\ndata: {data}\n\n".encode("utf-8")
+
+
+@router.get(
+    "/stream",
+    dependencies=[Depends(require_workflow_project_scope)],
+)
+async def stream_round_events(
+    request: Request,
+    principal=Depends(get_current_principal),
+):
+    """
+    Server-sent events for one (workflow, projectId): a `round.current`
+    snapshot on connect, then round.opened / closed / locked (with locked
+    bid counts), matching.completed and settlement.completed as they happen,
+    and aggregates.updated (the GET /feedback/round aggregates) as bids
+    change, at most once per AGGREGATES_EVENT_INTERVAL_SECONDS. Event data
+    carries states, counts and aggregate ranges only; clients fetch details
+    from the regular (ETag-enabled) endpoints.
+
+    Comment lines are sent as heartbeats. A client that falls too far
+    behind is disconnected and gets a fresh snapshot when it reconnects.
+    Uses the bearer token like every other route, so browser clients need
+    a fetch-based EventSource.
+    """
+    workflow = request.state.workflow
+    try:
+        project_uuid = uuid.UUID(request.state.project_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="projectId must be UUID (Project.id).")
+
+    heartbeat = get_settings().sse_heartbeat_seconds
+
+    async def events():
+        # subscribe before the snapshot read so nothing falls in between
+        sub = ROUND_EVENTS.subscribe(workflow, project_uuid)
+        try:
+            async with AsyncSessionLocal() as db:
+                rnd = await RoundService().get_current_round_async(db, workflow, project_uuid)
+                current = _round_to_schema(rnd).model_dump() if rnd else None
+            yield b"retry: 3000\n\n"
+            yield _sse("round.current", json.dumps({"workflow": workflow, "project_id": str(project_uuid), "current": current}))
+
+            while not sub.overflowed:
+                try:
+                    event = await asyncio.wait_for(sub.queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                yield _sse(event.type, event.to_json())
+        finally:
+            ROUND_EVENTS.unsubscribe(sub)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # ─────────────────────────────────────────────────────────────
 # LIST ROUND HISTORY
 # ─────────────────────────────────────────────────────────────
@@ -275,20 +371,12 @@ async def lock_round(
 )
 async def list_rounds(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     principal=Depends(get_current_principal),
 ):
     workflow = request.state.workflow
     project_uuid = uuid.UUID(request.state.project_id)
 
-    rounds = (
-        db.query(Round)
-        .filter(
-            Round.workflow == workflow,
-            Round.project_id == project_uuid,
-        )
-        .order_by(Round.t.asc())
-        .all()
-    )
+    rounds = await RoundService().list_rounds_async(db, workflow, project_uuid)
 
     return [_round_to_schema(r) for r in rounds]
@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 
 from app.api.v1.health import router as health_router
+from app.api.v1.metrics import router as metrics_router
 
 # ⚠️ LEGACY (DISABLED WRITE ROUTES — MUST LOAD FIRST)
 from app.api.v1.bids import router as bids_router
@@ -32,6 +33,7 @@ from app.api.v1.slum_portals import router as slum_portals_router
 from app.api.v1.slum_enroll import router as slum_enroll_router
 from app.api.v1.subsidized_valuer import router as subsidized_valuer_router
 from app.api.v1.export import router as export_router
+from app.api.v1.export_jobs import router as export_jobs_router
 from app.api.v1.saleable import router as saleable_router
 from app.api.v1.developer_ask import router as developer_ask_router
 from app.api.v1.participants import router as participants_router
@@ -57,6 +59,7 @@ v1_router = APIRouter()
 # SYSTEM / CORE
 # ------------------------------------------------------------------
 v1_router.include_router(health_router, tags=["health"])
+v1_router.include_router(metrics_router, tags=["metrics"])
 v1_router.include_router(auth_router, tags=["auth"])
 v1_router.include_router(audit_router, tags=["audit"])
 
@@ -122,6 +125,7 @@ v1_router.include_router(subsidized_valuer_router, tags=["subsidized"])
 v1_router.include_router(participants_router, tags=["participants"])
 v1_router.include_router(admin_projects_router, tags=["admin"])
 v1_router.include_router(export_router, tags=["export"])
+v1_router.include_router(export_jobs_router, tags=["export"])
 
 # ------------------------------------------------------------------
 # AUTHORITY
@@ -2,11 +2,13 @@
 from __future__ import annotations
 
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, Request, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from app.db.session import get_db
+from app.core.artifact_cache import ARTIFACT_CACHE, SETTLEMENT_RESULT
+from app.core.etag import client_has, content_etag, not_modified, set_etag
+from app.db.session import get_async_db
 from app.core.deps_params import require_workflow_project_scope
 from app.core.auth_deps import get_current_principal
 from app.core.redaction import mask_uuid
@@ -26,21 +28,52 @@ def _is_authority(principal) -> bool:
     return principal.role.value in {"GOV_AUTHORITY", "AUDITOR"}
 
 
-def _participant_owns_quote(db: Session, bid_id: uuid.UUID, participant_id: str) -> bool:
-    row = db.execute(select(QuoteBid.participant_id).where(QuoteBid.id == bid_id)).scalar_one_or_none()
-    return bool(row == participant_id)
+async def _bid_owners(db: AsyncSession, quote_ids: list, ask_id) -> dict:
+    """participant_id per bid id for the settlement's bids, one round trip."""
+    stmt = select(QuoteBid.id, QuoteBid.participant_id).where(QuoteBid.id.in_(quote_ids))
+    if ask_id:
+        stmt = stmt.union_all(select(AskBid.id, AskBid.participant_id).where(AskBid.id == ask_id))
+    return {str(bid_id): owner for bid_id, owner in (await db.execute(stmt)).all()}
 
 
-def _participant_owns_ask(db: Session, bid_id: uuid.UUID, participant_id: str) -> bool:
-    row = db.execute(select(AskBid.participant_id).where(AskBid.id == bid_id)).scalar_one_or_none()
-    return bool(row == participant_id)
+async def _settlement_dict(db: AsyncSession, row) -> dict:
+    winner_id = row.winner_quote_bid_id
+    ask_id = row.winning_ask_bid_id
+    second_id = row.second_price_quote_bid_id
+
+    quote_ids = [i for i in (winner_id, second_id) if i]
+    owners = await _bid_owners(db, quote_ids, ask_id) if quote_ids or ask_id else {}
+
+    return {
+        "status": row.status,
+        "settled": bool(row.settled == "true" if isinstance(row.settled, str) else row.settled),
+        "winner_quote_bid_id": str(winner_id) if winner_id else None,
+        "winning_ask_bid_id": str(ask_id) if ask_id else None,
+        "second_price_quote_bid_id": str(second_id) if second_id else None,
+        "max_quote_inr": str(row.max_quote_inr) if row.max_quote_inr is not None else None,
+        "second_price_inr": str(row.second_price_inr) if row.second_price_inr is not None else None,
+        "min_ask_total_inr": str(row.min_ask_total_inr) if row.min_ask_total_inr is not None else None,
+        "computed_at_iso": _iso(row.computed_at),
+        "receipt": row.receipt_json or {},
+        # not returned: used for the non-authority visibility checks
+        "owners": owners,
+    }
+
+
+def _visible_id(bid_id, owners: dict, participant_id: str):
+    if not bid_id:
+        return None
+    if owners.get(bid_id) == participant_id:
+        return bid_id
+    return mask_uuid(bid_id)
 
 
 @router.get("/result", response_model=SettlementResultResponse, dependencies=[Depends(require_workflow_project_scope)])
 async def get_settlement_result(
     request: Request,
+    response: Response,
     t: int = Query(..., ge=0),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     principal=Depends(get_current_principal),
 ):
     workflow = request.state.workflow
@@ -51,11 +84,16 @@ async def get_settlement_result(
         raise HTTPException(status_code=400, detail="projectId must be UUID (Project.id).")
 
     svc = SettlementService()
+
+    async def load() -> dict:
+        row = await svc.compute_and_store_if_needed_async(db, workflow=workflow, project_id=project_uuid, t=t)
+        return await _settlement_dict(db, row)
+
     try:
-        row = svc.compute_and_store_if_needed(db, workflow=workflow, project_id=project_uuid, t=t)
+        row = await ARTIFACT_CACHE.get_or_load_async(workflow, project_uuid, t, SETTLEMENT_RESULT, load)
     except ValueError as e:
         msg = str(e)
-        if "only after round lock" in msg:
+        if "only after round lock" in msg or "book mode" in msg:
             raise HTTPException(status_code=409, detail=msg)
         if "Round not found" in msg:
             raise HTTPException(status_code=404, detail=msg)
@@ -64,40 +102,26 @@ async def get_settlement_result(
     # Role-based visibility
     full = _is_authority(principal)
 
-    winner_id = row.winner_quote_bid_id
-    ask_id = row.winning_ask_bid_id
-    second_id = row.second_price_quote_bid_id
+    winner_id = row["winner_quote_bid_id"]
+    ask_id = row["winning_ask_bid_id"]
+    second_id = row["second_price_quote_bid_id"]
 
     # Decide what IDs to reveal
     if full:
-        out_winner = str(winner_id) if winner_id else None
-        out_ask = str(ask_id) if ask_id else None
-        out_second = str(second_id) if second_id else None
-        receipt = row.receipt_json or {}
+        out_winner = winner_id
+        out_ask = ask_id
+        out_second = second_id
+        receipt = row["receipt"]
     else:
         # non-authority: reveal only if caller owns that bid; otherwise redact
-        out_winner = None
-        out_ask = None
-        out_second = None
-
-        if winner_id and _participant_owns_quote(db, winner_id, principal.participant_id):
-            out_winner = str(winner_id)
-        elif winner_id:
-            out_winner = mask_uuid(winner_id)
-
-        if ask_id and _participant_owns_ask(db, ask_id, principal.participant_id):
-            out_ask = str(ask_id)
-        elif ask_id:
-            out_ask = mask_uuid(ask_id)
-
-        # second-price bid belongs to another buyer typically -> redact
-        if second_id and _participant_owns_quote(db, second_id, principal.participant_id):
-            out_second = str(second_id)
-        elif second_id:
-            out_second = mask_uuid(second_id)
+        # (second-price bid belongs to another buyer typically -> redacted)
+        owners = row["owners"]
+        out_winner = _visible_id(winner_id, owners, principal.participant_id)
+        out_ask = _visible_id(ask_id, owners, principal.participant_id)
+        out_second = _visible_id(second_id, owners, principal.participant_id)
 
         # receipt filtered: keep rule + hashes, remove raw IDs that aren't theirs
-        receipt = row.receipt_json or {}
+        receipt = row["receipt"]
         # Remove detailed references for non-authority except status
         receipt = {
             "status": receipt.get("status"),
@@ -111,20 +135,24 @@ async def get_settlement_result(
             },
         }
 
-    settled_bool = bool(row.settled == "true" if isinstance(row.settled, str) else row.settled)
-
-    return {
+    body = {
         "workflow": workflow,
         "projectId": pid_raw,
         "t": t,
-        "status": row.status,
-        "settled": settled_bool,
+        "status": row["status"],
+        "settled": row["settled"],
         "winner_quote_bid_id": out_winner,
         "winning_ask_bid_id": out_ask,
         "second_price_quote_bid_id": out_second,
-        "max_quote_inr": str(row.max_quote_inr) if row.max_quote_inr is not None else None,
-        "second_price_inr": str(row.second_price_inr) if row.second_price_inr is not None else None,
-        "min_ask_total_inr": str(row.min_ask_total_inr) if row.min_ask_total_inr is not None else None,
-        "computed_at_iso": _iso(row.computed_at),
+        "max_quote_inr": row["max_quote_inr"],
+        "second_price_inr": row["second_price_inr"],
+        "min_ask_total_inr": row["min_ask_total_inr"],
+        "computed_at_iso": row["computed_at_iso"],
         "receipt": receipt,
     }
+
+    etag = content_etag(body)
+    if client_has(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    return body
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.config import get_settings
+from app.core.metrics import ARTIFACT_CACHE_LOOKUPS
+
+
+# artifact names
+MATCHING_RESULT = "matching_result"
+MATCHING_PAIRS = "matching_pairs"
+SETTLEMENT_RESULT = "settlement_result"
+PENALTY_EVENT = "penalty_event"
+PARAMS_SNAPSHOT = "params_snapshot"
+FEEDBACK_AGGREGATES = "feedback_aggregates"
+MARKET_DEPTH = "market_depth"
+
+Key = Tuple[str, str, int, str]
+
+
+def _key(workflow: str, project_id: uuid.UUID | str, t: int, artifact: str) -> Key:
+    return (workflow, str(project_id), int(t), artifact)
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: Dict[str, Any]
+    size: int
+    stamp: Optional[Tuple[int, int]]  # shared file (inode, mtime_ns) it was read from / written to
+
+
+class ArtifactCache:
+    """
+    Read-through cache for round artifacts that are written once and then
+    never change (matching / settlement results, penalty events, parameter
+    snapshots, locked-round feedback aggregates), keyed by
+    (workflow, project_id, t, artifact).
+
+    Values are JSON-ready dicts built by the caller, never ORM rows, and are
+    shared between requests: treat them as read-only.
+
+    Tiers:
+      1. in-process LRU, bounded by entry count and serialized bytes
+      2. optional directory shared by the workers of one host (ARTIFACT_CACHE_DIR):
+         one JSON file per key, written atomically
+
+    Invalidation deletes the shared file too; with the shared tier enabled
+    every in-process hit is checked against the file's (inode, mtime), so an
+    invalidation in one worker reaches all of them. Without it, invalidation
+    is local to the process.
+    """
+
+    def __init__(self, *, max_entries: int, max_bytes: int, shared_dir: str = ""):
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self.shared_dir = shared_dir or None
+        self._entries: "OrderedDict[Key, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        if self.shared_dir:
+            os.makedirs(self.shared_dir, exist_ok=True)
+
+    # ─────────────────────────────────────────────
+    # SHARED TIER
+    # ─────────────────────────────────────────────
+
+    def _path(self, k: Key) -> str:
+        name = hashlib.sha256("\x00".join(map(str, k)).encode("utf-8")).hexdigest()
+        return os.path.join(self.shared_dir, f"{name}.json")
+
+    @staticmethod
+    def _stamp(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns
+
+    def _read_shared(self, k: Key) -> Optional[_Entry]:
+        path = self._path(k)
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+                st = os.fstat(f.fileno())
+        except FileNotFoundError:
+            return None
+        return _Entry(value=json.loads(raw), size=len(raw), stamp=(st.st_ino, st.st_mtime_ns))
+
+    def _write_shared(self, k: Key, raw: bytes) -> Optional[Tuple[int, int]]:
+        path = self._path(k)
+        fd, tmp = tempfile.mkstemp(dir=self.shared_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(raw)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+        return self._stamp(path)
+
+    # ─────────────────────────────────────────────
+    # LRU TIER
+    # ─────────────────────────────────────────────
+
+    def _put(self, k: Key, entry: _Entry) -> None:
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(k, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._entries[k] = entry
+            self._bytes += entry.size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, dropped = self._entries.popitem(last=False)
+                self._bytes -= dropped.size
+
+    def _drop(self, k: Key) -> None:
+        with self._lock:
+            old = self._entries.pop(k, None)
+            if old is not None:
+                self._bytes -= old.size
+
+    # ─────────────────────────────────────────────
+    # PUBLIC API
+    # ─────────────────────────────────────────────
+
+    def get(self, workflow: str, project_id, t: int, artifact: str) -> Optional[Dict[str, Any]]:
+        k = _key(workflow, project_id, t, artifact)
+
+        with self._lock:
+            entry = self._entries.get(k)
+            if entry is not None:
+                self._entries.move_to_end(k)
+
+        if entry is not None:
+            if self.shared_dir is None or self._stamp(self._path(k)) == entry.stamp:
+                ARTIFACT_CACHE_LOOKUPS.inc(artifact=artifact, result="hit")
+                return entry.value
+            self._drop(k)  # invalidated (or rewritten) by another worker
+
+        if self.shared_dir is not None:
+            entry = self._read_shared(k)
+            if entry is not None:
+                self._put(k, entry)
+                ARTIFACT_CACHE_LOOKUPS.inc(artifact=artifact, result="shared_hit")
+                return entry.value
+
+        ARTIFACT_CACHE_LOOKUPS.inc(artifact=artifact, result="miss")
+        return None
+
+    def set(
+        self, workflow: str, project_id, t: int, artifact: str, value: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        k = _key(workflow, project_id, t, artifact)
+        raw = json.dumps(value, separators=(",", ":"), default=str).encode("utf-8")
+        stamp = self._write_shared(k, raw) if self.shared_dir is not None else None
+        self._put(k, _Entry(value=value, size=len(raw), stamp=stamp))
+        return value
+
+    def invalidate(self, workflow: str, project_id, t: int, artifact: str) -> None:
+        k = _key(workflow, project_id, t, artifact)
+        self._drop(k)
+        if self.shared_dir is not None:
+            try:
+                os.unlink(self._path(k))
+            except FileNotFoundError:
+                pass
+
+    def get_or_load(
+        self,
+        workflow: str,
+        project_id,
+        t: int,
+        artifact: str,
+        loader: Callable[[], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Cached value, or loader() stored and returned. Exceptions from the
+        loader (not found / not locked yet) propagate and nothing is cached.
+        """
+        value = self.get(workflow, project_id, t, artifact)
+        if value is None:
+            value = self.set(workflow, project_id, t, artifact, loader())
+        return value
+
+    async def get_or_load_async(
+        self,
+        workflow: str,
+        project_id,
+        t: int,
+        artifact: str,
+        loader: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        value = self.get(workflow, project_id, t, artifact)
+        if value is None:
+            value = self.set(workflow, project_id, t, artifact, await loader())
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+def _build() -> ArtifactCache:
+    settings = get_settings()
+    return ArtifactCache(
+        max_entries=settings.artifact_cache_max_entries,
+        max_bytes=settings.artifact_cache_max_bytes,
+        shared_dir=settings.artifact_cache_dir,
+    )
+
+
+ARTIFACT_CACHE = _build()
@@ -25,6 +25,63 @@ class Settings(BaseSettings):
     jwt_algorithm: str = "HS256"
     jwt_access_token_minutes: int = 1440  # 24 hours
 
+    # ─────────── WORKERS ───────────
+    cpu_pool_workers: int = 0  # 0 → os.cpu_count()
+
+    # ─────────── BID LOCKING ───────────
+    bid_lock_batch_size: int = 1000
+    bid_lock_pool_min_batch: int = 500  # smaller batches are hashed inline
+
+    # ─────────── RATE LIMITING ───────────
+    rate_limit_backend: str = "memory"  # memory | shared | db
+    rate_limit_shared_path: str = ""  # "" → <tmpdir>/tdr_rate_limit.bin
+    rate_limit_shared_slots: int = 65536
+    rate_limit_max_keys: int = 100_000  # memory backend, per limiter
+
+    # ─────────── METRICS ───────────
+    metrics_enabled: bool = True
+    metrics_dir: str = ""  # "" → per process; set to a shared dir under gunicorn
+
+    # ─────────── SQL INSTRUMENTATION ───────────
+    sql_debug_header: bool = False  # X-DB-Queries / X-DB-Time-Ms on every response
+    sql_slow_request_ms: float = 1000.0  # log requests slower than this
+    sql_repeat_threshold: int = 10  # log when one statement runs this often in a request
+
+    # ─────────── ROUND ARTIFACT CACHE ───────────
+    artifact_cache_max_entries: int = 4096
+    artifact_cache_max_bytes: int = 64 * 1024 * 1024  # serialized JSON, per process
+    artifact_cache_dir: str = ""  # "" → in-process only; a shared dir for multi-worker hosts
+
+    # ─────────── FEEDBACK ───────────
+    feedback_stats_ttl_seconds: float = 2.0  # open-round aggregates; bounds staleness across workers
+    market_depth_buckets: int = 10  # equal-width histogram buckets between min and max
+    market_depth_min_bids: int = 5  # fewer locked bids → no percentiles / histogram
+    market_depth_min_cell: int = 3  # buckets with 1..k-1 bids report a null count
+
+    # ─────────── ROUND EVENT STREAM ───────────
+    round_events_pg_notify: bool = True  # LISTEN/NOTIFY fan-out across workers (Postgres only)
+    round_events_channel: str = "round_events"
+    round_events_queue_size: int = 256  # per stream; a client further behind is disconnected
+    aggregates_event_interval_seconds: float = 1.0  # aggregates.updated per round, at most this often
+    sse_heartbeat_seconds: float = 15.0
+
+    # ─────────── EXPORTS ───────────
+    export_chunk_bytes: int = 64 * 1024  # rows are coalesced into sends of about this size
+    export_gzip: bool = True  # gzip on the fly when the client sends Accept-Encoding: gzip
+    export_gzip_level: int = 6
+    export_fetch_batch_size: int = 1000  # rows per server-side cursor fetch
+    export_copy: bool = True  # full-scope audit CSV via COPY ... TO STDOUT on Postgres
+    export_artifact_dir: str = "var/exports"  # background export files + manifests
+    export_job_workers: int = 2  # per process
+    export_job_reuse_seconds: float = 3600.0  # identical requests share a finished job this long
+    export_job_stale_seconds: float = 6 * 3600.0  # a job running longer is presumed dead
+
+    # ─────────── LEDGER ───────────
+    ledger_checkpoint_secret: str = ""  # "" → jwt_secret_key
+    ledger_verify_batch_size: int = 2000
+    ledger_verify_pool_min_batch: int = 500  # smaller batches are serialized inline
+    ledger_merkle_batch_size: int = 1024  # entries per sealed Merkle root
+
 
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
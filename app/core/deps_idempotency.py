@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 
 from app.db.session import get_db
 from app.core.auth_deps import get_current_principal
+from app.core.metrics import IDEMPOTENCY_CONFLICTS, IDEMPOTENCY_REPLAYS
 from app.policies.rbac import Principal
 from app.services.idempotency_service import IdempotencyService
 
@@ -65,8 +66,12 @@ async def idempotency_guard(
             request_payload=payload if isinstance(payload, dict) else {"_": payload},
         )
     except ValueError as e:
+        IDEMPOTENCY_CONFLICTS.inc(endpoint=endpoint_key)
         raise HTTPException(status_code=409, detail=str(e))
 
+    if replay_json is not None:
+        IDEMPOTENCY_REPLAYS.inc(endpoint=endpoint_key)
+
     request.state.idempotency_endpoint_key = endpoint_key
     request.state.idempotency_key = idem_key
     request.state.idempotency_request_hash = req_hash
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any
+
+from fastapi import Request, Response
+
+# responses are per caller (role / participant dependent): browsers may keep
+# them but must revalidate, shared caches must not
+CACHE_CONTROL = "private, no-cache"
+
+
+def version_etag(*parts: Any) -> str:
+    """
+    Strong ETag from version columns (ids, updated_at, counts) read with a
+    cheap query, so a 304 can be answered without loading full rows.
+    Include everything that changes the representation for this caller.
+    """
+    raw = "\x1f".join("" if p is None else str(p) for p in parts)
+    return '"' + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def content_etag(payload: Any) -> str:
+    """Strong ETag from the JSON representation itself."""
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return '"' + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def client_has(request: Request, etag: str) -> bool:
+    """True when the request's If-None-Match already covers `etag`."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison (RFC 9110 §13.1.2)
+    tags = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import base64
+import struct
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from sqlalchemy import BigInteger, LargeBinary, cast, extract, func, literal, tuple_
+from sqlalchemy.sql import ColumnElement
+
+# Continuation tokens for exports ordered by (created_at, id): version byte,
+# created_at as epoch microseconds, id bytes; base64url without padding.
+# Not signed: the export's own scope filter still applies, so a forged token
+# can only move the starting point.
+
+_VERSION = 1
+_FORMAT = ">Bq16s"
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICRO = timedelta(microseconds=1)
+
+Cursor = Tuple[datetime, uuid.UUID]
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    micros = (created_at - _EPOCH) // _MICRO
+    raw = struct.pack(_FORMAT, _VERSION, micros, row_id.bytes)
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(token: str) -> Cursor:
+    """Raises ValueError for anything that is not a token from encode_cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        version, micros, id_bytes = struct.unpack(_FORMAT, raw)
+    except (ValueError, struct.error, UnicodeEncodeError):
+        raise ValueError("Malformed continuation token.")
+    if version != _VERSION:
+        raise ValueError("Unsupported continuation token.")
+    return _EPOCH + micros * _MICRO, uuid.UUID(bytes=id_bytes)
+
+
+def after(created_col, id_col, cursor: Optional[Cursor]) -> Optional[ColumnElement[bool]]:
+    """Row-value predicate (created_at, id) > cursor, or None for the first page."""
+    if cursor is None:
+        return None
+    return tuple_(created_col, id_col) > tuple_(*cursor)
+
+
+def cursor_sql(created_col, id_col) -> ColumnElement[str]:
+    """
+    encode_cursor computed by Postgres, for exports that never see rows in
+    Python (COPY). int8send / uuid_send give the same big-endian bytes.
+    """
+    micros = cast(extract("epoch", created_col) * 1_000_000, BigInteger)
+    raw = (
+        literal(struct.pack(">B", _VERSION), LargeBinary)
+        .op("||")(func.int8send(micros))
+        .op("||")(func.uuid_send(id_col))
+    )
+    return func.rtrim(func.translate(func.encode(raw, "base64"), "+/", "-_"), "=")
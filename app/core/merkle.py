@@ -0,0 +1,88 @@
+# app/core/merkle.py
+"""
+Merkle tree hashing and inclusion proofs (RFC 6962 / RFC 9162 §2.1).
+
+    leaf hash  = SHA256(0x00 || data)
+    node hash  = SHA256(0x01 || left || right)
+
+Domain-separated prefixes keep a leaf from ever being passed off as an
+interior node. Trees of any size are supported (not just powers of two).
+"""
+from __future__ import annotations
+
+import hashlib
+from typing import List, Sequence
+
+_LEAF = b"\x00"
+_NODE = b"\x01"
+
+
+def leaf_hash(data: bytes) -> bytes:
+    return hashlib.sha256(_LEAF + data).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(_NODE + left + right).digest()
+
+
+def _split(n: int) -> int:
+    """Largest power of two strictly smaller than n (n >= 2)."""
+    k = 1
+    while k << 1 < n:
+        k <<= 1
+    return k
+
+
+def merkle_root(leaves: Sequence[bytes]) -> bytes:
+    """
+    Root over already-hashed leaves (see leaf_hash).
+    """
+    n = len(leaves)
+    if n == 0:
+        return hashlib.sha256(b"").digest()
+    if n == 1:
+        return leaves[0]
+    k = _split(n)
+    return node_hash(merkle_root(leaves[:k]), merkle_root(leaves[k:]))
+
+
+def inclusion_proof(index: int, leaves: Sequence[bytes]) -> List[bytes]:
+    """
+    Audit path for leaves[index], ordered leaf → root.
+    """
+    n = len(leaves)
+    if not 0 <= index < n:
+        raise ValueError("leaf index out of range")
+    if n == 1:
+        return []
+    k = _split(n)
+    if index < k:
+        return inclusion_proof(index, leaves[:k]) + [merkle_root(leaves[k:])]
+    return inclusion_proof(index - k, leaves[k:]) + [merkle_root(leaves[:k])]
+
+
+def verify_inclusion(
+    leaf: bytes, index: int, tree_size: int, proof: Sequence[bytes], root: bytes
+) -> bool:
+    """
+    Check an audit path against a root (RFC 9162 §2.1.3.2).
+    """
+    if not 0 <= index < tree_size:
+        return False
+
+    fn, sn = index, tree_size - 1
+    r = leaf
+    for p in proof:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            r = node_hash(p, r)
+            while not fn & 1 and fn != 0:
+                fn >>= 1
+                sn >>= 1
+        else:
+            r = node_hash(r, p)
+        fn >>= 1
+        sn >>= 1
+
+    return sn == 0 and r == root
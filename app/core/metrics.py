@@ -0,0 +1,355 @@
+"""
+In-process metrics: counters and fixed-bucket histograms, rendered in the
+Prometheus text exposition format.
+
+Storage is chosen by METRICS_DIR:
+  ""   → a dict in this process (single worker / tests)
+  path → one mmap'd file per worker PID in that directory; a scrape of
+         any worker sums every file, so gunicorn workers report as one.
+         Clear the directory before starting the server.
+
+Every sample is a float keyed by "family\\x00suffix\\x00labels"; histograms
+store per-bucket (non-cumulative) counts and are made cumulative on render.
+"""
+from __future__ import annotations
+
+import bisect
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.core.config import get_settings
+
+
+# ─────────────────────────────────────────────
+# STORAGE
+# ─────────────────────────────────────────────
+
+class _LocalValues:
+    def __init__(self):
+        self._values: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, key: str, amount: float) -> None:
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._values)
+
+
+_HDR = struct.Struct("<II")  # used bytes, reserved
+_LEN = struct.Struct("<I")
+_VAL = struct.Struct("<d")
+_INITIAL_SIZE = 1 << 16
+
+
+def _pad8(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def _read_entries(buf, used: int) -> Iterator[Tuple[str, float, int]]:
+    """
+    (key, value, value_offset) for every entry in a metrics file buffer.
+    """
+    pos = _HDR.size
+    while pos + _LEN.size <= used:
+        (klen,) = _LEN.unpack_from(buf, pos)
+        key = bytes(buf[pos + _LEN.size:pos + _LEN.size + klen]).decode("utf-8")
+        voff = pos + _pad8(_LEN.size + klen)
+        (value,) = _VAL.unpack_from(buf, voff)
+        yield key, value, voff
+        pos = voff + _VAL.size
+
+
+class _MmapValues:
+    """
+    Append-only key → float file written by exactly one process.
+    A new key is written in full before the header's used-size moves past
+    it, so readers in other processes never see a partial entry.
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._size = max(os.fstat(self._fd).st_size, _INITIAL_SIZE)
+        os.ftruncate(self._fd, self._size)
+        self._mm = mmap.mmap(self._fd, self._size)
+
+        used = _HDR.unpack_from(self._mm, 0)[0]
+        if used < _HDR.size:
+            used = _HDR.size
+            _HDR.pack_into(self._mm, 0, used, 0)
+        self._used = used
+        # a reused PID's leftovers are kept: counters only ever go up
+        self._positions = {k: off for k, _, off in _read_entries(self._mm, used)}
+
+    def _grow(self, need: int) -> None:
+        size = self._size
+        while size < need:
+            size *= 2
+        self._mm.close()
+        os.ftruncate(self._fd, size)
+        self._mm = mmap.mmap(self._fd, size)
+        self._size = size
+
+    def inc(self, key: str, amount: float) -> None:
+        with self._lock:
+            off = self._positions.get(key)
+            if off is None:
+                raw = key.encode("utf-8")
+                entry = _pad8(_LEN.size + len(raw)) + _VAL.size
+                if self._used + entry > self._size:
+                    self._grow(self._used + entry)
+                _LEN.pack_into(self._mm, self._used, len(raw))
+                self._mm[self._used + _LEN.size:self._used + _LEN.size + len(raw)] = raw
+                off = self._used + entry - _VAL.size
+                _VAL.pack_into(self._mm, off, 0.0)
+                self._used += entry
+                _HDR.pack_into(self._mm, 0, self._used, 0)
+                self._positions[key] = off
+            (value,) = _VAL.unpack_from(self._mm, off)
+            _VAL.pack_into(self._mm, off, value + amount)
+
+
+def _read_dir(path: str) -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    for name in os.listdir(path):
+        if not name.endswith(".db"):
+            continue
+        try:
+            with open(os.path.join(path, name), "rb") as f:
+                buf = f.read()
+        except OSError:
+            continue
+        if len(buf) < _HDR.size:
+            continue
+        used = min(_HDR.unpack_from(buf, 0)[0], len(buf))
+        for key, value, _ in _read_entries(buf, used):
+            out[key] = out.get(key, 0.0) + value
+    return out
+
+
+# ─────────────────────────────────────────────
+# METRICS
+# ─────────────────────────────────────────────
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(v: float) -> str:
+    if v == math.inf:
+        return "+Inf"
+    if float(v).is_integer():
+        return str(int(v))
+    return repr(float(v))
+
+
+def _braces(labelstr: str) -> str:
+    return f"{{{labelstr}}}" if labelstr else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        REGISTRY.register(self)
+
+    def _labels(self, labels: Dict[str, object]) -> str:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return ",".join(f'{n}="{_escape(str(labels[n]))}"' for n in self.labelnames)
+
+    def _inc(self, suffix: str, labelstr: str, amount: float) -> None:
+        REGISTRY.values().inc(f"{self.name}\x00{suffix}\x00{labelstr}", amount)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        self._inc("", self._labels(labels), amount)
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.buckets = tuple(sorted(float(b) for b in buckets if b != math.inf)) + (math.inf,)
+        super().__init__(name, documentation, labelnames)
+
+    def observe(self, value: float, **labels: object) -> None:
+        labelstr = self._labels(labels)
+        le = self.buckets[bisect.bisect_left(self.buckets, value)]
+        self._inc(f"_bucket:{_fmt(le)}", labelstr, 1.0)
+        self._inc("_sum", labelstr, value)
+        self._inc("_count", labelstr, 1.0)
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, **labels)
+
+
+# ─────────────────────────────────────────────
+# REGISTRY
+# ─────────────────────────────────────────────
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._values = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric: {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def values(self):
+        # storage is per PID so forked workers never share a file
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    path = get_settings().metrics_dir
+                    if path:
+                        os.makedirs(path, exist_ok=True)
+                        self._values = _MmapValues(os.path.join(path, f"metrics_{os.getpid()}.db"))
+                    else:
+                        self._values = _LocalValues()
+                    self._pid = os.getpid()
+        return self._values
+
+    def collect(self) -> Dict[str, float]:
+        path = get_settings().metrics_dir
+        if path:
+            self.values()  # make sure this worker's file exists
+            return _read_dir(path)
+        return self.values().snapshot()
+
+    def render(self) -> str:
+        samples: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for key, value in self.collect().items():
+            family, suffix, labelstr = key.split("\x00")
+            samples.setdefault(family, {}).setdefault(labelstr, {})[suffix] = value
+
+        lines: List[str] = []
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for labelstr, vals in sorted(samples.get(name, {}).items()):
+                if isinstance(metric, Histogram):
+                    cumulative = 0.0
+                    for le in metric.buckets:
+                        cumulative += vals.get(f"_bucket:{_fmt(le)}", 0.0)
+                        sep = "," if labelstr else ""
+                        lines.append(f'{name}_bucket{{{labelstr}{sep}le="{_fmt(le)}"}} {_fmt(cumulative)}')
+                    for suffix in ("_sum", "_count"):
+                        lines.append(f"{name}{suffix}{_braces(labelstr)} {_fmt(vals.get(suffix, 0.0))}")
+                else:
+                    lines.append(f"{name}{_braces(labelstr)} {_fmt(vals.get('', 0.0))}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+# ─────────────────────────────────────────────
+# APP METRICS
+# ─────────────────────────────────────────────
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status")
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request latency, until the last body chunk.", ("method", "route")
+)
+HTTP_REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds", "Time spent in DB cursor executes per HTTP request.", ("method", "route")
+)
+HTTP_REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "DB statements executed per HTTP request.",
+    ("method", "route"),
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200),
+)
+
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections_total", "Requests rejected with 429 by the route rate limiter.", ("route",)
+)
+IDEMPOTENCY_CONFLICTS = Counter(
+    "idempotency_conflicts_total", "Idempotency-Key reuse with a different payload (409).", ("endpoint",)
+)
+IDEMPOTENCY_REPLAYS = Counter(
+    "idempotency_replays_total", "Requests answered from a stored idempotent response.", ("endpoint",)
+)
+
+ARTIFACT_CACHE_LOOKUPS = Counter(
+    "artifact_cache_lookups_total", "Round artifact cache lookups by tier outcome.", ("artifact", "result")
+)
+
+ROUND_EVENTS_PUBLISHED = Counter(
+    "round_events_published_total", "Round stream events published by this process.", ("type",)
+)
+
+MATCHING_RUNS = Counter(
+    "matching_runs_total", "Matching results served, computed vs already stored.", ("workflow", "outcome")
+)
+MATCHING_COMPUTE_SECONDS = Histogram(
+    "matching_compute_seconds", "Time to compute and store a matching result.", ("workflow", "mode")
+)
+SETTLEMENT_RUNS = Counter(
+    "settlement_runs_total", "Settlement results served, computed vs already stored.", ("workflow", "outcome")
+)
+SETTLEMENT_COMPUTE_SECONDS = Histogram(
+    "settlement_compute_seconds", "Time to compute and store a settlement result.", ("workflow",)
+)
+
+EXPORT_JOBS = Counter(
+    "export_jobs_total", "Background export jobs requested, reused or finished.", ("kind", "outcome")
+)
+EXPORT_JOB_SECONDS = Histogram(
+    "export_job_seconds",
+    "Background export run time.",
+    ("kind",),
+    buckets=(1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 1800.0, 3600.0),
+)
+
+LEDGER_APPEND_SECONDS = Histogram(
+    "ledger_append_seconds", "Ledger append latency (single entry or one batch).", ("op",)
+)
+LEDGER_ENTRIES_APPENDED = Counter("ledger_entries_appended_total", "Ledger entries written.", ("op",))
+LEDGER_STALE_TAIL_RETRIES = Counter(
+    "ledger_stale_tail_retries_total", "Single appends retried after a stale cached tail.", ()
+)
+LEDGER_VERIFY_SECONDS = Histogram(
+    "ledger_verify_seconds",
+    "Ledger chain verification latency.",
+    ("mode",),
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+LEDGER_VERIFY_FAILURES = Counter("ledger_verify_failures_total", "Ledger verifications that found a break.", ())
@@ -1,25 +1,34 @@
 import uuid
-from typing import Callable
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
-class RequestIdMiddleware(BaseHTTPMiddleware):
+class RequestIdMiddleware:
     """
     Ensures every request has a request-id, placed into response headers.
     Uses configured header name (default X-Request-Id).
+
+    Plain ASGI (no BaseHTTPMiddleware): the response body is passed through
+    untouched, so streaming exports keep their backpressure.
     """
 
-    def __init__(self, app, header_name: str = "X-Request-Id"):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, header_name: str = "X-Request-Id"):
+        self.app = app
         self.header_name = header_name
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        rid = request.headers.get(self.header_name) or str(uuid.uuid4())
-        request.state.request_id = rid
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rid = Headers(scope=scope).get(self.header_name) or str(uuid.uuid4())
+        # request.state is backed by scope["state"]
+        scope.setdefault("state", {})["request_id"] = rid
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[self.header_name] = rid
+            await send(message)
 
-        response = await call_next(request)
-        response.headers[self.header_name] = rid
-        return response
\ No newline at end of file
+        await self.app(scope, receive, send_with_request_id)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import (
+    HTTP_REQUEST_DB_QUERIES,
+    HTTP_REQUEST_DB_SECONDS,
+    HTTP_REQUEST_SECONDS,
+    HTTP_REQUESTS,
+)
+from app.db import query_stats
+
+
+class MetricsMiddleware:
+    """
+    Per-request latency, status and DB time, labelled by route template
+    (e.g. /api/v1/bids/quote) so path parameters do not explode cardinality.
+    Streaming responses are timed until their last body chunk.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        t0 = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - t0
+            # opened by QueryStatsMiddleware around this one
+            stats = query_stats.current()
+
+            # the router stores the matched route in the (shared) scope
+            route = scope.get("route")
+            route_path = getattr(route, "path_format", None) or getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+
+            HTTP_REQUESTS.inc(method=method, route=route_path, status=status)
+            HTTP_REQUEST_SECONDS.observe(elapsed, method=method, route=route_path)
+            if stats is not None:
+                HTTP_REQUEST_DB_SECONDS.observe(stats.seconds, method=method, route=route_path)
+                HTTP_REQUEST_DB_QUERIES.observe(stats.queries, method=method, route=route_path)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+from app.db import query_stats
+
+logger = logging.getLogger(__name__)
+
+
+def _request_id(scope: Scope):
+    # set by RequestIdMiddleware further in; scope["state"] is shared
+    return scope.get("state", {}).get("request_id")
+
+
+class QueryStatsMiddleware:
+    """
+    Opens the per-request QueryStats that the engine hooks fill in
+    (app/db/query_stats.py) and reports on it:
+
+      - SQL_DEBUG_HEADER=true → X-DB-Queries / X-DB-Time-Ms response headers
+        (for streamed responses: the work done before the first chunk)
+      - requests slower than SQL_SLOW_REQUEST_MS are logged with their DB totals
+      - a statement executed SQL_REPEAT_THRESHOLD+ times in one request
+        (N+1 pattern) is logged with its SQL
+
+    Must be the outermost middleware so everything inside (metrics
+    included) sees the same stats object.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        debug_header: Optional[bool] = None,
+        slow_request_ms: Optional[float] = None,
+        repeat_threshold: Optional[int] = None,
+    ):
+        settings = get_settings()
+        self.app = app
+        self.debug_header = settings.sql_debug_header if debug_header is None else debug_header
+        self.slow_seconds = (
+            settings.sql_slow_request_ms if slow_request_ms is None else slow_request_ms
+        ) / 1000.0
+        self.repeat_threshold = (
+            settings.sql_repeat_threshold if repeat_threshold is None else repeat_threshold
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        t0 = time.perf_counter()
+        token = query_stats.start_request()
+        stats = query_stats.current()
+        event_stream = False
+
+        async def send_with_stats(message: Message) -> None:
+            nonlocal event_stream
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                event_stream = headers.get("content-type", "").startswith("text/event-stream")
+                if self.debug_header:
+                    headers["X-DB-Queries"] = str(stats.queries)
+                    headers["X-DB-Time-Ms"] = f"{stats.seconds * 1000:.2f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            query_stats.end_request(token)
+            stats.request_id = _request_id(scope)
+            # SSE streams are long by design: not a slow request
+            if not event_stream:
+                self._report(scope, stats, time.perf_counter() - t0)
+
+    def _report(self, scope: Scope, stats: query_stats.QueryStats, elapsed: float) -> None:
+        repeated = stats.repeated(self.repeat_threshold)
+        if elapsed < self.slow_seconds and not repeated:
+            return
+
+        extra = {
+            "request_id": stats.request_id,
+            "method": scope["method"],
+            "path": scope["path"],
+            "elapsed_ms": round(elapsed * 1000, 2),
+            "db_queries": stats.queries,
+            "db_ms": round(stats.seconds * 1000, 2),
+        }
+        if repeated:
+            extra["repeated_statements"] = [
+                {"count": n, "sql": " ".join(sql.split())[:300]} for sql, n in repeated[:5]
+            ]
+            logger.warning("Repeated SQL statements in one request (possible N+1)", extra=extra)
+        else:
+            logger.warning("Slow request", extra=extra)
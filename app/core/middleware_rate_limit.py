@@ -1,36 +1,73 @@
 from __future__ import annotations
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+import math
+from typing import Optional
+
+from starlette.datastructures import Headers
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.metrics import RATE_LIMIT_REJECTIONS
+from app.core.rate_limit import ROUTE_RATE_LIMITS
+from app.core.security import decode_token
+
+
+def _participant_id(scope: Scope) -> Optional[str]:
+    """
+    Participant for the request: request.state.principal when an upstream
+    layer set it, otherwise the bearer token's participant_id claim.
+    Unauthenticated requests are not limited here; the auth dependency
+    rejects them.
+    """
+    principal = scope.get("state", {}).get("principal")
+    if principal:
+        return principal.participant_id
 
-from app.core.rate_limit import BID_POST_LIMITER
+    auth = Headers(scope=scope).get("authorization") or ""
+    scheme, _, token = auth.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return decode_token(token).get("participant_id")
+    except Exception:
+        return None
 
 
-class BidRateLimitMiddleware(BaseHTTPMiddleware):
+class BidRateLimitMiddleware:
     """
-    Applies ONLY to POST bid endpoints.
-    Requires auth middleware to set request.state.principal.
+    Applies ONLY to routes with a policy in RATE_LIMIT_POLICIES
+    (the POST bid endpoints). Plain ASGI: everything else is passed
+    straight through.
     """
 
-    async def dispatch(self, request: Request, call_next):
-        path = request.url.path
-        method = request.method.upper()
-
-        # Only rate limit the POST bid endpoints
-        if method == "POST" and path in {
-            "/v1/bids/quote",
-            "/v1/bids/ask",
-            "/v1/bids/preferences",
-        }:
-            principal = getattr(request.state, "principal", None)
-            if principal:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        method = scope["method"].upper()
+
+        limiter = ROUTE_RATE_LIMITS.limiter_for(method, path)
+        if limiter is not None:
+            participant_id = _participant_id(scope)
+            if participant_id:
                 route_key = f"{method}:{path}"
-                ok = BID_POST_LIMITER.allow(principal.participant_id, route_key)
+                ok = await limiter.allow_async(participant_id, route_key)
                 if not ok:
-                    return JSONResponse(
+                    RATE_LIMIT_REJECTIONS.inc(route=path)
+                    retry_after = (
+                        math.ceil(1.0 / limiter.refill_per_sec) if limiter.refill_per_sec > 0 else 60
+                    )
+                    response = JSONResponse(
                         status_code=429,
                         content={"detail": "Rate limit exceeded for bid submission."},
-                        headers={"Retry-After": "60"},
+                        headers={"Retry-After": str(retry_after)},
                     )
-        return await call_next(request)
+                    await response(scope, receive, send)
+                    return
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from app.core.config import get_settings
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def pool_size() -> int:
+    configured = get_settings().cpu_pool_workers
+    return configured if configured > 0 else (os.cpu_count() or 1)
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Process-wide pool for CPU-bound work (hashing, canonical JSON).
+
+    Created lazily on first use so importing the app never starts workers.
+    Uses "spawn" so children never inherit DB connections or locks from
+    a threaded server process.
+    """
+    global _process_pool
+    with _pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=pool_size(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    global _process_pool
+    with _pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=True, cancel_futures=True)
+            _process_pool = None
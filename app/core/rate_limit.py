@@ -1,47 +1,383 @@
 from __future__ import annotations
 
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
+from sqlalchemy import text
 
-@dataclass
+from app.core.config import get_settings
+
+
+RATE_LIMIT_BACKEND_MEMORY = "memory"
+RATE_LIMIT_BACKEND_SHARED = "shared"
+RATE_LIMIT_BACKEND_DB = "db"
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter interface.
+
+    Keyed by (participant_id, route_key). Backends:
+      memory → per process (tests / single worker)
+      shared → one host, all worker processes (mmap'd file)
+      db     → all nodes (Postgres UPSERT)
+    """
+
+    capacity: float
+    refill_per_sec: float
+
+    def allow(self, participant_id: str, route_key: str, cost: float = 1.0) -> bool:
+        raise NotImplementedError
+
+    async def allow_async(self, participant_id: str, route_key: str, cost: float = 1.0) -> bool:
+        # local backends are a few microseconds; no need to leave the loop
+        return self.allow(participant_id, route_key, cost)
+
+
+@dataclass(slots=True)
 class Bucket:
     tokens: float
     last_ts: float
 
 
-class InMemoryRateLimiter:
+class InMemoryRateLimiter(RateLimiter):
     """
     Token bucket:
       capacity tokens; refill rate tokens/sec.
 
     Keyed by (participant_id, route_key).
+    Per process: N workers → N × capacity per participant.
+
+    Memory is bounded: buckets are kept in LRU order and
+      - a bucket idle long enough to be full again is dropped (a fresh
+        bucket would be identical, so this never changes a decision)
+      - past max_keys the least recently used bucket is dropped even if
+        it is not full yet (that participant gets a fresh budget)
     """
-    def __init__(self, capacity: int, refill_per_sec: float):
+    def __init__(self, capacity: int, refill_per_sec: float, *, max_keys: int = 100_000):
         self.capacity = float(capacity)
         self.refill_per_sec = float(refill_per_sec)
-        self._buckets: Dict[Tuple[str, str], Bucket] = {}
+        self.max_keys = max(1, int(max_keys))
+        self._idle_after = (
+            self.capacity / self.refill_per_sec if self.refill_per_sec > 0 else float("inf")
+        )
+        self._buckets: "OrderedDict[Tuple[str, str], Bucket]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _evict(self, now: float) -> None:
+        buckets = self._buckets
+        while buckets:
+            oldest = next(iter(buckets.values()))
+            if len(buckets) <= self.max_keys and now - oldest.last_ts < self._idle_after:
+                break
+            buckets.popitem(last=False)
 
     def allow(self, participant_id: str, route_key: str, cost: float = 1.0) -> bool:
-        now = time.time()
         k = (participant_id, route_key)
-        b = self._buckets.get(k)
-        if b is None:
-            b = Bucket(tokens=self.capacity, last_ts=now)
-            self._buckets[k] = b
+        with self._lock:
+            now = time.monotonic()
+            b = self._buckets.get(k)
+            if b is None:
+                b = Bucket(tokens=self.capacity, last_ts=now)
+                self._buckets[k] = b
+            else:
+                self._buckets.move_to_end(k)
+
+            # refill
+            elapsed = max(0.0, now - b.last_ts)
+            b.tokens = min(self.capacity, b.tokens + elapsed * self.refill_per_sec)
+            b.last_ts = now
+
+            # LRU order == last_ts order, so only the head needs checking
+            self._evict(now)
+
+            if b.tokens >= cost:
+                b.tokens -= cost
+                return True
+            return False
+
+
+# ─────────────────────────────────────────────
+# SHARED (one host, many worker processes)
+# ─────────────────────────────────────────────
+
+_HEADER = struct.Struct("<8sII")  # magic, version, slots
+_SLOT = struct.Struct("<Qdd")  # key hash (0 = empty), tokens, last_ts
+_MAGIC = b"TDRRL\x00\x00\x00"
+_VERSION = 1
+_PROBE = 8
+
+
+# POSIX record locks do not exclude threads of the same process, so every
+# limiter on one file (one per route policy) shares one thread lock.
+_FILE_LOCKS: Dict[str, threading.Lock] = {}
+_FILE_LOCKS_GUARD = threading.Lock()
+
+
+def _file_lock(path: str) -> threading.Lock:
+    key = os.path.abspath(path)
+    with _FILE_LOCKS_GUARD:
+        lock = _FILE_LOCKS.get(key)
+        if lock is None:
+            lock = _FILE_LOCKS[key] = threading.Lock()
+        return lock
+
+
+def _key_hash(participant_id: str, route_key: str) -> int:
+    d = hashlib.blake2b(
+        f"{participant_id}\x00{route_key}".encode("utf-8"), digest_size=8
+    ).digest()
+    return int.from_bytes(d, "little") or 1  # 0 marks an empty slot
+
+
+class SharedFileRateLimiter(RateLimiter):
+    """
+    Token buckets in a fixed-size, mmap'd open-addressing table shared by
+    every process that opens the same file.
+
+    - each check is read-modify-write of one 24-byte slot under an
+      exclusive lockf() byte-range lock on just its probe window, so
+      unrelated participants do not contend (+ a thread lock: POSIX record
+      locks are per process)
+    - the table never grows: a key probes _PROBE slots; when all are taken
+      by other keys the least recently used one is recycled
+    - the file is (re)opened lazily per PID, so workers forked from a
+      preloaded master do not share a file description
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        refill_per_sec: float,
+        *,
+        path: str,
+        slots: int = 65536,
+    ):
+        self.capacity = float(capacity)
+        self.refill_per_sec = float(refill_per_sec)
+        self.path = path
+        self.slots = max(int(slots), _PROBE)
+        self._size = _HEADER.size + self.slots * _SLOT.size
+        self._lock = _file_lock(path)
+        self._pid: Optional[int] = None
+        self._fd: Optional[int] = None
+        self._mm: Optional[mmap.mmap] = None
+
+    def _open(self) -> None:
+        import fcntl
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.lockf(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_size != self._size:
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, self._size)
+            mm = mmap.mmap(fd, self._size)
+            magic, version, slots = _HEADER.unpack_from(mm, 0)
+            if (magic, version, slots) != (_MAGIC, _VERSION, self.slots):
+                mm[:] = bytes(self._size)
+                _HEADER.pack_into(mm, 0, _MAGIC, _VERSION, self.slots)
+        finally:
+            fcntl.lockf(fd, fcntl.LOCK_UN)
+
+        self._fd, self._mm, self._pid = fd, mm, os.getpid()
+
+    def allow(self, participant_id: str, route_key: str, cost: float = 1.0) -> bool:
+        import fcntl
+
+        h = _key_hash(participant_id, route_key)
+        # probe windows never wrap, so each is one contiguous byte range
+        start = h % (self.slots - _PROBE + 1)
+        window_off = _HEADER.size + start * _SLOT.size
+        window_len = _PROBE * _SLOT.size
+
+        with self._lock:
+            if self._pid != os.getpid():
+                self._open()
+            mm, fd = self._mm, self._fd
+
+            fcntl.lockf(fd, fcntl.LOCK_EX, window_len, window_off)
+            try:
+                now = time.time()
+                target = None
+                empty = None
+                oldest = None
+                oldest_ts = float("inf")
+
+                for i in range(_PROBE):
+                    off = window_off + i * _SLOT.size
+                    key, tokens, last_ts = _SLOT.unpack_from(mm, off)
+                    if key == h:
+                        target = (off, tokens, last_ts)
+                        break
+                    if key == 0:
+                        if empty is None:
+                            empty = off
+                    elif last_ts < oldest_ts:
+                        oldest, oldest_ts = off, last_ts
+
+                if target is None:
+                    off = empty if empty is not None else oldest
+                    tokens, last_ts = self.capacity, now
+                else:
+                    off, tokens, last_ts = target
+
+                tokens = min(
+                    self.capacity,
+                    tokens + max(0.0, now - last_ts) * self.refill_per_sec,
+                )
+                ok = tokens >= cost
+                if ok:
+                    tokens -= cost
+                _SLOT.pack_into(mm, off, h, tokens, now)
+                return ok
+            finally:
+                fcntl.lockf(fd, fcntl.LOCK_UN, window_len, window_off)
+
+
+# ─────────────────────────────────────────────
+# DB (multi-node)
+# ─────────────────────────────────────────────
+
+# One statement: refill + take, or no row when the bucket is short.
+# A denied check leaves the row as is (refill is derived from updated_at).
+_DB_TAKE = text(
+    """
+    INSERT INTO rate_limit_buckets AS b (bucket_key, tokens, updated_at)
+    VALUES (:k, :cap - :cost, clock_timestamp())
+    ON CONFLICT (bucket_key) DO UPDATE SET
+        tokens = LEAST(
+            :cap,
+            b.tokens + EXTRACT(EPOCH FROM clock_timestamp() - b.updated_at) * :rate
+        ) - :cost,
+        updated_at = clock_timestamp()
+    WHERE LEAST(
+        :cap,
+        b.tokens + EXTRACT(EPOCH FROM clock_timestamp() - b.updated_at) * :rate
+    ) >= :cost
+    RETURNING tokens
+    """
+)
+
+
+class DatabaseRateLimiter(RateLimiter):
+    """
+    Buckets in the rate_limit_buckets table, shared by every node.
+    One UPSERT round-trip per check, on its own short transaction.
+    """
+
+    def __init__(self, capacity: int, refill_per_sec: float):
+        self.capacity = float(capacity)
+        self.refill_per_sec = float(refill_per_sec)
+
+    def _params(self, participant_id: str, route_key: str, cost: float) -> dict:
+        return {
+            "k": f"{participant_id}|{route_key}",
+            "cap": self.capacity,
+            "rate": self.refill_per_sec,
+            "cost": float(cost),
+        }
+
+    def allow(self, participant_id: str, route_key: str, cost: float = 1.0) -> bool:
+        from app.db.session import engine
+
+        with engine.begin() as conn:
+            row = conn.execute(_DB_TAKE, self._params(participant_id, route_key, cost)).first()
+        return row is not None
+
+    async def allow_async(self, participant_id: str, route_key: str, cost: float = 1.0) -> bool:
+        from app.db.session import async_engine
+
+        async with async_engine.begin() as conn:
+            row = (
+                await conn.execute(_DB_TAKE, self._params(participant_id, route_key, cost))
+            ).first()
+        return row is not None
+
+
+def build_rate_limiter(capacity: int, refill_per_sec: float) -> RateLimiter:
+    """
+    Limiter for the backend selected by RATE_LIMIT_BACKEND.
+    """
+    settings = get_settings()
+    backend = settings.rate_limit_backend
+
+    if backend == RATE_LIMIT_BACKEND_MEMORY:
+        return InMemoryRateLimiter(
+            capacity, refill_per_sec, max_keys=settings.rate_limit_max_keys
+        )
+    if backend == RATE_LIMIT_BACKEND_SHARED:
+        return SharedFileRateLimiter(
+            capacity,
+            refill_per_sec,
+            path=settings.rate_limit_shared_path
+            or os.path.join(tempfile.gettempdir(), "tdr_rate_limit.bin"),
+            slots=settings.rate_limit_shared_slots,
+        )
+    if backend == RATE_LIMIT_BACKEND_DB:
+        return DatabaseRateLimiter(capacity, refill_per_sec)
+    raise ValueError(f"Unknown rate limit backend: {backend}")
+
+
+# ─────────────────────────────────────────────
+# PER-ROUTE POLICIES
+# ─────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    capacity: int
+    refill_per_sec: float
+
+
+# (method, path under API_PREFIX) → policy
+RATE_LIMIT_POLICIES: Dict[Tuple[str, str], RateLimitPolicy] = {
+    # 10 submissions per minute per endpoint per participant
+    ("POST", "/bids/quote"): RateLimitPolicy(capacity=10, refill_per_sec=10.0 / 60.0),
+    ("POST", "/bids/ask"): RateLimitPolicy(capacity=10, refill_per_sec=10.0 / 60.0),
+    ("POST", "/bids/preferences"): RateLimitPolicy(capacity=10, refill_per_sec=10.0 / 60.0),
+    # drafts are autosaved by the UI
+    ("POST", "/bids/preferences/draft"): RateLimitPolicy(capacity=30, refill_per_sec=1.0),
+}
+
+
+class RouteRateLimits:
+    """
+    One limiter per policy, looked up by (method, full path).
+    Limiters are built on first use.
+    """
+
+    def __init__(self, policies: Dict[Tuple[str, str], RateLimitPolicy], *, prefix: str = ""):
+        self._policies = {(m.upper(), prefix + p): pol for (m, p), pol in policies.items()}
+        self._limiters: Dict[Tuple[str, str], RateLimiter] = {}
+        self._lock = threading.Lock()
 
-        # refill
-        elapsed = max(0.0, now - b.last_ts)
-        b.tokens = min(self.capacity, b.tokens + elapsed * self.refill_per_sec)
-        b.last_ts = now
+    def limiter_for(self, method: str, path: str) -> Optional[RateLimiter]:
+        k = (method, path)
+        limiter = self._limiters.get(k)
+        if limiter is not None:
+            return limiter
 
-        if b.tokens >= cost:
-            b.tokens -= cost
-            return True
-        return False
+        policy = self._policies.get(k)
+        if policy is None:
+            return None
+        with self._lock:
+            limiter = self._limiters.get(k)
+            if limiter is None:
+                limiter = self._limiters[k] = build_rate_limiter(
+                    policy.capacity, policy.refill_per_sec
+                )
+        return limiter
 
 
-# Default limiter for bid submissions:
-# 10 submissions per minute per endpoint per participant (capacity=10, refill=10/60)
-BID_POST_LIMITER = InMemoryRateLimiter(capacity=10, refill_per_sec=10.0 / 60.0)
\ No newline at end of file
+ROUTE_RATE_LIMITS = RouteRateLimits(RATE_LIMIT_POLICIES, prefix=get_settings().api_prefix)
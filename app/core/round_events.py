@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Set, Tuple
+
+import psycopg
+
+from app.core.config import get_settings
+from app.core.metrics import ROUND_EVENTS_PUBLISHED
+
+logger = logging.getLogger(__name__)
+
+# event types
+ROUND_OPENED = "round.opened"
+ROUND_CLOSED = "round.closed"
+ROUND_LOCKED = "round.locked"
+MATCHING_COMPLETED = "matching.completed"
+SETTLEMENT_COMPLETED = "settlement.completed"
+AGGREGATES_UPDATED = "aggregates.updated"
+
+Scope = Tuple[str, str]
+
+
+@dataclass(frozen=True, slots=True)
+class RoundEvent:
+    """
+    One state change of a (workflow, project) market. `data` is sent to
+    every subscriber of the project: counts, states and the aggregate
+    ranges GET /feedback/round shows, never bid ids, individual prices or
+    participant ids.
+    """
+    workflow: str
+    project_id: str
+    type: str
+    data: Dict[str, Any]
+    at: float = field(default_factory=time.time)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {"workflow": self.workflow, "project_id": self.project_id, "type": self.type, "data": self.data, "at": self.at},
+            separators=(",", ":"),
+            default=str,
+        )
+
+    @classmethod
+    def from_json(cls, raw: str) -> "RoundEvent":
+        d = json.loads(raw)
+        return cls(workflow=d["workflow"], project_id=d["project_id"], type=d["type"], data=d["data"], at=d["at"])
+
+
+class Subscription:
+    """Bounded queue of events for one stream; `overflowed` ends the stream."""
+
+    __slots__ = ("scope", "queue", "overflowed")
+
+    def __init__(self, scope: Scope, size: int):
+        self.scope = scope
+        self.queue: asyncio.Queue[RoundEvent] = asyncio.Queue(maxsize=size)
+        self.overflowed = False
+
+    def offer(self, event: RoundEvent) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # a client this far behind reconnects and gets a fresh snapshot
+            self.overflowed = True
+
+
+class RoundEventBus:
+    """
+    In-process pub/sub of RoundEvents keyed by (workflow, project_id), with
+    optional Postgres LISTEN/NOTIFY fan-out across workers.
+
+    publish() may be called from any thread (services run on the event loop,
+    in run_sync greenlets and in the threadpool). With fan-out running the
+    event goes out through NOTIFY and comes back to every worker, this one
+    included, through its LISTEN connection; otherwise (not started,
+    non-Postgres database, listener reconnecting) it is delivered to this
+    worker's subscribers only.
+    """
+
+    def __init__(self, *, queue_size: int = 256, channel: str = "round_events"):
+        self.queue_size = queue_size
+        self.channel = channel
+        self._subs: Dict[Scope, Set[Subscription]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._outbox: Optional[asyncio.Queue[RoundEvent]] = None
+        self._tasks: list[asyncio.Task] = []
+        self._listening = False
+        # (workflow, project_id, type) -> newest event held back until the window ends
+        self._windows: Dict[Tuple[str, str, str], Optional[RoundEvent]] = {}
+
+    # ─────────────────────────────────────────────
+    # SUBSCRIBERS (event loop only)
+    # ─────────────────────────────────────────────
+
+    def subscribe(self, workflow: str, project_id: uuid.UUID | str) -> Subscription:
+        self._bind_loop()
+        sub = Subscription((workflow, str(project_id)), self.queue_size)
+        self._subs.setdefault(sub.scope, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        subs = self._subs.get(sub.scope)
+        if subs is not None:
+            subs.discard(sub)
+            if not subs:
+                del self._subs[sub.scope]
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop, self._loop_thread = loop, threading.get_ident()
+
+    def subscriber_count(self) -> int:
+        return sum(len(s) for s in self._subs.values())
+
+    def _deliver(self, event: RoundEvent) -> None:
+        for sub in list(self._subs.get((event.workflow, event.project_id), ())):
+            sub.offer(event)
+
+    # ─────────────────────────────────────────────
+    # PUBLISHING (any thread)
+    # ─────────────────────────────────────────────
+
+    def publish(self, workflow: str, project_id: uuid.UUID | str, event_type: str, **data: Any) -> None:
+        event = RoundEvent(workflow=workflow, project_id=str(project_id), type=event_type, data=data)
+        ROUND_EVENTS_PUBLISHED.inc(type=event_type)
+        self._call(self._route, event)
+
+    def publish_throttled(
+        self, workflow: str, project_id: uuid.UUID | str, event_type: str, *, min_interval: float, **data: Any
+    ) -> None:
+        """
+        publish() at most once per `min_interval` seconds per (project,
+        event_type): the first event goes out at once, later ones within
+        the window replace each other and the newest is sent when it ends.
+        For events whose data is a full snapshot, so only the newest counts.
+        """
+        event = RoundEvent(workflow=workflow, project_id=str(project_id), type=event_type, data=data)
+        self._call(self._throttle, event, min_interval)
+
+    def _call(self, fn, *args: Any) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return  # nobody in this process has ever subscribed and no fan-out
+        if threading.get_ident() == self._loop_thread:
+            fn(*args)
+        else:
+            loop.call_soon_threadsafe(fn, *args)
+
+    def _throttle(self, event: RoundEvent, min_interval: float) -> None:
+        key = (event.workflow, event.project_id, event.type)
+        if key in self._windows:
+            self._windows[key] = event
+        else:
+            self._open_window(key, event, min_interval)
+
+    def _open_window(self, key: Tuple[str, str, str], event: RoundEvent, min_interval: float) -> None:
+        self._windows[key] = None
+        ROUND_EVENTS_PUBLISHED.inc(type=event.type)
+        self._route(event)
+        self._loop.call_later(min_interval, self._close_window, key, min_interval)
+
+    def _close_window(self, key: Tuple[str, str, str], min_interval: float) -> None:
+        pending = self._windows.pop(key, None)
+        if pending is not None:
+            self._open_window(key, pending, min_interval)
+
+    def _route(self, event: RoundEvent) -> None:
+        if self._listening and self._outbox is not None:
+            self._outbox.put_nowait(event)
+        else:
+            self._deliver(event)
+
+    # ─────────────────────────────────────────────
+    # LISTEN / NOTIFY FAN-OUT
+    # ─────────────────────────────────────────────
+
+    async def start(self, dsn: str) -> None:
+        """Start the LISTEN and NOTIFY connections (reconnecting in the background)."""
+        self._bind_loop()
+        self._outbox = asyncio.Queue()
+        self._tasks = [
+            asyncio.create_task(self._listen(dsn), name="round-events-listen"),
+            asyncio.create_task(self._notify(dsn), name="round-events-notify"),
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._listening = False
+
+    async def _listen(self, dsn: str) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(dsn, autocommit=True) as conn:
+                    await conn.execute(f'LISTEN "{self.channel}"')
+                    self._listening = True
+                    backoff = 1.0
+                    async for note in conn.notifies():
+                        try:
+                            self._deliver(RoundEvent.from_json(note.payload))
+                        except (ValueError, KeyError):
+                            logger.warning("Ignoring malformed round event", extra={"payload": note.payload[:200]})
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Round event listener disconnected", extra={"error": str(e), "retry_s": backoff})
+            self._listening = False
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    async def _notify(self, dsn: str) -> None:
+        conn = None
+        try:
+            while True:
+                event = await self._outbox.get()
+                try:
+                    if conn is None or conn.closed:
+                        conn = await psycopg.AsyncConnection.connect(dsn, autocommit=True)
+                    await conn.execute("SELECT pg_notify(%s, %s)", (self.channel, event.to_json()))
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning("Round event NOTIFY failed; delivering locally", extra={"error": str(e)})
+                    conn = None
+                    self._deliver(event)
+        finally:
+            if conn is not None:
+                await conn.close()
+
+
+def _build() -> RoundEventBus:
+    settings = get_settings()
+    return RoundEventBus(queue_size=settings.round_events_queue_size, channel=settings.round_events_channel)
+
+
+ROUND_EVENTS = _build()
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import hashlib
+import hmac
 import json
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 
 def canonical_hash(payload: Dict[str, Any]) -> str:
@@ -11,4 +12,18 @@ def canonical_hash(payload: Dict[str, Any]) -> str:
     Deterministic: sorted keys, no whitespace variance.
     """
     s = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
-    return hashlib.sha256(s.encode("utf-8")).hexdigest()
\ No newline at end of file
+    return hashlib.sha256(s.encode("utf-8")).hexdigest()
+
+
+def canonical_hash_many(payloads: List[Dict[str, Any]]) -> List[str]:
+    """
+    Batch form of canonical_hash (module-level so worker processes can run it).
+    """
+    return [canonical_hash(p) for p in payloads]
+
+
+def hmac_sha256(secret: str, message: str) -> str:
+    """
+    Hex HMAC-SHA256 of `message` (server-side attestations, e.g. ledger checkpoints).
+    """
+    return hmac.new(secret.encode("utf-8"), message.encode("utf-8"), hashlib.sha256).hexdigest()
@@ -2,22 +2,134 @@ from __future__ import annotations
 
 import csv
 import io
-from typing import Dict, Iterable, Iterator, List, Any
+import json
+import zlib
+from typing import Dict, Iterable, Iterator, List, Any, Optional
 
+from fastapi import Request
+from fastapi.responses import StreamingResponse
 
-def csv_stream(rows: Iterable[Dict[str, Any]], fieldnames: List[str]) -> Iterator[bytes]:
+from app.core.config import get_settings
+
+# All generators here are pull-based: nothing is produced ahead of the
+# consumer. Starlette pulls the next chunk only after the previous send()
+# returned, and the server's send() waits while the client's socket buffer
+# is full, so a slow client pauses the DB cursor instead of piling chunks up
+# in memory. At most one chunk (plus the gzip window) is held per response.
+
+
+def csv_stream(
+    rows: Iterable[Dict[str, Any]],
+    fieldnames: List[str],
+    *,
+    chunk_size: Optional[int] = None,
+) -> Iterator[bytes]:
     """
     Stream CSV as bytes without holding full file in memory.
+
+    Rows are coalesced into chunks of about `chunk_size` bytes
+    (EXPORT_CHUNK_BYTES): one send per row means one threadpool hop and one
+    ASGI message per row.
     """
+    limit = chunk_size or get_settings().export_chunk_bytes
     buf = io.StringIO()
     writer = csv.DictWriter(buf, fieldnames=fieldnames, extrasaction="ignore")
     writer.writeheader()
-    yield buf.getvalue().encode("utf-8")
-    buf.seek(0)
-    buf.truncate(0)
 
     for r in rows:
         writer.writerow(r)
+        if buf.tell() >= limit:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate(0)
+
+    if buf.tell():
         yield buf.getvalue().encode("utf-8")
-        buf.seek(0)
-        buf.truncate(0)
\ No newline at end of file
+
+
+def ndjson_stream(
+    rows: Iterable[Dict[str, Any]],
+    *,
+    chunk_size: Optional[int] = None,
+) -> Iterator[bytes]:
+    """One JSON object per line, coalesced like csv_stream."""
+    lines = (
+        (json.dumps(r, ensure_ascii=False, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+        for r in rows
+    )
+    return coalesce(lines, chunk_size=chunk_size)
+
+
+def coalesce(chunks: Iterable[bytes], *, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+    """Join small byte chunks into chunks of about `chunk_size` bytes."""
+    limit = chunk_size or get_settings().export_chunk_bytes
+    parts: List[bytes] = []
+    size = 0
+    for chunk in chunks:
+        parts.append(chunk)
+        size += len(chunk)
+        if size >= limit:
+            yield b"".join(parts)
+            parts, size = [], 0
+    if parts:
+        yield b"".join(parts)
+
+
+def gzip_stream(
+    chunks: Iterable[bytes],
+    *,
+    level: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> Iterator[bytes]:
+    """gzip-compress a byte stream on the fly (output coalesced like the input)."""
+    compressor = zlib.compressobj(
+        get_settings().export_gzip_level if level is None else level,
+        zlib.DEFLATED,
+        16 + zlib.MAX_WBITS,  # gzip container
+    )
+
+    def compressed() -> Iterator[bytes]:
+        for chunk in chunks:
+            out = compressor.compress(chunk)
+            if out:
+                yield out
+        yield compressor.flush()
+
+    return coalesce(compressed(), chunk_size=chunk_size)
+
+
+def accepts_gzip(request: Request) -> bool:
+    """True when Accept-Encoding allows gzip (q > 0)."""
+    for part in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = part.partition(";")
+        if coding.strip().lower() not in {"gzip", "x-gzip"}:
+            continue
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                return float(q[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def export_response(
+    request: Request,
+    chunks: Iterable[bytes],
+    *,
+    media_type: str,
+    filename: str,
+) -> StreamingResponse:
+    """
+    StreamingResponse for an export download, gzip-encoded when the client
+    accepts it (and EXPORT_GZIP is on).
+    """
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Vary": "Accept-Encoding",
+    }
+    if get_settings().export_gzip and accepts_gzip(request):
+        chunks = gzip_stream(chunks)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
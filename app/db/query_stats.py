@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@dataclass(slots=True)
+class QueryStats:
+    """
+    DB work done on behalf of one request.
+
+    Shared by reference with everything the request runs: threadpool
+    dependencies copy the context (same object) and AsyncSession cursor
+    events fire in the request's own task.
+
+    statements counts executions per SQL text; bound parameters are not
+    part of the text, so N point lookups in a loop show up as one
+    statement executed N times.
+    """
+    request_id: Optional[str] = None
+    queries: int = 0
+    seconds: float = 0.0
+    statements: Dict[str, int] = field(default_factory=dict)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements executed at least `threshold` times, most repeated first."""
+        hits = [(sql, n) for sql, n in self.statements.items() if n >= threshold]
+        return sorted(hits, key=lambda x: -x[1])
+
+
+_CURRENT: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def start_request(request_id: Optional[str] = None) -> Token:
+    return _CURRENT.set(QueryStats(request_id=request_id))
+
+
+def end_request(token: Token) -> None:
+    _CURRENT.reset(token)
+
+
+def current() -> Optional[QueryStats]:
+    return _CURRENT.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_stats_t0", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_stats_t0"].pop()
+    stats = _CURRENT.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += elapsed
+        stats.statements[statement] = stats.statements.get(statement, 0) + 1
+
+
+def _handle_error(exception_context):
+    # after_cursor_execute does not fire for a failed statement
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_stats_t0"):
+        conn.info["query_stats_t0"].pop()
+
+
+def instrument(engine: Engine) -> None:
+    """
+    Count and time every cursor execute on `engine` (pass
+    AsyncEngine.sync_engine for the async engine).
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
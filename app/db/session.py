@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+from typing import AsyncIterator
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import get_settings
+from app.db import query_stats
 
 settings = get_settings()
 
@@ -15,6 +20,8 @@ engine = create_engine(
     future=True,
 )
 
+query_stats.instrument(engine)
+
 SessionLocal = sessionmaker(
     bind=engine,
     autoflush=False,
@@ -29,3 +36,38 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# ─────────── ASYNC (psycopg 3) ───────────
+# For `async def` routes: DB round-trips await instead of blocking the loop.
+
+
+def _async_database_url(url: str) -> str:
+    """
+    Same database, psycopg 3 driver (async capable); psycopg2 URLs are rewritten.
+    """
+    u = make_url(url)
+    if u.get_backend_name() == "postgresql":
+        u = u.set(drivername="postgresql+psycopg")
+    return u.render_as_string(hide_password=False)
+
+
+async_engine = create_async_engine(
+    _async_database_url(DATABASE_URL),
+    pool_pre_ping=True,
+)
+
+query_stats.instrument(async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    # ORM rows are read after commit in route handlers; lazy refresh
+    # is not possible outside the greenlet, so keep loaded state
+    expire_on_commit=False,
+)
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -3,10 +3,34 @@ from app.core.logging import configure_logging
 from app.core.middleware import RequestIdMiddleware
 from app.api.v1.router import v1_router
 from app.core.middleware_rate_limit import BidRateLimitMiddleware
+from app.core.middleware_metrics import MetricsMiddleware
+from app.core.middleware_query_stats import QueryStatsMiddleware
+
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from sqlalchemy.engine import make_url
 import logging
 
+from app.core.round_events import ROUND_EVENTS
+from app.services.export_job_service import EXPORT_JOB_RUNNER
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    url = make_url(settings.database_url)
+    fan_out = settings.round_events_pg_notify and url.get_backend_name() == "postgresql"
+    if fan_out:
+        # round stream events reach the SSE clients of every worker
+        await ROUND_EVENTS.start(url.set(drivername="postgresql").render_as_string(hide_password=False))
+    # export jobs queued by a worker that stopped before running them
+    EXPORT_JOB_RUNNER.resume_queued()
+    yield
+    EXPORT_JOB_RUNNER.shutdown()
+    if fan_out:
+        await ROUND_EVENTS.stop()
+
 
 def create_app() -> FastAPI:
     settings = get_settings()
@@ -15,11 +39,20 @@ def create_app() -> FastAPI:
     app = FastAPI(
         title=settings.app_name,
         version="0.1.0",
+        lifespan=lifespan,
     )
     logging.basicConfig(level=logging.DEBUG, format="%(asctime)s %(levelname)s %(name)s %(message)s")
-    # Middleware: Request ID
+    # Middleware: bid rate limits (inner), Request ID (outside it, so 429s carry it too)
+    app.add_middleware(BidRateLimitMiddleware)
     app.add_middleware(RequestIdMiddleware, header_name=settings.request_id_header)
 
+    # Middleware: metrics (outside everything else, so 429s are counted too)
+    if settings.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+
+    # Middleware: per-request SQL stats (outermost; metrics reads them)
+    app.add_middleware(QueryStatsMiddleware)
+
     # API v1
     app.include_router(v1_router, prefix=settings.api_prefix)
 
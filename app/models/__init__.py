@@ -1,10 +1,15 @@
 from app.models.parameter_snapshot import ParameterSnapshot
+from app.models.round import Round
+from app.models.subsidized_economic_model import SubsidizedEconomicModel
 from app.models.government_charge_history import GovernmentChargeHistory
 from app.models.quote_bid import QuoteBid
 from app.models.ask_bid import AskBid
 from app.models.preference_bid import PreferenceBid
 from app.models.matching_result import MatchingResult
+from app.models.matching_result_pair import MatchingResultPair
 from app.models.settlement_result import SettlementResult
+from app.models.round_order_book import RoundOrderBook
+from app.models.round_market_depth import RoundMarketDepth
 from app.models.default_event import DefaultEvent
 from app.models.penalty_event import PenaltyEvent
 from app.models.compensatory_event import CompensatoryEvent
@@ -13,10 +18,14 @@ from app.models.developer_default_event import DeveloperDefaultEvent
 from app.models.developer_compensatory_event import DeveloperCompensatoryEvent
 from app.models.tokenized_contract import TokenizedContractRecord
 from app.models.contract_ledger import ContractLedgerEntry
+from app.models.ledger_checkpoint import LedgerCheckpoint
+from app.models.ledger_merkle_batch import LedgerMerkleBatch
 from app.models.audit_log import AuditLogRecord
 from app.models.slum_portal_membership import SlumPortalMembership
 from app.models.subsidized_valuation import SubsidizedValuationRecord
 from app.models.idempotency_key import IdempotencyKeyRecord
+from app.models.rate_limit_bucket import RateLimitBucket
+from app.models.export_job import ExportJob
 from app.models.participant import Participant
 from app.models.enums import ParticipantRole , RoundState , ChargeType
 from app.models.participant_auth import ParticipantAuth
@@ -53,6 +53,8 @@ class AuditLogRecord(Base):
         Index("ix_audit_scope_t", "workflow", "project_id", "t"),
         Index("ix_audit_action", "action"),
         Index("ix_audit_created", "created_at"),
+        # keyset order of /export/audit.csv
+        Index("ix_audit_export_keyset", "workflow", "project_id", "created_at", "id"),
     )
     
     
@@ -0,0 +1,76 @@
+# app/models/export_job.py
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import (
+    String,
+    DateTime,
+    Integer,
+    BigInteger,
+    Text,
+    Index,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ExportJob(Base):
+    """
+    Background export (authority-wide audit / contracts / settlement dumps).
+
+    status: queued → running → succeeded | failed; a finished job that is no
+    longer reused (EXPORT_JOB_REUSE_SECONDS) becomes expired and its files
+    are removed.
+
+    params_hash = sha256(canonical params): at most one live (not failed /
+    expired) job per parameter set, so identical requests share one run.
+    The artifact and its manifest.json live in EXPORT_ARTIFACT_DIR/<id>/.
+    """
+
+    __tablename__ = "export_jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+
+    params_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    kind: Mapped[str] = mapped_column(String(32), nullable=False)
+    format: Mapped[str] = mapped_column(String(16), nullable=False)
+    params_json: Mapped[Dict[str, Any]] = mapped_column(
+        JSONB, nullable=False, server_default=text("'{}'::jsonb")
+    )
+
+    status: Mapped[str] = mapped_column(
+        String(16), nullable=False, server_default=text("'queued'")
+    )
+    requested_by: Mapped[str] = mapped_column(String(128), nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=text("now()")
+    )
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # artifact (set on success)
+    file_name: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+    row_count: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    byte_size: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    sha256: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    __table_args__ = (
+        Index(
+            "uq_export_job_live_params",
+            "params_hash",
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'running', 'succeeded')"),
+        ),
+        Index("ix_export_job_status", "status"),
+    )
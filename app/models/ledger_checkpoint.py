@@ -0,0 +1,56 @@
+# app/models/ledger_checkpoint.py
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import (
+    String,
+    DateTime,
+    Integer,
+    ForeignKey,
+    Index,
+    UniqueConstraint,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class LedgerCheckpoint(Base):
+    """
+    "Chain verified up to seq N with hash H" for one (workflow, projectId) ledger.
+
+    signature = HMAC-SHA256(secret, "workflow:projectId:seq:entry_hash"),
+    so a checkpoint cannot be forged by writing to this table alone.
+    """
+
+    __tablename__ = "contract_ledger_checkpoints"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+
+    workflow: Mapped[str] = mapped_column(String(32), nullable=False)
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    seq: Mapped[int] = mapped_column(Integer, nullable=False)
+    entry_hash: Mapped[str] = mapped_column(String(128), nullable=False)
+    signature: Mapped[str] = mapped_column(String(128), nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=text("now()")
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "workflow", "project_id", "seq", name="uq_contract_ledger_checkpoint_seq"
+        ),
+        Index("ix_contract_ledger_checkpoint_scope", "workflow", "project_id"),
+    )
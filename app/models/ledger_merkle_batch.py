@@ -0,0 +1,58 @@
+# app/models/ledger_merkle_batch.py
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import (
+    String,
+    DateTime,
+    Integer,
+    ForeignKey,
+    UniqueConstraint,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class LedgerMerkleBatch(Base):
+    """
+    Sealed Merkle root over one fixed-size batch of ledger entries.
+
+    Batch k of a (workflow, projectId) ledger covers seq
+    [k * size + 1, (k + 1) * size]; leaves are leaf_hash(bytes.fromhex(entry_hash)).
+    Only full batches of a verified chain are sealed, so rows never change.
+    """
+
+    __tablename__ = "contract_ledger_merkle_batches"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+
+    workflow: Mapped[str] = mapped_column(String(32), nullable=False)
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    batch_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    first_seq: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_seq: Mapped[int] = mapped_column(Integer, nullable=False)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    root_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=text("now()")
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "workflow", "project_id", "batch_index", name="uq_contract_ledger_merkle_batch"
+        ),
+    )
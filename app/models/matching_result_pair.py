@@ -0,0 +1,63 @@
+# app/models/matching_result_pair.py
+from __future__ import annotations
+
+import uuid
+from typing import Optional
+
+from sqlalchemy import (
+    String,
+    Integer,
+    ForeignKey,
+    Numeric,
+    UniqueConstraint,
+    Index,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class MatchingResultPair(Base):
+    """
+    One cleared ask ↔ quote pair of a book-mode MatchingResult.
+
+    The parent MatchingResult keeps the best pair (rank 0) in its
+    selected_* columns: the same pair single mode would select.
+    """
+
+    __tablename__ = "matching_result_pairs"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+
+    matching_result_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("matching_results.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    workflow: Mapped[str] = mapped_column(String(32), nullable=False)
+    project_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    t: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # 0 = best pair (cheapest ask unit ↔ highest quote)
+    rank: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    ask_bid_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    quote_bid_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+
+    # the whole ask is filled: units = its dcu_units, priced at ask_total_inr
+    units: Mapped[float] = mapped_column(Numeric(20, 4), nullable=False)
+    # NULL on pairs cleared before whole-ask clearing
+    ask_total_inr: Mapped[Optional[float]] = mapped_column(Numeric(20, 2), nullable=True)
+    ask_unit_price_inr: Mapped[float] = mapped_column(Numeric(20, 2), nullable=False)
+    quote_inr: Mapped[float] = mapped_column(Numeric(20, 2), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "matching_result_id", "rank", name="uq_matching_result_pair_rank"
+        ),
+        Index("ix_matching_result_pair_scope", "workflow", "project_id", "t"),
+    )
@@ -10,6 +10,7 @@ from sqlalchemy import (
     DateTime,
     Integer,
     ForeignKey,
+    Numeric,
     UniqueConstraint,
     Index,
     text,
@@ -50,13 +51,17 @@ class QuoteBid(Base):
         JSONB, nullable=False, server_default=text("'{}'::jsonb")
     )
 
+    # Typed mirror of payload_json["qbundle_inr"] (set on draft/submit) so
+    # quote ranking can use ix_quote_bid_rank instead of casting JSONB.
+    qbundle_inr: Mapped[Optional[float]] = mapped_column(Numeric(20, 2), nullable=True)
+
     signature_hash: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=text("now()")
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, server_default=text("now()")
+        DateTime(timezone=True), nullable=False, server_default=text("now()"), onupdate=text("now()")
     )
     submitted_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True), nullable=True
@@ -71,4 +76,13 @@ class QuoteBid(Base):
         ),
         Index("ix_quote_bid_lookup", "workflow", "project_id", "t"),
         Index("ix_quote_bid_round", "round_id"),
+        Index(
+            "ix_quote_bid_rank",
+            "workflow",
+            "project_id",
+            "t",
+            "state",
+            text("qbundle_inr DESC"),
+            "id",
+        ),
     )
@@ -0,0 +1,26 @@
+# app/models/rate_limit_bucket.py
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import String, DateTime, Float, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class RateLimitBucket(Base):
+    """
+    Token bucket for the multi-node rate limiter (RATE_LIMIT_BACKEND=db).
+
+    bucket_key = "participant_id|route_key"; tokens are as of updated_at,
+    refill is applied lazily by the UPSERT in app.core.rate_limit.
+    """
+
+    __tablename__ = "rate_limit_buckets"
+
+    bucket_key: Mapped[str] = mapped_column(String(256), primary_key=True)
+    tokens: Mapped[float] = mapped_column(Float, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=text("now()")
+    )
@@ -0,0 +1,65 @@
+# app/models/round_market_depth.py
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Any, Dict
+
+from sqlalchemy import (
+    String,
+    DateTime,
+    Integer,
+    ForeignKey,
+    UniqueConstraint,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class RoundMarketDepth(Base):
+    """
+    Market-depth statistics of a locked round, computed once from the
+    locked bids.
+
+    stats_json: per series ("quote_qbundle_inr", "ask_total_inr")
+        {"count", "min_inr", "max_inr", "p10_inr", "p50_inr", "p90_inr",
+         "histogram": [{"from_inr", "to_inr", "count"}], "suppressed"}
+        plus the "min_bids" / "min_cell" thresholds it was computed with.
+
+    Counts and ranges only; amounts are stored as strings.
+    """
+
+    __tablename__ = "round_market_depths"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+
+    workflow: Mapped[str] = mapped_column(String(32), nullable=False)
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    round_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("rounds.id", ondelete="CASCADE"), nullable=False
+    )
+    t: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    stats_json: Mapped[Dict[str, Any]] = mapped_column(
+        JSONB, nullable=False, server_default=text("'{}'::jsonb")
+    )
+
+    computed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=text("now()")
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "workflow", "project_id", "t", name="uq_round_market_depth_scope"
+        ),
+    )
@@ -0,0 +1,72 @@
+# app/models/round_order_book.py
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List
+
+from sqlalchemy import (
+    String,
+    DateTime,
+    Integer,
+    ForeignKey,
+    UniqueConstraint,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class RoundOrderBook(Base):
+    """
+    Ranked order-book snapshot, written once when a round's bids are locked.
+
+    quotes_json: locked quotes with qbundle, qbundle desc / id asc
+        [{"id", "qbundle_inr", "signature_hash"}]
+    asks_json: locked asks, total_ask_inr asc (nulls last) / id asc
+        [{"id", "total_ask_inr", "dcu_units", "ask_price_per_unit_inr", "signature_hash"}]
+
+    Amounts are stored as strings to preserve precision.
+    """
+
+    __tablename__ = "round_order_books"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+
+    workflow: Mapped[str] = mapped_column(String(32), nullable=False)
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    round_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("rounds.id", ondelete="CASCADE"), nullable=False
+    )
+    t: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    quotes_json: Mapped[List[Dict[str, Any]]] = mapped_column(
+        JSONB, nullable=False, server_default=text("'[]'::jsonb")
+    )
+    asks_json: Mapped[List[Dict[str, Any]]] = mapped_column(
+        JSONB, nullable=False, server_default=text("'[]'::jsonb")
+    )
+
+    locked_quote_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    locked_ask_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    locked_preference_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=text("now()")
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "workflow", "project_id", "t", name="uq_round_order_book_scope"
+        ),
+        UniqueConstraint("round_id", name="uq_round_order_book_round"),
+    )
@@ -80,6 +80,8 @@ class TokenizedContractRecord(Base):
     __table_args__ = (
         Index("ix_contract_project_scope", "workflow", "project_id"),
         Index("ix_contract_settlement", "settlement_result_id"),
+        # keyset order of /export/contracts.json
+        Index("ix_contract_export_keyset", "workflow", "project_id", "created_at", "id"),
         UniqueConstraint(
             "workflow", "project_id", "version", name="uq_contract_project_version"
         ),
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Literal, Optional
+from pydantic import BaseModel, Field
+
+from app.core.types import WorkflowType
+
+
+class ExportJobRequest(BaseModel):
+    kind: Literal["audit", "contracts", "settlement"]
+    format: Literal["csv", "ndjson"] = "csv"
+
+    # omitted → every workflow / project / round
+    workflow: Optional[WorkflowType] = None
+    projectId: Optional[str] = None
+    t: Optional[int] = Field(None, ge=0)
+
+
+class ExportJobResponse(BaseModel):
+    jobId: str
+    kind: str
+    format: str
+    status: str
+    params: Dict[str, Any] = Field(default_factory=dict)
+
+    created_at_iso: Optional[str] = None
+    started_at_iso: Optional[str] = None
+    finished_at_iso: Optional[str] = None
+    error: Optional[str] = None
+
+    # true when an identical live job was returned instead of queuing one
+    deduplicated: bool = False
+    # set once succeeded: the manifest.json written next to the artifact
+    manifest: Optional[Dict[str, Any]] = None
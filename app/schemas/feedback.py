@@ -49,3 +49,18 @@ class FeedbackRoundResponse(BaseModel):
     # Adjustment window (structural)
     adjustment_allowed: bool
     adjustment_reason: Optional[str] = None
+
+
+class MarketDepthResponse(BaseModel):
+    workflow: WorkflowType
+    projectId: str
+    t: int
+
+    # per series: count, min/max, p10/p50/p90 and bucketed histogram
+    # (amounts as strings; small cells and thin markets suppressed)
+    quote_qbundle_inr: Dict[str, Any] = Field(default_factory=dict)
+    ask_total_inr: Dict[str, Any] = Field(default_factory=dict)
+
+    min_bids: int
+    min_cell: int
+    computed_at_iso: Optional[str] = None
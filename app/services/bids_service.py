@@ -2,21 +2,27 @@
 from __future__ import annotations
 
 import uuid
+from collections import deque
+from concurrent.futures import Future
 from datetime import datetime, timezone
 from decimal import Decimal
 from enum import Enum
-from typing import Any, Dict, Optional, Type
+from typing import Any, Deque, Dict, List, Optional, Tuple, Type
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
-from app.core.signing import canonical_hash
+from app.core.config import get_settings
+from app.core.pools import get_process_pool, pool_size
+from app.core.signing import canonical_hash_many
 from app.models.bid_enums import BidState
 from app.models.round import Round
 from app.models.quote_bid import QuoteBid
 from app.models.ask_bid import AskBid
 from app.models.preference_bid import PreferenceBid
+from app.services.feedback_service import OPEN_ROUND_STATS, bid_stat_values, is_counted
+from app.services.order_book_service import OrderBookService
 
 
 # ---------------------------------------------------------------------
@@ -46,6 +52,15 @@ def _json_safe(value: Any) -> Any:
     return value
 
 
+def _mirror_typed_columns(row, payload_json: Dict[str, Any]) -> None:
+    """
+    Copy ranking fields from payload_json into their typed, indexed columns.
+    """
+    if isinstance(row, QuoteBid):
+        raw = payload_json.get("qbundle_inr")
+        row.qbundle_inr = Decimal(str(raw)) if raw is not None else None
+
+
 # ---------------------------------------------------------------------
 # service
 # ---------------------------------------------------------------------
@@ -106,6 +121,9 @@ class BidService:
         if row and row.state == BidState.locked.value:
             raise ValueError("Locked bids cannot be updated (append-only).")
 
+        was_counted = bool(row) and is_counted(row.state)
+        previous = bid_stat_values(row) if row else {}
+
         if not row:
             row = model(
                 workflow=workflow,
@@ -121,8 +139,11 @@ class BidService:
             row.payload_json = payload_json
             row.state = BidState.draft.value
 
+        _mirror_typed_columns(row, payload_json)
+
         db.commit()
         db.refresh(row)
+        OPEN_ROUND_STATS.bid_changed(row, was_counted=was_counted, previous=previous, db=db)
         return row
 
     def save_quote_draft(self, db, workflow, project_id, t, participant_id, payload):
@@ -192,6 +213,9 @@ class BidService:
         if row and row.state == BidState.locked.value:
             raise ValueError("Locked bids cannot be updated; submit in next round.")
 
+        was_counted = bool(row) and is_counted(row.state)
+        previous = bid_stat_values(row) if row else {}
+
         if not row:
             row = model(
                 workflow=workflow,
@@ -209,8 +233,11 @@ class BidService:
             row.state = BidState.submitted.value
             row.submitted_at = _now()
 
+        _mirror_typed_columns(row, payload_json)
+
         db.commit()
         db.refresh(row)
+        OPEN_ROUND_STATS.bid_changed(row, was_counted=was_counted, previous=previous, db=db)
         return row
 
     def submit_quote(self, db, workflow, project_id, t, participant_id, payload):
@@ -252,6 +279,86 @@ class BidService:
     # locking
     # -----------------------------------------------------------------
 
+    def _lock_rows_streaming(
+        self,
+        db: Session,
+        model: Type[QuoteBid] | Type[AskBid] | Type[PreferenceBid],
+        *,
+        workflow: str,
+        project_id: uuid.UUID,
+        t: int,
+        locked_at: datetime,
+    ) -> int:
+        """
+        Lock every unlocked bid of `model` in the round without loading ORM
+        objects:
+        - stream (id, participant_id, payload_json) with yield_per
+        - hash each batch (worker pool for large batches, inline otherwise)
+        - write signature_hash/state/locked_at via bulk UPDATE by primary key
+
+        At most ~2 × pool size batches are held in memory at once.
+        """
+        settings = get_settings()
+        max_in_flight = 2 * pool_size()
+
+        stmt = (
+            select(model.id, model.participant_id, model.payload_json)
+            .where(
+                model.workflow == workflow,
+                model.project_id == project_id,
+                model.t == t,
+                model.state != BidState.locked.value,
+            )
+            .execution_options(yield_per=settings.bid_lock_batch_size)
+        )
+
+        pending: Deque[Tuple[List[uuid.UUID], Future | List[str]]] = deque()
+        n = 0
+
+        def write_oldest() -> int:
+            ids, hashed = pending.popleft()
+            hashes = hashed.result() if isinstance(hashed, Future) else hashed
+            db.execute(
+                update(model),
+                [
+                    {
+                        "id": bid_id,
+                        "signature_hash": h,
+                        "state": BidState.locked.value,
+                        "locked_at": locked_at,
+                        "updated_at": locked_at,
+                    }
+                    for bid_id, h in zip(ids, hashes)
+                ],
+            )
+            return len(ids)
+
+        for partition in db.execute(stmt).partitions():
+            ids = [r.id for r in partition]
+            signed = [
+                {
+                    "workflow": workflow,
+                    "project_id": str(project_id),
+                    "t": t,
+                    "participant_id": r.participant_id,
+                    "payload": r.payload_json,
+                }
+                for r in partition
+            ]
+
+            if len(signed) >= settings.bid_lock_pool_min_batch:
+                pending.append((ids, get_process_pool().submit(canonical_hash_many, signed)))
+            else:
+                pending.append((ids, canonical_hash_many(signed)))
+
+            while len(pending) >= max_in_flight:
+                n += write_oldest()
+
+        while pending:
+            n += write_oldest()
+
+        return n
+
     def lock_all_bids_for_round(
         self,
         db: Session,
@@ -266,37 +373,24 @@ class BidService:
         if rnd.is_locked:
             return {"quote": 0, "ask": 0, "preference": 0}
 
+        locked_at = _now()
+
         def lock_rows(model):
-            rows = list(
-                db.execute(
-                    select(model).where(
-                        model.workflow == workflow,
-                        model.project_id == project_id,
-                        model.t == t,
-                    )
-                )
-                .scalars()
-                .all()
+            return self._lock_rows_streaming(
+                db,
+                model,
+                workflow=workflow,
+                project_id=project_id,
+                t=t,
+                locked_at=locked_at,
             )
-            n = 0
-            for r in rows:
-                if r.state != BidState.locked.value:
-                    signed = {
-                        "workflow": r.workflow,
-                        "project_id": str(r.project_id),
-                        "t": r.t,
-                        "participant_id": r.participant_id,
-                        "payload": r.payload_json,
-                    }
-                    r.signature_hash = canonical_hash(signed)
-                    r.state = BidState.locked.value
-                    r.locked_at = _now()
-                    n += 1
-            return n
 
         qn = lock_rows(QuoteBid)
         an = lock_rows(AskBid)
         pn = lock_rows(PreferenceBid)
 
+        # 📚 rank the frozen book once; downstream engines read ranks
+        OrderBookService().build_snapshot(db, rnd=rnd)
+
         db.commit()
         return {"quote": qn, "ask": an, "preference": pn}
@@ -4,7 +4,7 @@ import uuid
 from decimal import Decimal
 from typing import Optional, Tuple, Dict, Any
 
-from sqlalchemy import select, cast, Numeric, desc, asc
+from sqlalchemy import select, desc, asc
 from sqlalchemy.orm import Session
 
 from app.models.compensatory_event import CompensatoryEvent
@@ -12,9 +12,13 @@ from app.models.default_event import DefaultEvent
 from app.models.settlement_result import SettlementResult
 from app.models.quote_bid import QuoteBid
 from app.models.round import Round
+from app.services.order_book_service import OrderBookService
 
 
 class CompensatoryService:
+    def __init__(self):
+        self.books = OrderBookService()
+
     def _get_existing(self, db: Session, workflow: str, project_id: uuid.UUID, t: int) -> Optional[CompensatoryEvent]:
         return db.execute(
             select(CompensatoryEvent).where(
@@ -48,19 +52,22 @@ class CompensatoryService:
         ).scalar_one_or_none()
 
     def _eligible_quotes(self, db: Session, workflow: str, project_id: uuid.UUID, t: int, exclude_bid_id: uuid.UUID):
-        qbundle_num = cast(QuoteBid.payload_json["qbundle_inr"].astext, Numeric(20, 2))
+        book = self.books.get_snapshot(db, workflow, project_id, t)
+        if book is not None:
+            return OrderBookService.ranked_quotes(book, exclude=(exclude_bid_id,))
+
         # Eligible: locked, has qbundle, not the original winner
         return db.execute(
-            select(QuoteBid.id, qbundle_num)
+            select(QuoteBid.id, QuoteBid.qbundle_inr)
             .where(
                 QuoteBid.workflow == workflow,
                 QuoteBid.project_id == project_id,
                 QuoteBid.t == t,
                 QuoteBid.state == "locked",
-                QuoteBid.payload_json.has_key("qbundle_inr"),
+                QuoteBid.qbundle_inr.is_not(None),
                 QuoteBid.id != exclude_bid_id,
             )
-            .order_by(desc(qbundle_num), asc(QuoteBid.id))
+            .order_by(desc(QuoteBid.qbundle_inr), asc(QuoteBid.id))
         ).all()
 
     def compute_and_store_if_needed(self, db: Session, *, workflow: str, project_id: uuid.UUID, t: int) -> CompensatoryEvent:
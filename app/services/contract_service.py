@@ -4,18 +4,16 @@ import uuid
 from typing import Optional, Dict, Any, List
 
 from sqlalchemy import select, func, desc
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.core.hashing import canonical_dumps, sha256_hex, hash_chain
+from app.core.hashing import canonical_dumps, sha256_hex
 from app.models.tokenized_contract import TokenizedContractRecord
-from app.models.contract_ledger import ContractLedgerEntry
 from app.models.settlement_result import SettlementResult
 from app.models.penalty_event import PenaltyEvent
 from app.models.compensatory_event import CompensatoryEvent
 from app.models.developer_compensatory_event import DeveloperCompensatoryEvent
-
-
-GENESIS_HASH = "0" * 64
+from app.services.ledger_service import LedgerService
 
 
 class ContractService:
@@ -27,22 +25,6 @@ class ContractService:
             .limit(1)
         ).scalar_one_or_none()
 
-    def _next_seq(self, db: Session, workflow: str, project_id: uuid.UUID) -> int:
-        mx = db.execute(
-            select(func.max(ContractLedgerEntry.seq))
-            .where(ContractLedgerEntry.workflow == workflow, ContractLedgerEntry.project_id == project_id)
-        ).scalar_one_or_none()
-        return int(mx or 0) + 1
-
-    def _last_hash(self, db: Session, workflow: str, project_id: uuid.UUID) -> str:
-        last = db.execute(
-            select(ContractLedgerEntry.entry_hash)
-            .where(ContractLedgerEntry.workflow == workflow, ContractLedgerEntry.project_id == project_id)
-            .order_by(desc(ContractLedgerEntry.seq))
-            .limit(1)
-        ).scalar_one_or_none()
-        return last or GENESIS_HASH
-
     def _load_settlement(self, db: Session, workflow: str, project_id: uuid.UUID) -> Optional[SettlementResult]:
         # Latest settled settlement result for the project (across t)
         return db.execute(
@@ -182,39 +164,97 @@ class ContractService:
             contract_hash=contract_hash,
         )
         db.add(contract)
-        db.flush()  # get id
-
-        # Ledger entry (append-only)
-        seq = self._next_seq(db, workflow, project_id)
-        prev_hash = self._last_hash(db, workflow, project_id)
-
-        entry_payload = {
-            "entry_type": "CONTRACT_CREATED",
-            "contract_id": str(contract.id),
-            "contract_hash": contract_hash,
-            "settlement_result_id": str(settlement.id),
-            "round_t": settlement.t,
-        }
-        entry_hash = hash_chain(prev_hash, entry_payload)
+        try:
+            db.flush()  # get id
+        except IntegrityError:
+            # a concurrent first read created version 1 (and its ledger entry)
+            db.rollback()
+            latest = self._latest_contract(db, workflow, project_id)
+            if latest is None:
+                raise
+            return latest
 
-        db.add(ContractLedgerEntry(
+        # Ledger entry: chained and serialized by the ledger, committed with the contract
+        LedgerService().append_entries(
+            db,
             workflow=workflow,
             project_id=project_id,
-            contract_id=contract.id,
-            seq=seq,
-            entry_type="CONTRACT_CREATED",
-            prev_hash=prev_hash,
-            entry_hash=entry_hash,
-            payload_json=entry_payload,
-        ))
+            entries=[
+                {
+                    "contract_id": contract.id,
+                    "entry_type": "CONTRACT_CREATED",
+                    "payload": {
+                        "contract_id": str(contract.id),
+                        "contract_hash": contract_hash,
+                        "settlement_result_id": str(settlement.id),
+                        "round_t": settlement.t,
+                    },
+                }
+            ],
+        )
 
         db.commit()
         db.refresh(contract)
         return contract
 
+    def stage_settlement_contract(
+        self,
+        db: Session,
+        *,
+        settlement: SettlementResult,
+        buyer_participant_id: str,
+        developer_participant_id: str,
+    ) -> TokenizedContractRecord:
+        """
+        Next contract version for a settlement being written, added and
+        flushed in the caller's transaction (no commit, no ledger entry).
+        """
+        latest = self._latest_contract(db, settlement.workflow, settlement.project_id)
+
+        # penalties / compensatory events come after settlement: none yet
+        ownership, txn, obligations = self._build_contract_sections(
+            settlement=settlement, penalty=None, comp=None, dev_comp=None
+        )
+        ownership["buyer_participant_id"] = buyer_participant_id
+        ownership["developer_participant_id"] = developer_participant_id
+
+        full_payload = {
+            "ownership_details": ownership,
+            "transaction_data": txn,
+            "legal_obligations": obligations,
+        }
+        contract = TokenizedContractRecord(
+            workflow=settlement.workflow,
+            project_id=settlement.project_id,
+            version=latest.version + 1 if latest else 1,
+            prior_contract_id=latest.id if latest else None,
+            settlement_result_id=settlement.id,
+            ownership_details_json=ownership,
+            transaction_data_json=txn,
+            legal_obligations_json=obligations,
+            contract_hash=sha256_hex(canonical_dumps(full_payload)),
+        )
+        db.add(contract)
+        db.flush()  # get id
+        return contract
+
     def get_contract(self, db: Session, contract_id: uuid.UUID) -> Optional[TokenizedContractRecord]:
         return db.execute(select(TokenizedContractRecord).where(TokenizedContractRecord.id == contract_id)).scalar_one_or_none()
 
+    def get_contract_hash(self, db: Session, contract_id: uuid.UUID) -> Optional[str]:
+        # records are never updated: the content hash identifies the representation
+        return db.execute(
+            select(TokenizedContractRecord.contract_hash).where(TokenizedContractRecord.id == contract_id)
+        ).scalar_one_or_none()
+
+    def project_version(self, db: Session, *, workflow: str, project_id: uuid.UUID) -> tuple[int, Optional[int]]:
+        """(record count, latest version); append-only, so this identifies the list."""
+        count, latest = db.execute(
+            select(func.count(TokenizedContractRecord.id), func.max(TokenizedContractRecord.version))
+            .where(TokenizedContractRecord.workflow == workflow, TokenizedContractRecord.project_id == project_id)
+        ).one()
+        return int(count), latest
+
     def list_by_project(self, db: Session, *, workflow: str, project_id: uuid.UUID) -> List[TokenizedContractRecord]:
         return db.execute(
             select(TokenizedContractRecord)
@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from app.models.ask_bid import AskBid
 from app.models.round import Round
 from app.models.bid_enums import BidState
+from app.services.feedback_service import OPEN_ROUND_STATS, bid_stat_values, is_counted
 from datetime import datetime
 
 
@@ -51,6 +52,9 @@ def upsert_ask_bid(
     if ask and ask.state == BidState.locked.value:
         raise ValueError("Ask is locked")
 
+    was_counted = bool(ask) and is_counted(ask.state)
+    previous = bid_stat_values(ask) if ask else {}
+
     total = compute_total_ask(dcu_units, ask_price_per_unit_inr)
 
     if not ask:
@@ -73,4 +77,5 @@ def upsert_ask_bid(
 
     db.commit()
     db.refresh(ask)
+    OPEN_ROUND_STATS.bid_changed(ask, was_counted=was_counted, previous=previous, db=db)
     return ask
@@ -13,9 +13,13 @@ from app.models.settlement_result import SettlementResult
 from app.models.event_log import EventLog
 from app.models.developer_default_event import DeveloperDefaultEvent
 from app.models.developer_compensatory_event import DeveloperCompensatoryEvent
+from app.services.order_book_service import OrderBookService
 
 
 class DeveloperCompensatoryService:
+    def __init__(self):
+        self.books = OrderBookService()
+
     def _get_round(self, db: Session, workflow: str, project_id: uuid.UUID, t: int) -> Optional[Round]:
         return db.execute(
             select(Round).where(Round.workflow == workflow, Round.project_id == project_id, Round.t == t)
@@ -116,6 +120,11 @@ class DeveloperCompensatoryService:
         t: int,
         exclude_ask_bid_id: uuid.UUID,
     ) -> Optional[Tuple[uuid.UUID, Decimal]]:
+        book = self.books.get_snapshot(db, workflow, project_id, t)
+        if book is not None:
+            ranked = OrderBookService.ranked_asks(book, exclude=(exclude_ask_bid_id,))
+            return ranked[0] if ranked else None
+
         row = db.execute(
             select(AskBid.id, AskBid.total_ask_inr)
             .where(
@@ -2,10 +2,15 @@ from __future__ import annotations
 
 import json
 import uuid
-from typing import Any, Dict, Iterable, Iterator
-from sqlalchemy.orm import Session
-from sqlalchemy import select, desc, or_
+from typing import Any, Dict, Iterable, Iterator, Optional
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import select, exists, or_
 
+from app.core.config import get_settings
+from app.core.keyset import Cursor, after as keyset_after, encode_cursor
+from app.models.ask_bid import AskBid
+from app.models.quote_bid import QuoteBid
+from app.models.settlement_result import SettlementResult
 from app.models.tokenized_contract import TokenizedContractRecord  # from Part 18
 from app.policies.export_policy import ExportScope
 
@@ -16,40 +21,81 @@ class ExportContractsService:
         db: Session,
         *,
         scope: ExportScope,
-        workflow: str,
-        project_id: uuid.UUID,
-        limit: int = 50000,
+        workflow: Optional[str],
+        project_id: Optional[uuid.UUID],
+        after: Optional[Cursor] = None,
     ) -> Iterable[Dict[str, Any]]:
-        stmt = select(TokenizedContractRecord).where(
-            TokenizedContractRecord.workflow == workflow,
-            TokenizedContractRecord.project_id == project_id,
+        """
+        Exported columns only, through a server-side cursor; prevHash is the
+        prior version's contract_hash (self-join).
+
+        Ordered by (created_at, id) and unbounded; each contract carries its
+        continuation token ("cursor") and `after` resumes past one.
+        workflow / project_id None means all of them.
+        """
+        prior = aliased(TokenizedContractRecord)
+        stmt = (
+            select(
+                TokenizedContractRecord.id,
+                TokenizedContractRecord.workflow,
+                TokenizedContractRecord.project_id,
+                TokenizedContractRecord.version,
+                TokenizedContractRecord.created_at,
+                TokenizedContractRecord.contract_hash,
+                prior.contract_hash.label("prev_hash"),
+                TokenizedContractRecord.ownership_details_json,
+                TokenizedContractRecord.transaction_data_json,
+                TokenizedContractRecord.legal_obligations_json,
+            )
+            .outerjoin(prior, prior.id == TokenizedContractRecord.prior_contract_id)
         )
+        if workflow is not None:
+            stmt = stmt.where(TokenizedContractRecord.workflow == workflow)
+        if project_id is not None:
+            stmt = stmt.where(TokenizedContractRecord.project_id == project_id)
 
         if not scope.allow_full:
-            # Fallback participant scoping using typical keys. Adjust keys to your Part 18 record if needed.
+            # Participants see contracts of settlements where they own the
+            # winning quote or ask (contract sections carry bid ids, not owners).
             pid = scope.participant_id
-            stmt = stmt.where(
+            stmt = stmt.join(
+                SettlementResult, SettlementResult.id == TokenizedContractRecord.settlement_result_id
+            ).where(
                 or_(
-                    TokenizedContractRecord.ownership_json["participant_id"].astext == pid,
-                    TokenizedContractRecord.transaction_json["buyer_participant_id"].astext == pid,
-                    TokenizedContractRecord.transaction_json["seller_participant_id"].astext == pid,
+                    exists().where(
+                        QuoteBid.id == SettlementResult.winner_quote_bid_id,
+                        QuoteBid.participant_id == pid,
+                    ),
+                    exists().where(
+                        AskBid.id == SettlementResult.winning_ask_bid_id,
+                        AskBid.participant_id == pid,
+                    ),
                 )
             )
 
-        stmt = stmt.order_by(desc(TokenizedContractRecord.created_at)).limit(limit)
+        if after is not None:
+            stmt = stmt.where(
+                keyset_after(TokenizedContractRecord.created_at, TokenizedContractRecord.id, after)
+            )
+
+        stmt = (
+            stmt.order_by(TokenizedContractRecord.created_at, TokenizedContractRecord.id)
+            .execution_options(yield_per=get_settings().export_fetch_batch_size)
+        )
 
-        for c in db.execute(stmt).scalars().yield_per(500):
+        for c in db.execute(stmt).mappings():
             yield {
-                "contractId": str(c.id),
-                "workflow": c.workflow,
-                "projectId": str(c.project_id),
-                "createdAtIso": c.created_at.isoformat() if c.created_at else None,
-                "recordHash": c.record_hash,
-                "prevHash": c.prev_hash,
-                "ownership": c.ownership_json or {},
-                "transaction": c.transaction_json or {},
-                "obligations": c.obligations_json or {},
-                "eventLog": c.event_log_json or [],
+                "contractId": str(c["id"]),
+                "workflow": c["workflow"],
+                "projectId": str(c["project_id"]),
+                "version": c["version"],
+                "createdAtIso": c["created_at"].isoformat() if c["created_at"] else None,
+                "recordHash": c["contract_hash"],
+                "prevHash": c["prev_hash"],
+                "ownership": c["ownership_details_json"] or {},
+                "transaction": c["transaction_data_json"] or {},
+                "obligations": c["legal_obligations_json"] or {},
+                "cursor": encode_cursor(c["created_at"], c["id"]),
             }
 
     def json_stream(self, contracts: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
@@ -0,0 +1,353 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.hashing import canonical_dumps, sha256_hex
+from app.core.metrics import EXPORT_JOBS, EXPORT_JOB_SECONDS
+from app.core.streaming import csv_stream, ndjson_stream
+from app.db.session import SessionLocal
+from app.models.export_job import ExportJob
+from app.policies.export_policy import ExportScope
+from app.services.export_audit_service import ExportAuditService
+from app.services.export_contracts_service import ExportContractsService
+from app.services.export_settlement_service import ExportSettlementService
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("audit", "contracts", "settlement")
+FORMATS = ("csv", "ndjson")
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+# statuses covered by the one-live-job-per-params index
+_LIVE = ("queued", "running", "succeeded")
+
+
+def job_params(
+    *,
+    kind: str,
+    fmt: str,
+    workflow: Optional[str],
+    project_id: Optional[uuid.UUID],
+    t: Optional[int],
+) -> Dict[str, Any]:
+    """Normalized job parameters (what params_hash is taken over)."""
+    if kind not in KINDS:
+        raise ValueError(f"Unknown export kind: {kind}.")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}.")
+    if kind == "contracts" and fmt == "csv":
+        raise ValueError("Contracts are nested JSON; use format=ndjson.")
+    if t is not None and kind != "settlement":
+        raise ValueError("t applies to settlement exports only.")
+    return {
+        "kind": kind,
+        "format": fmt,
+        "workflow": workflow,
+        "project_id": str(project_id) if project_id else None,
+        "t": t,
+    }
+
+
+def params_hash(params: Dict[str, Any]) -> str:
+    return sha256_hex(canonical_dumps(params))
+
+
+def job_dir(job_id: uuid.UUID) -> str:
+    return os.path.join(get_settings().export_artifact_dir, str(job_id))
+
+
+def artifact_path(job: ExportJob) -> Optional[str]:
+    return os.path.join(job_dir(job.id), job.file_name) if job.file_name else None
+
+
+def write_artifact(path: str, chunks: Iterable[bytes]) -> Tuple[int, str]:
+    """
+    Write `chunks` to `path` (via a .part file and rename, so a reader never
+    sees a partial artifact). Returns (bytes written, sha256 hex).
+    """
+    digest = hashlib.sha256()
+    size = 0
+    part = path + ".part"
+    with open(part, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+            digest.update(chunk)
+            size += len(chunk)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(part, path)
+    return size, digest.hexdigest()
+
+
+def manifest_for(job: ExportJob) -> Dict[str, Any]:
+    """manifest.json of a finished job (also returned by the status endpoint)."""
+    return {
+        "job_id": str(job.id),
+        "kind": job.kind,
+        "format": job.format,
+        "params": job.params_json,
+        "params_hash": job.params_hash,
+        "created_at_iso": _iso(job.created_at),
+        "finished_at_iso": _iso(job.finished_at),
+        "files": [
+            {
+                "name": job.file_name,
+                "bytes": job.byte_size,
+                "rows": job.row_count,
+                "sha256": job.sha256,
+                "media_type": MEDIA_TYPES[job.format],
+            }
+        ],
+    }
+
+
+class ExportJobService:
+    def get(self, db: Session, job_id: uuid.UUID) -> ExportJob | None:
+        return db.get(ExportJob, job_id)
+
+    def submit(
+        self, db: Session, *, params: Dict[str, Any], requested_by: str
+    ) -> Tuple[ExportJob, bool]:
+        """
+        Returns (job, created). An identical request shares the live job:
+        queued, running, or succeeded within EXPORT_JOB_REUSE_SECONDS with
+        its artifact still on disk. Otherwise that job is retired and a new
+        one is queued; the caller hands created jobs to EXPORT_JOB_RUNNER.
+        """
+        h = params_hash(params)
+        live = self._live(db, h)
+        if live is not None:
+            if self._reusable(live):
+                EXPORT_JOBS.inc(kind=live.kind, outcome="reused")
+                return live, False
+            self._retire(db, live)
+
+        job = ExportJob(
+            params_hash=h,
+            kind=params["kind"],
+            format=params["format"],
+            params_json=params,
+            requested_by=requested_by,
+        )
+        db.add(job)
+        try:
+            db.commit()
+        except IntegrityError:
+            # a concurrent identical request queued it first
+            db.rollback()
+            live = self._live(db, h)
+            if live is None:
+                raise
+            EXPORT_JOBS.inc(kind=live.kind, outcome="reused")
+            return live, False
+        db.refresh(job)
+        EXPORT_JOBS.inc(kind=job.kind, outcome="queued")
+        return job, True
+
+    def _live(self, db: Session, h: str) -> ExportJob | None:
+        return db.execute(
+            select(ExportJob).where(ExportJob.params_hash == h, ExportJob.status.in_(_LIVE))
+        ).scalar_one_or_none()
+
+    def _reusable(self, job: ExportJob) -> bool:
+        settings = get_settings()
+        now = datetime.now(timezone.utc)
+        if job.status == "queued":
+            return True
+        if job.status == "running":
+            return (now - job.started_at).total_seconds() < settings.export_job_stale_seconds
+        path = artifact_path(job)
+        return (
+            (now - job.finished_at).total_seconds() < settings.export_job_reuse_seconds
+            and path is not None
+            and os.path.exists(path)
+        )
+
+    def _retire(self, db: Session, job: ExportJob) -> None:
+        if job.status == "running":
+            job.status = "failed"
+            job.error = "Presumed dead: running longer than EXPORT_JOB_STALE_SECONDS."
+        else:
+            job.status = "expired"
+        db.commit()
+        shutil.rmtree(job_dir(job.id), ignore_errors=True)
+
+
+# ─────────────────────────────────────────────
+# RUNNER
+# ─────────────────────────────────────────────
+
+def _rows(db: Session, job: ExportJob) -> Tuple[Iterable[Dict[str, Any]], Optional[List[str]]]:
+    """Row producer and CSV fieldnames for a job (authority-wide scope)."""
+    p = job.params_json
+    scope = ExportScope(allow_full=True, participant_id=job.requested_by)
+    project_id = uuid.UUID(p["project_id"]) if p["project_id"] else None
+
+    if job.kind == "audit":
+        svc = ExportAuditService()
+        rows = svc.iter_rows(db, scope=scope, workflow=p["workflow"], project_id=project_id)
+        return rows, svc.fieldnames()
+    if job.kind == "settlement":
+        svc = ExportSettlementService()
+        rows = svc.iter_rows(db, scope=scope, workflow=p["workflow"], project_id=project_id, t=p["t"])
+        return rows, svc.fieldnames()
+    rows = ExportContractsService().iter_contract_dicts(
+        db, scope=scope, workflow=p["workflow"], project_id=project_id
+    )
+    return rows, None
+
+
+class ExportJobRunner:
+    """
+    Runs export jobs on a per-process thread pool (EXPORT_JOB_WORKERS): the
+    work is DB streaming and file I/O. Created lazily on first use.
+
+    A job is claimed with a conditional UPDATE (queued → running), so a job
+    handed to several workers (resume_queued at startup) runs once.
+    """
+
+    def __init__(self) -> None:
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=get_settings().export_job_workers,
+                    thread_name_prefix="export-job",
+                )
+            return self._pool
+
+    def submit(self, job_id: uuid.UUID) -> None:
+        self._executor().submit(self._run_logged, job_id)
+
+    def resume_queued(self) -> None:
+        """Pick up jobs queued by a process that stopped before running them."""
+        self._executor().submit(self._resume_logged)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def _resume_logged(self) -> None:
+        try:
+            with SessionLocal() as db:
+                ids = db.execute(select(ExportJob.id).where(ExportJob.status == "queued")).scalars().all()
+        except Exception as e:
+            logger.warning("Could not resume queued export jobs", extra={"error": str(e)})
+            return
+        for job_id in ids:
+            self.submit(job_id)
+
+    def _run_logged(self, job_id: uuid.UUID) -> None:
+        try:
+            self.run(job_id)
+        except Exception:
+            logger.exception("Export job crashed", extra={"job_id": str(job_id)})
+
+    def run(self, job_id: uuid.UUID) -> None:
+        with SessionLocal() as db:
+            claimed = db.execute(
+                update(ExportJob)
+                .where(ExportJob.id == job_id, ExportJob.status == "queued")
+                .values(status="running", started_at=datetime.now(timezone.utc))
+                .returning(ExportJob.id)
+            ).first()
+            db.commit()
+            if claimed is None:
+                return  # already taken by another worker, or retired
+            job = db.get(ExportJob, job_id)
+
+            with EXPORT_JOB_SECONDS.time(kind=job.kind):
+                try:
+                    file_name, rows, size, digest = self._write(db, job)
+                except Exception as e:
+                    db.rollback()
+                    logger.exception("Export job failed", extra={"job_id": str(job_id)})
+                    shutil.rmtree(job_dir(job_id), ignore_errors=True)
+                    self._finish(db, job_id, status="failed", error=str(e)[:2000])
+                    EXPORT_JOBS.inc(kind=job.kind, outcome="failed")
+                    return
+
+            job.file_name, job.row_count, job.byte_size, job.sha256 = file_name, rows, size, digest
+            job.finished_at = datetime.now(timezone.utc)
+            _write_json(os.path.join(job_dir(job_id), "manifest.json"), manifest_for(job))
+            db.expunge(job)  # the values above are written by _finish
+            if self._finish(
+                db,
+                job_id,
+                status="succeeded",
+                file_name=file_name,
+                row_count=rows,
+                byte_size=size,
+                sha256=digest,
+                finished_at=job.finished_at,
+            ):
+                EXPORT_JOBS.inc(kind=job.kind, outcome="succeeded")
+            else:
+                # retired as stale while running; its replacement owns the params
+                shutil.rmtree(job_dir(job_id), ignore_errors=True)
+
+    def _write(self, db: Session, job: ExportJob) -> Tuple[str, int, int, str]:
+        rows, fieldnames = _rows(db, job)
+        count = 0
+
+        def counted() -> Iterator[Dict[str, Any]]:
+            nonlocal count
+            for r in rows:
+                count += 1
+                yield r
+
+        if job.format == "csv":
+            chunks = csv_stream(counted(), fieldnames)
+        else:
+            chunks = ndjson_stream(counted())
+
+        os.makedirs(job_dir(job.id), exist_ok=True)
+        file_name = f"{job.kind}.{job.format}"
+        size, digest = write_artifact(os.path.join(job_dir(job.id), file_name), chunks)
+        db.rollback()  # end the read transaction (server-side cursor)
+        return file_name, count, size, digest
+
+    def _finish(self, db: Session, job_id: uuid.UUID, *, status: str, **values: Any) -> bool:
+        if status != "succeeded":
+            values.setdefault("finished_at", datetime.now(timezone.utc))
+        done = db.execute(
+            update(ExportJob)
+            .where(ExportJob.id == job_id, ExportJob.status == "running")
+            .values(status=status, **values)
+            .returning(ExportJob.id)
+        ).first()
+        db.commit()
+        return done is not None
+
+
+def _write_json(path: str, payload: Dict[str, Any]) -> None:
+    part = path + ".part"
+    with open(part, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(part, path)
+
+
+def _iso(dt):
+    return dt.isoformat() if dt else None
+
+
+EXPORT_JOB_RUNNER = ExportJobRunner()
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import uuid
-from typing import Dict, Any, Iterable, List
+from typing import Dict, Any, Iterable, List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 
+from app.core.config import get_settings
+from app.models.quote_bid import QuoteBid
 from app.models.settlement_result import SettlementResult  # Part 14
 from app.policies.export_policy import ExportScope
 
@@ -24,38 +26,58 @@ class ExportSettlementService:
         db: Session,
         *,
         scope: ExportScope,
-        workflow: str,
-        project_id: uuid.UUID,
-        t: int,
+        workflow: Optional[str],
+        project_id: Optional[uuid.UUID],
+        t: Optional[int],
     ) -> Iterable[Dict[str, Any]]:
-        stmt = select(SettlementResult).where(
-            SettlementResult.workflow == workflow,
-            SettlementResult.project_id == project_id,
-            SettlementResult.t == t,
+        """
+        Exported columns only, through a server-side cursor. The winner is
+        the owner of the winning quote bid; participants only see rows they
+        won (filtered in SQL). None for workflow / project_id / t means all
+        of them, in (computed_at, id) order.
+        """
+        stmt = (
+            select(
+                SettlementResult.id,
+                SettlementResult.workflow,
+                SettlementResult.project_id,
+                SettlementResult.t,
+                SettlementResult.computed_at,
+                SettlementResult.winner_quote_bid_id,
+                SettlementResult.winning_ask_bid_id,
+                # second-price stored explicitly (as required in Part 14)
+                SettlementResult.second_price_inr,
+                QuoteBid.participant_id.label("winner_participant_id"),
+            )
+            .outerjoin(QuoteBid, QuoteBid.id == SettlementResult.winner_quote_bid_id)
         )
-        rows = db.execute(stmt).scalars().all()
+        if workflow is not None:
+            stmt = stmt.where(SettlementResult.workflow == workflow)
+        if project_id is not None:
+            stmt = stmt.where(SettlementResult.project_id == project_id)
+        if t is not None:
+            stmt = stmt.where(SettlementResult.t == t)
+        if not scope.allow_full:
+            # participant must match winner to see the row
+            stmt = stmt.where(QuoteBid.participant_id == scope.participant_id)
 
-        for r in rows:
-            winner_pid = getattr(r, "winner_participant_id", None) or (r.public_json or {}).get("winner_participant_id")
-            if not scope.allow_full:
-                # participant must match winner to see the row
-                if winner_pid != scope.participant_id:
-                    continue
-
-            # second-price stored explicitly (as required in Part 14)
-            second_ref = getattr(r, "second_price_reference_json", None) or getattr(r, "second_price_reference", None) or (r.public_json or {}).get("second_price_reference")
+        stmt = (
+            stmt.order_by(SettlementResult.computed_at, SettlementResult.id)
+            .execution_options(yield_per=get_settings().export_fetch_batch_size)
+        )
 
+        for r in db.execute(stmt).mappings():
             yield {
-                "settlement_result_id": str(r.id),
-                "workflow": r.workflow,
-                "project_id": str(r.project_id),
-                "t": r.t,
-                "created_at": r.created_at.isoformat() if getattr(r, "created_at", None) else None,
-                "winning_quote_bid_id": str(r.winning_quote_bid_id) if getattr(r, "winning_quote_bid_id", None) else None,
-                "winning_ask_bid_id": str(r.winning_ask_bid_id) if getattr(r, "winning_ask_bid_id", None) else None,
-                "second_price_reference": str(second_ref) if second_ref is not None else None,
-                "winner_participant_id": winner_pid,
+                "settlement_result_id": str(r["id"]),
+                "workflow": r["workflow"],
+                "project_id": str(r["project_id"]),
+                "t": r["t"],
+                "created_at": r["computed_at"].isoformat() if r["computed_at"] else None,
+                "winning_quote_bid_id": str(r["winner_quote_bid_id"]) if r["winner_quote_bid_id"] else None,
+                "winning_ask_bid_id": str(r["winning_ask_bid_id"]) if r["winning_ask_bid_id"] else None,
+                "second_price_reference": str(r["second_price_inr"]) if r["second_price_inr"] is not None else None,
+                "winner_participant_id": r["winner_participant_id"],
             }
 
     def fieldnames(self) -> List[str]:
-        return SETTLEMENT_FIELDS
\ No newline at end of file
+        return SETTLEMENT_FIELDS
@@ -1,15 +1,24 @@
 from __future__ import annotations
 
+import threading
+import time
 import uuid
-from typing import Dict, Any
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
-from sqlalchemy import select, func, cast, Numeric
+from sqlalchemy import Float, exists, func, select, true, type_coerce
+from sqlalchemy.dialects.postgresql import ARRAY, array, insert as pg_insert
 from sqlalchemy.orm import Session
 
+from app.core.artifact_cache import ARTIFACT_CACHE, FEEDBACK_AGGREGATES
+from app.core.config import get_settings
+from app.core.round_events import AGGREGATES_UPDATED, ROUND_EVENTS
 from app.models.round import Round
 from app.models.quote_bid import QuoteBid
 from app.models.ask_bid import AskBid
 from app.models.preference_bid import PreferenceBid
+from app.models.round_market_depth import RoundMarketDepth
 
 
 class FeedbackService:
@@ -32,46 +41,23 @@ class FeedbackService:
         participant_id: str,
     ) -> Dict[str, bool]:
         # booleans only; do not return bid ids
-        q = db.execute(
-            select(func.count())
-            .select_from(QuoteBid)
-            .where(
-                QuoteBid.workflow == workflow,
-                QuoteBid.project_id == project_id,
-                QuoteBid.t == t,
-                QuoteBid.participant_id == participant_id,
-                QuoteBid.state.in_(["submitted", "locked"]),
+        def submitted(model):
+            return exists().where(
+                model.workflow == workflow,
+                model.project_id == project_id,
+                model.t == t,
+                model.participant_id == participant_id,
+                model.state.in_(_COUNTED_STATES),
             )
-        ).scalar_one()
-
-        a = db.execute(
-            select(func.count())
-            .select_from(AskBid)
-            .where(
-                AskBid.workflow == workflow,
-                AskBid.project_id == project_id,
-                AskBid.t == t,
-                AskBid.participant_id == participant_id,
-                AskBid.state.in_(["submitted", "locked"]),
-            )
-        ).scalar_one()
-
-        p = db.execute(
-            select(func.count())
-            .select_from(PreferenceBid)
-            .where(
-                PreferenceBid.workflow == workflow,
-                PreferenceBid.project_id == project_id,
-                PreferenceBid.t == t,
-                PreferenceBid.participant_id == participant_id,
-                PreferenceBid.state.in_(["submitted", "locked"]),
-            )
-        ).scalar_one()
+
+        q, a, p = db.execute(
+            select(submitted(QuoteBid), submitted(AskBid), submitted(PreferenceBid))
+        ).one()
 
         return {
-            "user_submitted_quote": bool(q and q > 0),
-            "user_submitted_ask": bool(a and a > 0),
-            "user_submitted_preferences": bool(p and p > 0),
+            "user_submitted_quote": bool(q),
+            "user_submitted_ask": bool(a),
+            "user_submitted_preferences": bool(p),
         }
 
     def aggregate_stats(
@@ -81,105 +67,422 @@ class FeedbackService:
         workflow: str,
         project_id: uuid.UUID,
         t: int,
+        rnd: Optional[Round] = None,
     ) -> Dict[str, Any]:
         """
         Aggregated counts and min/max ranges only.
         No bid IDs, no payload, no participant fields.
+
+        rnd: the round, when the caller has it. Locked rounds are cached
+        permanently (ARTIFACT_CACHE); open rounds are memoized per process
+        (OPEN_ROUND_STATS). Without it the stats are always queried.
+        Returned dicts are shared: do not mutate.
         """
-        # Quote: qbundle stored inside payload_json in Part 9 (qbundle_inr field)
-        # We'll aggregate via JSONB ->> 'qbundle_inr' cast numeric.
-        quote_cnt = db.execute(
-            select(func.count())
-            .select_from(QuoteBid)
-            .where(
-                QuoteBid.workflow == workflow,
-                QuoteBid.project_id == project_id,
-                QuoteBid.t == t,
-                QuoteBid.state.in_(["submitted", "locked"]),
-            )
-        ).scalar_one()
+        def load() -> Dict[str, Any]:
+            return self._query_stats(db, workflow=workflow, project_id=project_id, t=t)
 
-        quote_minmax = db.execute(
-            select(
-                func.min(
-                    cast(QuoteBid.payload_json["qbundle_inr"].astext, Numeric(20, 2))
-                ),
-                func.max(
-                    cast(QuoteBid.payload_json["qbundle_inr"].astext, Numeric(20, 2))
-                ),
-            ).where(
-                QuoteBid.workflow == workflow,
-                QuoteBid.project_id == project_id,
-                QuoteBid.t == t,
-                QuoteBid.state.in_(["submitted", "locked"]),
-                QuoteBid.payload_json.has_key("qbundle_inr"),
-            )
-        ).one()
+        if rnd is None:
+            return load()
+        if rnd.is_locked:
+            return ARTIFACT_CACHE.get_or_load(workflow, project_id, t, FEEDBACK_AGGREGATES, load)
+        return OPEN_ROUND_STATS.get_or_load(workflow, project_id, t, load)
 
-        # Ask: we have separate columns total_ask_inr + compensatory_ask_price_per_unit_inr
-        ask_cnt = db.execute(
-            select(func.count())
-            .select_from(AskBid)
-            .where(
-                AskBid.workflow == workflow,
-                AskBid.project_id == project_id,
-                AskBid.t == t,
-                AskBid.state.in_(["submitted", "locked"]),
+    def _query_stats(
+        self,
+        db: Session,
+        *,
+        workflow: str,
+        project_id: uuid.UUID,
+        t: int,
+    ) -> Dict[str, Any]:
+        """One round trip: the three per-table aggregates cross-joined (one row each)."""
+        def counted(model):
+            return (
+                model.workflow == workflow,
+                model.project_id == project_id,
+                model.t == t,
+                model.state.in_(_COUNTED_STATES),
             )
-        ).scalar_one()
 
-        ask_minmax = db.execute(
-            select(
-                func.min(AskBid.total_ask_inr),
-                func.max(AskBid.total_ask_inr),
-                func.min(AskBid.comp_ask_price_per_unit_inr),
-                func.max(AskBid.comp_ask_price_per_unit_inr),
-            ).where(
-                AskBid.workflow == workflow,
-                AskBid.project_id == project_id,
-                AskBid.t == t,
-                AskBid.state.in_(["submitted", "locked"]),
-            )
-        ).one()
+        # Quote: qbundle mirrored from payload_json into QuoteBid.qbundle_inr
+        quote = select(
+            func.count().label("quote_cnt"),
+            func.min(QuoteBid.qbundle_inr).label("qmin"),
+            func.max(QuoteBid.qbundle_inr).label("qmax"),
+        ).where(*counted(QuoteBid)).subquery()
+
+        # Ask: we have separate columns total_ask_inr + compensatory_ask_price_per_unit_inr
+        ask = select(
+            func.count().label("ask_cnt"),
+            func.min(AskBid.total_ask_inr).label("amin"),
+            func.max(AskBid.total_ask_inr).label("amax"),
+            func.min(AskBid.comp_ask_price_per_unit_inr).label("cmin"),
+            func.max(AskBid.comp_ask_price_per_unit_inr).label("cmax"),
+        ).where(*counted(AskBid)).subquery()
 
         # Preference: count only (no min/max)
-        pref_cnt = db.execute(
-            select(func.count())
-            .select_from(PreferenceBid)
-            .where(
-                PreferenceBid.workflow == workflow,
-                PreferenceBid.project_id == project_id,
-                PreferenceBid.t == t,
-                PreferenceBid.state.in_(["submitted", "locked"]),
-            )
-        ).scalar_one()
+        pref = select(func.count().label("pref_cnt")).where(*counted(PreferenceBid)).subquery()
+
+        row = db.execute(
+            select(quote, ask, pref).select_from(quote.join(ask, true()).join(pref, true()))
+        ).one()
 
         # Convert decimals to strings safely
         def s(x):
             return str(x) if x is not None else None
 
-        qmin, qmax = quote_minmax[0], quote_minmax[1]
-        amin, amax, cmin, cmax = (
-            ask_minmax[0],
-            ask_minmax[1],
-            ask_minmax[2],
-            ask_minmax[3],
-        )
-
         return {
             "quote": {
-                "count_total": int(quote_cnt or 0),
-                "qbundle_min_inr": s(qmin),
-                "qbundle_max_inr": s(qmax),
+                "count_total": int(row.quote_cnt or 0),
+                "qbundle_min_inr": s(row.qmin),
+                "qbundle_max_inr": s(row.qmax),
             },
             "ask": {
-                "count_total": int(ask_cnt or 0),
-                "total_min_inr": s(amin),
-                "total_max_inr": s(amax),
-                "comp_ppu_min_inr": s(cmin),
-                "comp_ppu_max_inr": s(cmax),
+                "count_total": int(row.ask_cnt or 0),
+                "total_min_inr": s(row.amin),
+                "total_max_inr": s(row.amax),
+                "comp_ppu_min_inr": s(row.cmin),
+                "comp_ppu_max_inr": s(row.cmax),
             },
             "preferences": {
-                "count_total": int(pref_cnt or 0),
+                "count_total": int(row.pref_cnt or 0),
             },
         }
+
+    # ─────────────────────────────────────────────
+    # MARKET DEPTH (locked rounds)
+    # ─────────────────────────────────────────────
+
+    def market_depth(
+        self,
+        db: Session,
+        *,
+        workflow: str,
+        project_id: uuid.UUID,
+        t: int,
+        rnd: Optional[Round] = None,
+    ) -> RoundMarketDepth:
+        """
+        Percentiles and bucketed histograms of the locked quotes (qbundle_inr)
+        and asks (total_ask_inr). Computed in the database once the round is
+        locked, then served from round_market_depths.
+        """
+        existing = self._stored_depth(db, workflow, project_id, t)
+        if existing:
+            return existing
+
+        if rnd is None:
+            rnd = self.get_round(db, workflow, project_id, t)
+        if not rnd:
+            raise ValueError("Round not found.")
+        if not rnd.is_locked:
+            raise ValueError("Market depth is available only after round lock.")
+
+        settings = get_settings()
+        stats: Dict[str, Any] = {
+            name: self._depth_series(
+                db, model, col, workflow=workflow, project_id=project_id, t=t,
+                buckets=settings.market_depth_buckets,
+                min_bids=settings.market_depth_min_bids,
+                min_cell=settings.market_depth_min_cell,
+            )
+            for name, (model, col) in _DEPTH_SERIES.items()
+        }
+        stats["min_bids"] = settings.market_depth_min_bids
+        stats["min_cell"] = settings.market_depth_min_cell
+
+        # two first readers both compute; whichever inserts second keeps the
+        # stored row (same locked bids, same stats)
+        db.execute(
+            pg_insert(RoundMarketDepth)
+            .values(
+                id=uuid.uuid4(), workflow=workflow, project_id=project_id, round_id=rnd.id, t=t, stats_json=stats
+            )
+            .on_conflict_do_nothing(constraint="uq_round_market_depth_scope")
+        )
+        db.commit()
+        return self._stored_depth(db, workflow, project_id, t)
+
+    def _stored_depth(
+        self, db: Session, workflow: str, project_id: uuid.UUID, t: int
+    ) -> RoundMarketDepth | None:
+        return db.execute(
+            select(RoundMarketDepth).where(
+                RoundMarketDepth.workflow == workflow,
+                RoundMarketDepth.project_id == project_id,
+                RoundMarketDepth.t == t,
+            )
+        ).scalar_one_or_none()
+
+    def _depth_series(
+        self,
+        db: Session,
+        model,
+        col: str,
+        *,
+        workflow: str,
+        project_id: uuid.UUID,
+        t: int,
+        buckets: int,
+        min_bids: int,
+        min_cell: int,
+    ) -> Dict[str, Any]:
+        column = getattr(model, col)
+        where = (
+            model.workflow == workflow,
+            model.project_id == project_id,
+            model.t == t,
+            model.state == "locked",
+            column.is_not(None),
+        )
+
+        summary = db.execute(
+            select(
+                func.count(),
+                func.min(column),
+                func.max(column),
+                # percentile_cont(float8[]) returns float8[], not the column type
+                type_coerce(
+                    func.percentile_cont(array(_DEPTH_PERCENTILES)).within_group(column), ARRAY(Float)
+                ),
+            ).where(*where)
+        ).one()
+        count, lo, hi, percentiles = summary
+
+        counts: Dict[int, int] = {}
+        if count and count >= min_bids:
+            if lo == hi:
+                # width_bucket needs distinct bounds; all bids share one value
+                buckets, counts = 1, {1: count}
+            else:
+                # width_bucket puts the max itself in bucket N+1; fold it into N
+                bucket = func.least(func.width_bucket(column, lo, hi, buckets), buckets).label("bucket")
+                counts = dict(
+                    db.execute(select(bucket, func.count()).where(*where).group_by(bucket)).all()
+                )
+
+        return depth_series(
+            int(count), lo, hi, percentiles, counts,
+            buckets=buckets, min_bids=min_bids, min_cell=min_cell,
+        )
+
+
+# ─────────────────────────────────────────────
+# MARKET DEPTH
+# ─────────────────────────────────────────────
+
+_DEPTH_SERIES = {
+    "quote_qbundle_inr": (QuoteBid, "qbundle_inr"),
+    "ask_total_inr": (AskBid, "total_ask_inr"),
+}
+_DEPTH_PERCENTILES = [0.1, 0.5, 0.9]
+_CENTS = Decimal("0.01")
+
+
+def depth_series(
+    count: int,
+    lo: Optional[Decimal],
+    hi: Optional[Decimal],
+    percentiles: Optional[Sequence[float]],
+    bucket_counts: Dict[int, int],
+    *,
+    buckets: int,
+    min_bids: int,
+    min_cell: int,
+) -> Dict[str, Any]:
+    """
+    Shape one series for storage. Below `min_bids` bids only the count and
+    range are kept (the same as the round aggregates): with so few bids a
+    percentile or a bucket is close to an individual bid. Buckets holding
+    1..min_cell-1 bids report a null count, and so does one more bucket
+    (the smallest non-empty other one): with the total published, a lone
+    null would be count minus the visible buckets.
+    """
+    out: Dict[str, Any] = {
+        "count": count,
+        "min_inr": _cents(lo),
+        "max_inr": _cents(hi),
+        "p10_inr": None,
+        "p50_inr": None,
+        "p90_inr": None,
+        "histogram": [],
+        "suppressed": count < min_bids,
+    }
+    if not count or count < min_bids:
+        return out
+
+    p10, p50, p90 = (_cents(Decimal(str(p))) for p in percentiles)
+    out.update(p10_inr=p10, p50_inr=p50, p90_inr=p90)
+
+    counts = {i: int(bucket_counts.get(i, 0)) for i in range(1, buckets + 1)}
+    hidden = {i for i, n in counts.items() if 0 < n < min_cell}
+    rest = [i for i in counts if i not in hidden]
+    if hidden and rest:
+        # complementary suppression; an empty bucket only when nothing else is left
+        hidden.add(min(rest, key=lambda i: (counts[i] == 0, counts[i], i)))
+
+    width = (hi - lo) / buckets
+    histogram: List[Dict[str, Any]] = []
+    for i, n in counts.items():
+        histogram.append({
+            "from_inr": _cents(lo + width * (i - 1)),
+            "to_inr": _cents(hi if i == buckets else lo + width * i),
+            "count": None if i in hidden else n,
+        })
+    out["histogram"] = histogram
+    return out
+
+
+def _cents(value: Optional[Decimal]) -> Optional[str]:
+    return str(Decimal(value).quantize(_CENTS)) if value is not None else None
+
+
+# ─────────────────────────────────────────────
+# OPEN-ROUND MEMO
+# ─────────────────────────────────────────────
+
+_COUNTED_STATES = ("submitted", "locked")
+
+# aggregate section and (min key, max key) -> bid column, per bid table
+_RANGES = {
+    QuoteBid: ("quote", {("qbundle_min_inr", "qbundle_max_inr"): "qbundle_inr"}),
+    AskBid: (
+        "ask",
+        {
+            ("total_min_inr", "total_max_inr"): "total_ask_inr",
+            ("comp_ppu_min_inr", "comp_ppu_max_inr"): "comp_ask_price_per_unit_inr",
+        },
+    ),
+    PreferenceBid: ("preferences", {}),
+}
+
+
+def bid_stat_values(row) -> Dict[str, Optional[Decimal]]:
+    """The columns of `row` that feed the aggregate ranges."""
+    _, ranges = _RANGES[type(row)]
+    return {col: getattr(row, col) for col in ranges.values()}
+
+
+def is_counted(state: Optional[str]) -> bool:
+    return state in _COUNTED_STATES
+
+
+class OpenRoundStats:
+    """
+    Per-process memo of aggregate_stats for open rounds.
+
+    Bid changes handled by this process are folded in right after their
+    commit (count +1, ranges widened); a change that could shrink a range
+    (a counted bid replaced or withdrawn at the current min/max) drops the
+    entry instead. Changes made by other workers show up when the entry
+    expires (FEEDBACK_STATS_TTL_SECONDS).
+
+    Each change also publishes the round's aggregates to the round stream
+    (aggregates.updated, at most once per AGGREGATES_EVENT_INTERVAL_SECONDS
+    per round).
+    """
+
+    def __init__(self, *, ttl_seconds: float, max_entries: int = 1024, event_interval: float = 1.0):
+        self.ttl = ttl_seconds
+        self.event_interval = event_interval
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, int], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_load(
+        self, workflow: str, project_id, t: int, loader: Callable[[], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        key = (workflow, str(project_id), int(t))
+        now = time.monotonic()
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is not None and hit[0] > now:
+                self._entries.move_to_end(key)
+                return hit[1]
+
+        stats = loader()
+        with self._lock:
+            self._entries[key] = (now + self.ttl, stats)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return stats
+
+    def bid_changed(
+        self,
+        row,
+        *,
+        was_counted: bool,
+        previous: Dict[str, Optional[Decimal]],
+        db: Optional[Session] = None,
+    ) -> None:
+        """
+        Fold one committed bid change into the memo. `previous` is
+        bid_stat_values(row) from before the change. With `db`, the
+        round's aggregates (as GET /feedback/round returns them) are then
+        published as aggregates.updated, reloaded if the entry was dropped.
+        """
+        self._fold(row, was_counted=was_counted, previous=previous)
+        if db is None:
+            return
+
+        workflow, project_id, t = row.workflow, row.project_id, int(row.t)
+        stats = self.get_or_load(
+            workflow,
+            project_id,
+            t,
+            lambda: FeedbackService()._query_stats(db, workflow=workflow, project_id=project_id, t=t),
+        )
+        ROUND_EVENTS.publish_throttled(
+            workflow, project_id, AGGREGATES_UPDATED, min_interval=self.event_interval, t=t, aggregates=stats
+        )
+
+    def _fold(self, row, *, was_counted: bool, previous: Dict[str, Optional[Decimal]]) -> None:
+        key = (row.workflow, str(row.project_id), int(row.t))
+        counted = is_counted(row.state)
+        section, ranges = _RANGES[type(row)]
+
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is None:
+                return
+            expires, stats = hit
+            part = dict(stats[section])
+
+            if was_counted:
+                for (lo, hi), col in ranges.items():
+                    old = previous.get(col)
+                    if old is not None and old in (_dec(part[lo]), _dec(part[hi])):
+                        del self._entries[key]
+                        return
+                if not counted:
+                    part["count_total"] -= 1
+            elif counted:
+                part["count_total"] += 1
+
+            if counted:
+                for (lo, hi), col in ranges.items():
+                    new = getattr(row, col)
+                    if new is None:
+                        continue
+                    if part[lo] is None or new < _dec(part[lo]):
+                        part[lo] = str(new)
+                    if part[hi] is None or new > _dec(part[hi]):
+                        part[hi] = str(new)
+
+            # copy on write: readers may hold the old dict
+            self._entries[key] = (expires, {**stats, section: part})
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _dec(value: Optional[str]) -> Optional[Decimal]:
+    return Decimal(value) if value is not None else None
+
+
+OPEN_ROUND_STATS = OpenRoundStats(
+    ttl_seconds=get_settings().feedback_stats_ttl_seconds,
+    event_interval=get_settings().aggregates_event_interval_seconds,
+)
@@ -0,0 +1,197 @@
+# app/services/ledger_merkle_service.py
+from __future__ import annotations
+
+import uuid
+from typing import Any, Dict, List
+
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.merkle import inclusion_proof, leaf_hash, merkle_root
+from app.models.contract_ledger import ContractLedgerEntry
+from app.models.ledger_merkle_batch import LedgerMerkleBatch
+
+
+def _leaf(entry_hash: str) -> bytes:
+    return leaf_hash(bytes.fromhex(entry_hash))
+
+
+class LedgerMerkleService:
+    """
+    Merkle commitments over the contract ledger.
+
+    Entries are grouped into fixed-size batches by seq; each full batch's
+    root is sealed once (after the chain up to it has been verified).
+    A single entry is then proven with an O(log batch) audit path against
+    its batch root, without replaying the hash chain.
+    """
+
+    def __init__(self):
+        self.batch_size = get_settings().ledger_merkle_batch_size
+
+    # ─────────────────────────────────────────────
+    # INTERNAL HELPERS
+    # ─────────────────────────────────────────────
+
+    def _batch_bounds(self, batch_index: int) -> tuple[int, int]:
+        first = batch_index * self.batch_size + 1
+        return first, first + self.batch_size - 1
+
+    def _leaves(
+        self,
+        db: Session,
+        *,
+        workflow: str,
+        project_id: uuid.UUID,
+        first_seq: int,
+        last_seq: int,
+    ) -> List[bytes]:
+        hashes = db.execute(
+            select(ContractLedgerEntry.entry_hash)
+            .where(
+                ContractLedgerEntry.workflow == workflow,
+                ContractLedgerEntry.project_id == project_id,
+                ContractLedgerEntry.seq >= first_seq,
+                ContractLedgerEntry.seq <= last_seq,
+            )
+            .order_by(ContractLedgerEntry.seq.asc())
+        ).scalars()
+        return [_leaf(h) for h in hashes]
+
+    # ─────────────────────────────────────────────
+    # WRITE (called after a successful chain verification)
+    # ─────────────────────────────────────────────
+
+    def seal_batches(
+        self,
+        db: Session,
+        *,
+        workflow: str,
+        project_id: uuid.UUID,
+        through_seq: int,
+    ) -> int:
+        """
+        Persist roots for every full batch ending at or before `through_seq`
+        that is not sealed yet. Streams the leaves; caller commits.
+        Returns the number of batches sealed.
+        """
+        next_index = db.execute(
+            select(func.coalesce(func.max(LedgerMerkleBatch.batch_index) + 1, 0)).where(
+                LedgerMerkleBatch.workflow == workflow,
+                LedgerMerkleBatch.project_id == project_id,
+            )
+        ).scalar_one()
+
+        first_seq, _ = self._batch_bounds(next_index)
+        full_batches = (through_seq - first_seq + 1) // self.batch_size
+        if full_batches <= 0:
+            return 0
+        stop_seq = first_seq + full_batches * self.batch_size - 1
+
+        rows = db.execute(
+            select(ContractLedgerEntry.entry_hash)
+            .where(
+                ContractLedgerEntry.workflow == workflow,
+                ContractLedgerEntry.project_id == project_id,
+                ContractLedgerEntry.seq >= first_seq,
+                ContractLedgerEntry.seq <= stop_seq,
+            )
+            .order_by(ContractLedgerEntry.seq.asc())
+            .execution_options(yield_per=self.batch_size)
+        ).scalars()
+
+        sealed: List[Dict[str, Any]] = []
+        leaves: List[bytes] = []
+        for h in rows:
+            leaves.append(_leaf(h))
+            if len(leaves) == self.batch_size:
+                idx = next_index + len(sealed)
+                lo, hi = self._batch_bounds(idx)
+                sealed.append(
+                    {
+                        "id": uuid.uuid4(),
+                        "workflow": workflow,
+                        "project_id": project_id,
+                        "batch_index": idx,
+                        "first_seq": lo,
+                        "last_seq": hi,
+                        "size": self.batch_size,
+                        "root_hash": merkle_root(leaves).hex(),
+                    }
+                )
+                leaves = []
+
+        if sealed:
+            db.execute(
+                pg_insert(LedgerMerkleBatch)
+                .values(sealed)
+                .on_conflict_do_nothing(constraint="uq_contract_ledger_merkle_batch")
+            )
+        return len(sealed)
+
+    # ─────────────────────────────────────────────
+    # READ
+    # ─────────────────────────────────────────────
+
+    def get_proof(
+        self,
+        db: Session,
+        *,
+        workflow: str,
+        project_id: uuid.UUID,
+        entry_id: uuid.UUID,
+    ) -> Dict[str, Any]:
+        """
+        Inclusion proof for one ledger entry.
+
+        The root is the sealed batch root when the batch is full and sealed;
+        otherwise it is computed over the batch as it stands now
+        (rootPersisted=False) and will change as the batch fills.
+        """
+        entry = db.execute(
+            select(ContractLedgerEntry.seq, ContractLedgerEntry.entry_hash).where(
+                ContractLedgerEntry.id == entry_id,
+                ContractLedgerEntry.workflow == workflow,
+                ContractLedgerEntry.project_id == project_id,
+            )
+        ).first()
+        if entry is None:
+            raise ValueError("Ledger entry not found")
+
+        batch_index = (entry.seq - 1) // self.batch_size
+        first_seq, last_seq = self._batch_bounds(batch_index)
+
+        sealed = db.execute(
+            select(LedgerMerkleBatch).where(
+                LedgerMerkleBatch.workflow == workflow,
+                LedgerMerkleBatch.project_id == project_id,
+                LedgerMerkleBatch.batch_index == batch_index,
+            )
+        ).scalar_one_or_none()
+
+        leaves = self._leaves(
+            db,
+            workflow=workflow,
+            project_id=project_id,
+            first_seq=first_seq,
+            last_seq=last_seq,
+        )
+        index = entry.seq - first_seq
+        root = sealed.root_hash if sealed is not None else merkle_root(leaves).hex()
+
+        return {
+            "entryId": str(entry_id),
+            "seq": entry.seq,
+            "entryHash": entry.entry_hash,
+            "leafHash": leaves[index].hex(),
+            "leafIndex": index,
+            "treeSize": len(leaves),
+            "batchIndex": batch_index,
+            "firstSeq": first_seq,
+            "lastSeq": first_seq + len(leaves) - 1,
+            "auditPath": [p.hex() for p in inclusion_proof(index, leaves)],
+            "root": root,
+            "rootPersisted": sealed is not None,
+        }
@@ -3,14 +3,33 @@ from __future__ import annotations
 
 import uuid
 import hashlib
+import hmac
 import json
-from typing import Dict, Any, Optional
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Deque, Dict, Any, Iterable, List, Optional, Tuple
 from datetime import datetime, timezone
 
-from sqlalchemy import select, func
+from sqlalchemy import select, func, literal, exists, and_, not_
+from sqlalchemy.dialects.postgresql import insert as pg_insert, JSONB, UUID
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
+from app.core.metrics import (
+    LEDGER_APPEND_SECONDS,
+    LEDGER_ENTRIES_APPENDED,
+    LEDGER_STALE_TAIL_RETRIES,
+    LEDGER_VERIFY_FAILURES,
+    LEDGER_VERIFY_SECONDS,
+)
+from app.core.pools import get_process_pool, pool_size
+from app.core.signing import hmac_sha256
 from app.models.contract_ledger import ContractLedgerEntry
+from app.models.ledger_checkpoint import LedgerCheckpoint
+from app.services.ledger_merkle_service import LedgerMerkleService
 
 
 def _now():
@@ -27,6 +46,13 @@ def _canonical_json(payload: Dict[str, Any]) -> str:
     return json.dumps(payload, sort_keys=True, separators=(",", ":"))
 
 
+def _canonical_json_many(payloads: List[Dict[str, Any]]) -> List[str]:
+    """
+    Batch form of _canonical_json (module-level so worker processes can run it).
+    """
+    return [_canonical_json(p) for p in payloads]
+
+
 def _hash(prev_hash: str, payload: Dict[str, Any]) -> str:
     """
     entry_hash = SHA256(prev_hash + canonical(payload))
@@ -37,6 +63,82 @@ def _hash(prev_hash: str, payload: Dict[str, Any]) -> str:
     return h.hexdigest()
 
 
+def _entry_payload(
+    *,
+    workflow: str,
+    project_id: uuid.UUID,
+    contract_id: uuid.UUID,
+    entry_type: str,
+    payload: Dict[str, Any],
+    created_at: datetime,
+) -> Dict[str, Any]:
+    return {
+        "workflow": workflow,
+        "project_id": str(project_id),
+        "contract_id": str(contract_id),
+        "entry_type": entry_type,
+        "payload": payload,
+        "created_at": created_at.isoformat(),
+    }
+
+
+def _checkpoint_signature(
+    workflow: str, project_id: uuid.UUID, seq: int, entry_hash: str
+) -> str:
+    settings = get_settings()
+    secret = settings.ledger_checkpoint_secret or settings.jwt_secret_key
+    return hmac_sha256(secret, f"{workflow}:{project_id}:{seq}:{entry_hash}")
+
+
+def _advisory_key(workflow: str, project_id: uuid.UUID) -> int:
+    """
+    Stable signed 64-bit key for pg_advisory_xact_lock, one per ledger scope.
+    (Python's hash() is salted per process, so it cannot be used here.)
+    """
+    digest = hashlib.sha256(f"ledger:{workflow}:{project_id}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+@dataclass(frozen=True)
+class ChainVerification:
+    valid: bool
+    first_broken_seq: Optional[int]  # None when valid
+    verified_through_seq: int  # last seq whose hash checked out
+    verified_through_hash: str
+    entries_checked: int
+    full: bool
+
+
+class _LedgerTailCache:
+    """
+    Last committed (seq, entry_hash) per (workflow, project_id).
+
+    Only a hint: every append re-validates it inside the INSERT, and a stale
+    value (another worker appended meanwhile) costs one tail reload.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tails: Dict[Tuple[str, uuid.UUID], Tuple[int, str]] = {}
+
+    def get(self, workflow: str, project_id: uuid.UUID) -> Optional[Tuple[int, str]]:
+        with self._lock:
+            return self._tails.get((workflow, project_id))
+
+    def set(self, workflow: str, project_id: uuid.UUID, seq: int, entry_hash: str) -> None:
+        with self._lock:
+            cur = self._tails.get((workflow, project_id))
+            if cur is None or cur[0] < seq:
+                self._tails[(workflow, project_id)] = (seq, entry_hash)
+
+    def invalidate(self, workflow: str, project_id: uuid.UUID) -> None:
+        with self._lock:
+            self._tails.pop((workflow, project_id), None)
+
+
+_TAIL_CACHE = _LedgerTailCache()
+
+
 class LedgerService:
     """
     Append-only contract ledger.
@@ -49,32 +151,90 @@ class LedgerService:
     # INTERNAL HELPERS
     # ─────────────────────────────────────────────
 
-    def _get_last_entry(
+    def _load_tail(
         self,
         db: Session,
         *,
         workflow: str,
         project_id: uuid.UUID,
-    ) -> Optional[ContractLedgerEntry]:
-        return db.execute(
-            select(ContractLedgerEntry)
+    ) -> Tuple[int, str]:
+        row = db.execute(
+            select(ContractLedgerEntry.seq, ContractLedgerEntry.entry_hash)
             .where(
                 ContractLedgerEntry.workflow == workflow,
                 ContractLedgerEntry.project_id == project_id,
             )
             .order_by(ContractLedgerEntry.seq.desc())
             .limit(1)
-        ).scalar_one_or_none()
+        ).first()
+        return (row.seq, row.entry_hash) if row else (0, self.GENESIS_HASH)
 
-    def _next_seq(
+    def _lock_scope(self, db: Session, *, workflow: str, project_id: uuid.UUID) -> None:
+        """
+        Serialize appends per (workflow, project_id) until the transaction ends.
+        Without it two writers can read the same tail and fork the chain.
+        """
+        db.execute(select(func.pg_advisory_xact_lock(_advisory_key(workflow, project_id))))
+
+    def _insert_after(
         self,
         db: Session,
         *,
-        workflow: str,
-        project_id: uuid.UUID,
-    ) -> int:
-        last = self._get_last_entry(db, workflow=workflow, project_id=project_id)
-        return 1 if not last else last.seq + 1
+        tail: Tuple[int, str],
+        row: Dict[str, Any],
+    ) -> Optional[ContractLedgerEntry]:
+        """
+        INSERT ... SELECT ... WHERE <tail is still (seq, hash)> RETURNING *.
+
+        The guard validates the cached tail in the same statement as the
+        write; returns None when the tail moved (nothing inserted).
+        """
+        seq, prev_hash = tail
+        scope = and_(
+            ContractLedgerEntry.workflow == row["workflow"],
+            ContractLedgerEntry.project_id == row["project_id"],
+        )
+        if seq == 0:
+            guard = not_(exists().where(scope))
+        else:
+            guard = exists().where(
+                scope,
+                ContractLedgerEntry.seq == seq,
+                ContractLedgerEntry.entry_hash == prev_hash,
+            )
+
+        source = select(
+            literal(row["id"], UUID(as_uuid=True)),
+            literal(row["workflow"]),
+            literal(row["project_id"], UUID(as_uuid=True)),
+            literal(row["contract_id"], UUID(as_uuid=True)),
+            literal(row["seq"]),
+            literal(row["entry_type"]),
+            literal(row["prev_hash"]),
+            literal(row["entry_hash"]),
+            literal(row["payload_json"], JSONB),
+        ).where(guard)
+
+        stmt = (
+            pg_insert(ContractLedgerEntry)
+            .from_select(
+                [
+                    "id",
+                    "workflow",
+                    "project_id",
+                    "contract_id",
+                    "seq",
+                    "entry_type",
+                    "prev_hash",
+                    "entry_hash",
+                    "payload_json",
+                ],
+                source,
+            )
+            .on_conflict_do_nothing(constraint="uq_contract_ledger_seq")
+            .returning(ContractLedgerEntry)
+        )
+        return db.scalars(stmt).one_or_none()
 
     # ─────────────────────────────────────────────
     # PUBLIC API
@@ -97,41 +257,133 @@ class LedgerService:
         - append-only
         - hash-chained
         - deterministic
-        """
-
-        last = self._get_last_entry(db, workflow=workflow, project_id=project_id)
-
-        prev_hash = last.entry_hash if last else self.GENESIS_HASH
-        seq = self._next_seq(db, workflow=workflow, project_id=project_id)
+        - serialized per (workflow, project_id) via an advisory lock
 
-        entry_payload = {
-            "workflow": workflow,
-            "project_id": str(project_id),
-            "contract_id": str(contract_id),
-            "entry_type": entry_type,
-            "payload": payload,
-            "created_at": _now().isoformat(),
-        }
+        The tail comes from an in-process cache when warm; the INSERT itself
+        checks it against the table, so the common path is lock + one write.
+        """
+        t0 = time.perf_counter()
+        self._lock_scope(db, workflow=workflow, project_id=project_id)
 
-        entry_hash = _hash(prev_hash, entry_payload)
+        tail = _TAIL_CACHE.get(workflow, project_id)
+        if tail is None:
+            tail = self._load_tail(db, workflow=workflow, project_id=project_id)
 
-        row = ContractLedgerEntry(
+        entry_payload = _entry_payload(
             workflow=workflow,
             project_id=project_id,
             contract_id=contract_id,
-            seq=seq,
             entry_type=entry_type,
-            prev_hash=prev_hash,
-            entry_hash=entry_hash,
-            payload_json=entry_payload,
+            payload=payload,
+            created_at=_now(),
         )
 
-        db.add(row)
+        row = None
+        for attempt in range(2):
+            seq, prev_hash = tail
+            row = self._insert_after(
+                db,
+                tail=tail,
+                row={
+                    "id": uuid.uuid4(),
+                    "workflow": workflow,
+                    "project_id": project_id,
+                    "contract_id": contract_id,
+                    "seq": seq + 1,
+                    "entry_type": entry_type,
+                    "prev_hash": prev_hash,
+                    "entry_hash": _hash(prev_hash, entry_payload),
+                    "payload_json": entry_payload,
+                },
+            )
+            if row is not None:
+                break
+            # cached tail was stale -> reload under the lock and retry once
+            LEDGER_STALE_TAIL_RETRIES.inc()
+            _TAIL_CACHE.invalidate(workflow, project_id)
+            tail = self._load_tail(db, workflow=workflow, project_id=project_id)
+
+        if row is None:
+            db.rollback()
+            raise ValueError("Ledger append conflict; tail changed concurrently")
+
+        new_tail = (row.seq, row.entry_hash)
         db.commit()
-        db.refresh(row)
+        _TAIL_CACHE.set(workflow, project_id, *new_tail)
+
+        LEDGER_APPEND_SECONDS.observe(time.perf_counter() - t0, op="single")
+        LEDGER_ENTRIES_APPENDED.inc(op="single")
 
         return row
 
+    def append_entries(
+        self,
+        db: Session,
+        *,
+        workflow: str,
+        project_id: uuid.UUID,
+        entries: Iterable[Dict[str, Any]],
+    ) -> List[ContractLedgerEntry]:
+        """
+        Append N entries in one statement, inside the caller's transaction.
+
+        entries: [{"contract_id", "entry_type", "payload"}, ...] in ledger order.
+
+        The tail is read once under the scope lock, the N hashes are chained
+        in memory and the rows go out as a single multi-row INSERT ... RETURNING.
+        Does NOT commit; the lock is held until the caller commits or rolls back.
+        """
+        t0 = time.perf_counter()
+        self._lock_scope(db, workflow=workflow, project_id=project_id)
+
+        # under the lock the table is authoritative (and includes any rows this
+        # transaction already wrote), so skip the cache
+        seq, prev_hash = self._load_tail(db, workflow=workflow, project_id=project_id)
+        created_at = _now()
+
+        rows: List[Dict[str, Any]] = []
+        for e in entries:
+            entry_payload = _entry_payload(
+                workflow=workflow,
+                project_id=project_id,
+                contract_id=e["contract_id"],
+                entry_type=e["entry_type"],
+                payload=e["payload"],
+                created_at=created_at,
+            )
+            seq += 1
+            entry_hash = _hash(prev_hash, entry_payload)
+            rows.append(
+                {
+                    "id": uuid.uuid4(),
+                    "workflow": workflow,
+                    "project_id": project_id,
+                    "contract_id": e["contract_id"],
+                    "seq": seq,
+                    "entry_type": e["entry_type"],
+                    "prev_hash": prev_hash,
+                    "entry_hash": entry_hash,
+                    "payload_json": entry_payload,
+                }
+            )
+            prev_hash = entry_hash
+
+        if not rows:
+            return []
+
+        # tail is only known once the caller commits; drop the cached one
+        _TAIL_CACHE.invalidate(workflow, project_id)
+
+        written = list(
+            db.scalars(
+                pg_insert(ContractLedgerEntry).values(rows).returning(ContractLedgerEntry)
+            )
+        )
+
+        LEDGER_APPEND_SECONDS.observe(time.perf_counter() - t0, op="batch")
+        LEDGER_ENTRIES_APPENDED.inc(len(written), op="batch")
+        return written
+
     # ─────────────────────────────────────────────
     # READ-ONLY HELPERS (AUDIT)
     # ─────────────────────────────────────────────
@@ -156,25 +408,286 @@ class LedgerService:
             .all()
         )
 
-    def verify_chain(
+    def _checkpoints(
         self,
         db: Session,
         *,
         workflow: str,
         project_id: uuid.UUID,
-    ) -> bool:
+        limit: Optional[int] = None,
+    ) -> List[Tuple[int, str, Optional[str]]]:
         """
-        Verifies the entire hash chain.
+        Checkpoints newest first as (seq, entry_hash, ledger_hash), where
+        ledger_hash is what the ledger holds at that seq now (None if the row
+        is gone). Rows whose signature does not verify are left out.
+        """
+        stmt = (
+            select(
+                LedgerCheckpoint.seq,
+                LedgerCheckpoint.entry_hash,
+                LedgerCheckpoint.signature,
+                ContractLedgerEntry.entry_hash.label("ledger_hash"),
+            )
+            .outerjoin(
+                ContractLedgerEntry,
+                and_(
+                    ContractLedgerEntry.workflow == LedgerCheckpoint.workflow,
+                    ContractLedgerEntry.project_id == LedgerCheckpoint.project_id,
+                    ContractLedgerEntry.seq == LedgerCheckpoint.seq,
+                ),
+            )
+            .where(
+                LedgerCheckpoint.workflow == workflow,
+                LedgerCheckpoint.project_id == project_id,
+            )
+            .order_by(LedgerCheckpoint.seq.desc())
+            .limit(limit)
+        )
+        return [
+            (row.seq, row.entry_hash, row.ledger_hash)
+            for row in db.execute(stmt)
+            if hmac.compare_digest(
+                _checkpoint_signature(workflow, project_id, row.seq, row.entry_hash),
+                row.signature,
+            )
+        ]
+
+    def _latest_checkpoint(
+        self,
+        db: Session,
+        *,
+        workflow: str,
+        project_id: uuid.UUID,
+    ) -> Optional[Tuple[int, str, Optional[str]]]:
+        """
+        Newest checkpoint, if its signature is valid; a forged newest row
+        -> None (full verify). The caller compares its hash with the ledger.
+        """
+        rows = self._checkpoints(db, workflow=workflow, project_id=project_id, limit=1)
+        return rows[0] if rows else None
+
+    def _unanchored_report(
+        self,
+        db: Session,
+        *,
+        workflow: str,
+        project_id: uuid.UUID,
+        full: bool,
+    ) -> ChainVerification:
+        """
+        The ledger no longer matches a signed checkpoint: rows under it were
+        rewritten (possibly re-hashed into a self-consistent chain, which no
+        fold can detect). The break is reported at the oldest checkpoint that
+        no longer matches; the chain is vouched for up to the newest one
+        before it that still does.
+        """
+        rows = self._checkpoints(db, workflow=workflow, project_id=project_id)
+        through_seq, through_hash = 0, self.GENESIS_HASH
+        broken = None
+        for seq, entry_hash, ledger_hash in reversed(rows):
+            if ledger_hash != entry_hash:
+                broken = seq
+                break
+            through_seq, through_hash = seq, entry_hash
+        return ChainVerification(
+            valid=False,
+            first_broken_seq=broken,
+            verified_through_seq=through_seq,
+            verified_through_hash=through_hash,
+            entries_checked=0,
+            full=full,
+        )
+
+    def _record_checkpoint(
+        self,
+        db: Session,
+        *,
+        workflow: str,
+        project_id: uuid.UUID,
+        seq: int,
+        entry_hash: str,
+    ) -> None:
+        db.execute(
+            pg_insert(LedgerCheckpoint)
+            .values(
+                id=uuid.uuid4(),
+                workflow=workflow,
+                project_id=project_id,
+                seq=seq,
+                entry_hash=entry_hash,
+                signature=_checkpoint_signature(workflow, project_id, seq, entry_hash),
+            )
+            .on_conflict_do_nothing(constraint="uq_contract_ledger_checkpoint_seq")
+        )
+        db.commit()
+
+    def _fold_chain(
+        self,
+        db: Session,
+        *,
+        workflow: str,
+        project_id: uuid.UUID,
+        after_seq: int,
+        prev_hash: str,
+        full: bool,
+    ) -> ChainVerification:
+        """
+        Stream entries after `after_seq` and fold the hash chain.
+
+        - rows come through a server-side cursor in yield_per batches
+          (only seq, entry_hash, payload_json are selected)
+        - canonical JSON of large batches is built in the process pool,
+          ahead of the fold
+        - the SHA-256 fold itself stays sequential (each hash needs the previous)
+
+        At most ~2 × pool size batches are held in memory at once.
+        """
+        settings = get_settings()
+        max_in_flight = 2 * pool_size()
+
+        stmt = (
+            select(
+                ContractLedgerEntry.seq,
+                ContractLedgerEntry.entry_hash,
+                ContractLedgerEntry.payload_json,
+            )
+            .where(
+                ContractLedgerEntry.workflow == workflow,
+                ContractLedgerEntry.project_id == project_id,
+                ContractLedgerEntry.seq > after_seq,
+            )
+            .order_by(ContractLedgerEntry.seq.asc())
+            .execution_options(yield_per=settings.ledger_verify_batch_size)
+        )
+
+        pending: Deque[Tuple[List[Tuple[int, str]], Future | List[str]]] = deque()
+        last_seq = after_seq
+        checked = 0
+        broken: Optional[int] = None
+
+        def fold_oldest() -> None:
+            nonlocal prev_hash, last_seq, checked, broken
+            heads, canon = pending.popleft()
+            texts = canon.result() if isinstance(canon, Future) else canon
+            for (seq, entry_hash), text in zip(heads, texts):
+                h = hashlib.sha256()
+                h.update(prev_hash.encode("utf-8"))
+                h.update(text.encode("utf-8"))
+                checked += 1
+                if h.hexdigest() != entry_hash:
+                    broken = seq
+                    return
+                prev_hash = entry_hash
+                last_seq = seq
+
+        result = db.execute(stmt)
+        try:
+            for partition in result.partitions():
+                heads = [(r.seq, r.entry_hash) for r in partition]
+                payloads = [r.payload_json for r in partition]
+
+                if len(payloads) >= settings.ledger_verify_pool_min_batch:
+                    pending.append((heads, get_process_pool().submit(_canonical_json_many, payloads)))
+                else:
+                    pending.append((heads, _canonical_json_many(payloads)))
+
+                while len(pending) >= max_in_flight and broken is None:
+                    fold_oldest()
+                if broken is not None:
+                    break
+
+            while pending and broken is None:
+                fold_oldest()
+        finally:
+            for _, canon in pending:
+                if isinstance(canon, Future):
+                    canon.cancel()
+            result.close()
+
+        return ChainVerification(
+            valid=broken is None,
+            first_broken_seq=broken,
+            verified_through_seq=last_seq,
+            verified_through_hash=prev_hash,
+            entries_checked=checked,
+            full=full,
+        )
+
+    def verify_chain_report(
+        self,
+        db: Session,
+        *,
+        workflow: str,
+        project_id: uuid.UUID,
+        full: bool = False,
+    ) -> ChainVerification:
+        """
+        Verifies the hash chain and reports where it breaks.
         Used by auditors.
+
+        Default is incremental: start from the latest signed checkpoint and
+        hash only the entries after it. full=True re-verifies from genesis,
+        streaming the chain so memory stays bounded for any ledger length.
+        Either way, a ledger that no longer holds the checkpointed hash at
+        the checkpointed seq is reported broken (see _unanchored_report).
+        A successful run checkpoints the new tail and seals any newly full
+        Merkle batches (see LedgerMerkleService).
         """
-        entries = self.list_entries(db, workflow=workflow, project_id=project_id)
+        t0 = time.perf_counter()
+        after_seq, prev_hash = 0, self.GENESIS_HASH
+        checkpoint = self._latest_checkpoint(db, workflow=workflow, project_id=project_id)
 
-        prev_hash = self.GENESIS_HASH
+        if checkpoint is not None and checkpoint[2] != checkpoint[1]:
+            report = self._unanchored_report(
+                db, workflow=workflow, project_id=project_id, full=full
+            )
+        else:
+            if checkpoint is not None and not full:
+                after_seq, prev_hash = checkpoint[:2]
+            report = self._fold_chain(
+                db,
+                workflow=workflow,
+                project_id=project_id,
+                after_seq=after_seq,
+                prev_hash=prev_hash,
+                full=full,
+            )
 
-        for e in entries:
-            expected = _hash(prev_hash, e.payload_json)
-            if e.entry_hash != expected:
-                return False
-            prev_hash = e.entry_hash
+        LEDGER_VERIFY_SECONDS.observe(
+            time.perf_counter() - t0, mode="full" if full else "incremental"
+        )
+        if not report.valid:
+            LEDGER_VERIFY_FAILURES.inc()
+
+        if report.valid and report.verified_through_seq > after_seq:
+            # seal Merkle roots only over verified entries
+            LedgerMerkleService().seal_batches(
+                db,
+                workflow=workflow,
+                project_id=project_id,
+                through_seq=report.verified_through_seq,
+            )
+            self._record_checkpoint(
+                db,
+                workflow=workflow,
+                project_id=project_id,
+                seq=report.verified_through_seq,
+                entry_hash=report.verified_through_hash,
+            )
+
+        return report
 
-        return True
+    def verify_chain(
+        self,
+        db: Session,
+        *,
+        workflow: str,
+        project_id: uuid.UUID,
+        full: bool = False,
+    ) -> bool:
+        """
+        Boolean form of verify_chain_report.
+        """
+        return self.verify_chain_report(
+            db, workflow=workflow, project_id=project_id, full=full
+        ).valid
@@ -2,23 +2,126 @@
 from __future__ import annotations
 
 import uuid
-from typing import Optional, Tuple
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
 from decimal import Decimal
 
-from sqlalchemy import select, cast, Numeric, asc, desc
+from sqlalchemy import select, insert, asc, desc
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.round import Round
 from app.models.ask_bid import AskBid
 from app.models.quote_bid import QuoteBid
 from app.models.matching_result import MatchingResult
+from app.models.matching_result_pair import MatchingResultPair
 from app.models.subsidized_economic_model import SubsidizedEconomicModel
 from app.models.government_charge import GovernmentCharge
 from app.services.clearland_phase_service import ClearlandPhaseService
+from app.services.order_book_service import OrderBookService
 from app.core.clearland_phases import ClearlandPhaseType
+from app.core.metrics import MATCHING_COMPUTE_SECONDS, MATCHING_RUNS
+from app.core.round_events import MATCHING_COMPLETED, ROUND_EVENTS
+
+
+# Clearing modes:
+# - single: cheapest ask ↔ highest quote (one pair per round)
+# - book:   every crossing ask ↔ quote pair of the whole locked book
+#
+# Both modes price on the same basis: a quote bids qbundle_inr for one
+# bundle, i.e. one whole ask (all of its dcu_units), and crosses an ask
+# when qbundle_inr >= total_ask_inr. A book pair therefore fills its ask
+# completely; there are no partial fills. Asks without a total take part
+# in neither mode.
+MATCHING_MODE_SINGLE = "single"
+MATCHING_MODE_BOOK = "book"
+MATCHING_MODES = {MATCHING_MODE_SINGLE, MATCHING_MODE_BOOK}
+
+PRICE_BASIS = "quote qbundle_inr vs ask total_ask_inr"
+
+
+def matching_mode(match: MatchingResult) -> str:
+    """Clearing mode a stored result was computed with (older rows: single)."""
+    return (match.notes_json or {}).get("mode", MATCHING_MODE_SINGLE)
+
+
+@dataclass(frozen=True)
+class BookAsk:
+    id: uuid.UUID
+    total_ask_inr: Decimal
+    units: Decimal
+    unit_price_inr: Decimal
+
+
+@dataclass(frozen=True)
+class BookQuote:
+    id: uuid.UUID
+    qbundle_inr: Decimal
+
+
+@dataclass(frozen=True)
+class ClearedPair:
+    rank: int
+    ask_bid_id: uuid.UUID
+    quote_bid_id: uuid.UUID
+    units: Decimal
+    ask_total_inr: Decimal
+    ask_unit_price_inr: Decimal
+    quote_inr: Decimal
+
+
+def sort_book(
+    asks: Iterable[BookAsk], quotes: Iterable[BookQuote]
+) -> Tuple[List[BookAsk], List[BookQuote]]:
+    """
+    Asks by total asc, quotes by qbundle desc; tiebreak id asc on both
+    sides (same order as the single-pair SQL selects).
+    """
+    asks_sorted = sorted(asks, key=lambda a: (a.total_ask_inr, str(a.id)))
+    quotes_sorted = sorted(quotes, key=lambda q: (-q.qbundle_inr, str(q.id)))
+    return asks_sorted, quotes_sorted
+
+
+def clear_book(
+    asks: Iterable[BookAsk], quotes: Iterable[BookQuote]
+) -> List[ClearedPair]:
+    """
+    Whole-ask double-auction clearing.
+
+    The k-th highest quote takes the k-th cheapest ask while it still
+    crosses (qbundle_inr >= total_ask_inr). Rank 0 is the single-mode
+    pair, so both modes agree on whether a round matched.
+    O(n log n) for the sorts, O(n) for the sweep.
+    """
+    return clear_sorted_book(*sort_book(asks, quotes))
+
+
+def clear_sorted_book(
+    asks_sorted: List[BookAsk], quotes_sorted: List[BookQuote]
+) -> List[ClearedPair]:
+    """clear_book over input already in sort_book order (the sweep only)."""
+    pairs: List[ClearedPair] = []
+    for ask, q in zip(asks_sorted, quotes_sorted):
+        if q.qbundle_inr < ask.total_ask_inr:
+            break
+        pairs.append(
+            ClearedPair(
+                rank=len(pairs),
+                ask_bid_id=ask.id,
+                quote_bid_id=q.id,
+                units=ask.units,
+                ask_total_inr=ask.total_ask_inr,
+                ask_unit_price_inr=ask.unit_price_inr,
+                quote_inr=q.qbundle_inr,
+            )
+        )
+    return pairs
 
 
 class MatchingService:
+    def __init__(self):
+        self.books = OrderBookService()
+
     def _get_round(
         self, db: Session, workflow: str, project_id: uuid.UUID, t: int
     ) -> Optional[Round]:
@@ -30,16 +133,18 @@ class MatchingService:
             )
         ).scalar_one_or_none()
 
+    @staticmethod
+    def _existing_stmt(workflow: str, project_id: uuid.UUID, t: int):
+        return select(MatchingResult).where(
+            MatchingResult.workflow == workflow,
+            MatchingResult.project_id == project_id,
+            MatchingResult.t == t,
+        )
+
     def _get_existing(
         self, db: Session, workflow: str, project_id: uuid.UUID, t: int
     ) -> Optional[MatchingResult]:
-        return db.execute(
-            select(MatchingResult).where(
-                MatchingResult.workflow == workflow,
-                MatchingResult.project_id == project_id,
-                MatchingResult.t == t,
-            )
-        ).scalar_one_or_none()
+        return db.execute(self._existing_stmt(workflow, project_id, t)).scalar_one_or_none()
 
     # -------------------------
     # SALEABLE / SLUM HELPERS
@@ -47,6 +152,11 @@ class MatchingService:
     def _select_min_ask(
         self, db: Session, workflow: str, project_id: uuid.UUID, t: int
     ) -> Optional[Tuple[uuid.UUID, Decimal]]:
+        book = self.books.get_snapshot(db, workflow, project_id, t)
+        if book is not None:
+            ranked = OrderBookService.ranked_asks(book)
+            return ranked[0] if ranked else None
+
         row = db.execute(
             select(AskBid.id, AskBid.total_ask_inr)
             .where(
@@ -66,17 +176,22 @@ class MatchingService:
     def _select_max_quote(
         self, db: Session, workflow: str, project_id: uuid.UUID, t: int
     ) -> Optional[Tuple[uuid.UUID, Decimal]]:
-        qbundle_num = cast(QuoteBid.payload_json["qbundle_inr"].astext, Numeric(20, 2))
+        book = self.books.get_snapshot(db, workflow, project_id, t)
+        if book is not None:
+            ranked = OrderBookService.ranked_quotes(book)
+            return ranked[0] if ranked else None
+
+        # index-only top-1 via ix_quote_bid_rank
         row = db.execute(
-            select(QuoteBid.id, qbundle_num)
+            select(QuoteBid.id, QuoteBid.qbundle_inr)
             .where(
                 QuoteBid.workflow == workflow,
                 QuoteBid.project_id == project_id,
                 QuoteBid.t == t,
                 QuoteBid.state == "locked",
-                QuoteBid.payload_json.has_key("qbundle_inr"),
+                QuoteBid.qbundle_inr.is_not(None),
             )
-            .order_by(desc(qbundle_num), asc(QuoteBid.id))
+            .order_by(desc(QuoteBid.qbundle_inr), asc(QuoteBid.id))
             .limit(1)
         ).one_or_none()
         if not row:
@@ -126,6 +241,15 @@ class MatchingService:
         t: int,
         gcu: Decimal,
     ) -> Optional[Tuple[uuid.UUID, Decimal]]:
+        # GCU is constant per round, so ask rank == effective-cost rank
+        book = self.books.get_snapshot(db, "subsidized", project_id, t)
+        if book is not None:
+            ranked = OrderBookService.ranked_asks(book)
+            if not ranked:
+                return None
+            ask_id, total = ranked[0]
+            return ask_id, total + gcu
+
         effective_cost = AskBid.total_ask_inr + gcu
 
         row = db.execute(
@@ -145,6 +269,191 @@ class MatchingService:
             return None
         return row[0], row[1]
 
+    # -------------------------
+    # BOOK CLEARING HELPERS
+    # -------------------------
+    def _load_book(
+        self, db: Session, workflow: str, project_id: uuid.UUID, t: int
+    ) -> Tuple[List[BookAsk], List[BookQuote]]:
+        """
+        Load the full locked book in two reads (no ORDER BY; sorted in memory).
+        Only asks with a total take part (as in single mode). An ask without
+        dcu_units counts as one unit; its unit price (ask_price_per_unit_inr,
+        else total / units) is carried for the pair record only.
+        """
+        book = self.books.get_snapshot(db, workflow, project_id, t)
+        if book is not None:
+            ask_rows = [
+                (a["id"], a["dcu_units"], a["ask_price_per_unit_inr"], a["total_ask_inr"])
+                for a in OrderBookService.ask_entries(book)
+            ]
+        else:
+            ask_rows = db.execute(
+                select(
+                    AskBid.id,
+                    AskBid.dcu_units,
+                    AskBid.ask_price_per_unit_inr,
+                    AskBid.total_ask_inr,
+                ).where(
+                    AskBid.workflow == workflow,
+                    AskBid.project_id == project_id,
+                    AskBid.t == t,
+                    AskBid.state == "locked",
+                )
+            ).all()
+
+        asks: List[BookAsk] = []
+        for ask_id, dcu_units, ppu, total in ask_rows:
+            if total is None:
+                continue
+            total_dec = Decimal(str(total))
+            units = Decimal(str(dcu_units)) if dcu_units else Decimal("1")
+            asks.append(
+                BookAsk(
+                    id=ask_id,
+                    total_ask_inr=total_dec,
+                    units=units,
+                    unit_price_inr=Decimal(str(ppu)) if ppu is not None else total_dec / units,
+                )
+            )
+
+        if book is not None:
+            quotes = [
+                BookQuote(id=quote_id, qbundle_inr=price)
+                for quote_id, price in OrderBookService.ranked_quotes(book)
+            ]
+            return asks, quotes
+
+        quotes = [
+            BookQuote(id=quote_id, qbundle_inr=Decimal(str(price)))
+            for quote_id, price in db.execute(
+                select(QuoteBid.id, QuoteBid.qbundle_inr).where(
+                    QuoteBid.workflow == workflow,
+                    QuoteBid.project_id == project_id,
+                    QuoteBid.t == t,
+                    QuoteBid.state == "locked",
+                    QuoteBid.qbundle_inr.is_not(None),
+                )
+            )
+        ]
+        return asks, quotes
+
+    def _clear_book_and_store(
+        self,
+        db: Session,
+        *,
+        rnd: Round,
+        workflow: str,
+        project_id: uuid.UUID,
+        t: int,
+    ) -> MatchingResult:
+        if workflow == "subsidized":
+            raise ValueError("Book clearing is not available for subsidized workflow.")
+
+        asks, quotes = self._load_book(db, workflow, project_id, t)
+        asks_sorted, quotes_sorted = sort_book(asks, quotes)
+        pairs = clear_sorted_book(asks_sorted, quotes_sorted)
+
+        notes = {
+            "rule": "k-th max(Quote.qbundle_inr) ↔ k-th min(Ask.total_ask_inr) while crossing",
+            "mode": MATCHING_MODE_BOOK,
+            "price_basis": PRICE_BASIS,
+            "fill": "whole ask per quote (all dcu_units), no partial fills",
+            "tiebreak": "id asc",
+            "locked_asks": len(asks_sorted),
+            "locked_quotes": len(quotes_sorted),
+            "pairs_count": len(pairs),
+            "units_cleared": str(sum((p.units for p in pairs), Decimal("0"))),
+        }
+
+        # rank 0 of the book is the single-mode pair: the header holds it
+        best_ask = asks_sorted[0] if asks_sorted else None
+        best_quote = quotes_sorted[0] if quotes_sorted else None
+
+        if not best_ask:
+            notes["reason"] = "no_locked_asks_with_total"
+        if not best_quote:
+            notes["reason_quote"] = "no_locked_quotes_with_qbundle"
+        if best_ask and best_quote and not pairs:
+            notes["reason_cross"] = "best_quote_below_min_ask_total"
+
+        row = MatchingResult(
+            id=uuid.uuid4(),
+            workflow=workflow,
+            project_id=project_id,
+            round_id=rnd.id,
+            t=t,
+            status="computed",
+            matched=bool(pairs),
+            selected_ask_bid_id=best_ask.id if best_ask else None,
+            selected_quote_bid_id=best_quote.id if best_quote else None,
+            min_ask_total_inr=best_ask.total_ask_inr if best_ask else None,
+            max_quote_inr=best_quote.qbundle_inr if best_quote else None,
+            notes_json=notes,
+        )
+        db.add(row)
+        db.flush()
+
+        if pairs:
+            db.execute(
+                insert(MatchingResultPair),
+                [
+                    {
+                        "id": uuid.uuid4(),
+                        "matching_result_id": row.id,
+                        "workflow": workflow,
+                        "project_id": project_id,
+                        "t": t,
+                        "rank": p.rank,
+                        "ask_bid_id": p.ask_bid_id,
+                        "quote_bid_id": p.quote_bid_id,
+                        "units": p.units,
+                        "ask_total_inr": p.ask_total_inr,
+                        "ask_unit_price_inr": p.ask_unit_price_inr,
+                        "quote_inr": p.quote_inr,
+                    }
+                    for p in pairs
+                ],
+            )
+
+        db.commit()
+        db.refresh(row)
+        return row
+
+    @staticmethod
+    def _pairs_stmt(matching_result_id: uuid.UUID):
+        return (
+            select(MatchingResultPair)
+            .where(MatchingResultPair.matching_result_id == matching_result_id)
+            .order_by(asc(MatchingResultPair.rank))
+        )
+
+    def list_pairs(
+        self, db: Session, *, matching_result_id: uuid.UUID
+    ) -> List[MatchingResultPair]:
+        return list(db.execute(self._pairs_stmt(matching_result_id)).scalars().all())
+
+    def _ensure_clearland_phase_allows_matching(
+        self, db: Session, workflow: str, project_id: uuid.UUID
+    ) -> None:
+        # 🔐 CLEARLAND PHASE GUARD (NO-OP FOR OTHERS)
+        if workflow != "clearland":
+            return
+
+        phase = ClearlandPhaseService().get_current_phase(
+            db, project_id=project_id
+        )
+        if not phase:
+            raise ValueError("Clearland phase not initialized.")
+
+        if phase.phase not in {
+            ClearlandPhaseType.LOCKED.value,
+            ClearlandPhaseType.COMPLETED.value,
+        }:
+            raise ValueError(
+                f"Matching not allowed during clearland phase {phase.phase}."
+            )
+
     # -------------------------
     # MAIN ENTRY
     # -------------------------
@@ -155,23 +464,72 @@ class MatchingService:
         workflow: str,
         project_id: uuid.UUID,
         t: int,
+        mode: Optional[str] = None,
+        rnd: Optional[Round] = None,
     ) -> MatchingResult:
+        """
+        mode: None returns the stored result whatever its mode (computing
+        single when there is none); an explicit mode must match the stored
+        one, else ValueError ("already matched in ... mode").
+        rnd: the round, when the caller already loaded it (saves a lookup).
+        """
+        if mode is not None and mode not in MATCHING_MODES:
+            raise ValueError(f"Unknown matching mode: {mode}.")
+
         existing = self._get_existing(db, workflow, project_id, t)
         if existing:
+            self._check_mode(existing, mode)
+            MATCHING_RUNS.inc(workflow=workflow, outcome="stored")
             return existing
 
-        rnd = self._get_round(db, workflow, project_id, t)
+        mode = mode or MATCHING_MODE_SINGLE
+        with MATCHING_COMPUTE_SECONDS.time(workflow=workflow, mode=mode):
+            row = self._compute_and_store(
+                db, workflow=workflow, project_id=project_id, t=t, mode=mode, rnd=rnd
+            )
+        MATCHING_RUNS.inc(workflow=workflow, outcome="computed")
+        ROUND_EVENTS.publish(
+            workflow, project_id, MATCHING_COMPLETED, t=t, status=row.status, matched=bool(row.matched)
+        )
+        return row
+
+    @staticmethod
+    def _check_mode(existing: MatchingResult, mode: Optional[str]) -> None:
+        stored = matching_mode(existing)
+        if mode is not None and mode != stored:
+            raise ValueError(f"Round already matched in {stored} mode.")
+
+    def _compute_and_store(
+        self,
+        db: Session,
+        *,
+        workflow: str,
+        project_id: uuid.UUID,
+        t: int,
+        mode: str,
+        rnd: Optional[Round] = None,
+    ) -> MatchingResult:
+        if rnd is None:
+            rnd = self._get_round(db, workflow, project_id, t)
         if not rnd:
             raise ValueError("Round not found.")
         if not rnd.is_locked:
             raise ValueError("Matching can be triggered only after round lock.")
 
+        if mode == MATCHING_MODE_BOOK:
+            self._ensure_clearland_phase_allows_matching(db, workflow, project_id)
+            return self._clear_book_and_store(
+                db, rnd=rnd, workflow=workflow, project_id=project_id, t=t
+            )
+
         matched = False
         selected_ask_id = None
         selected_quote_id = None
         min_ask_val = None
         max_quote_val = None
 
+        self._ensure_clearland_phase_allows_matching(db, workflow, project_id)
+
         # -------------------------
         # SUBSIDIZED LOGIC (BOOK)
         # -------------------------
@@ -185,6 +543,8 @@ class MatchingService:
 
             notes = {
                 "rule": "min(Ask.total_ask_inr + GCU) ↔ max(Quote.qbundle_inr)",
+                "mode": MATCHING_MODE_SINGLE,
+                "price_basis": f"{PRICE_BASIS} + gcu",
                 "gcu": str(gcu),
                 "objective": "minimize(DCU + GCU)",
             }
@@ -203,33 +563,6 @@ class MatchingService:
                 matched = Decimal(str(max_quote_val)) >= Decimal(str(min_ask_val))
                 notes["condition"] = "max_quote_inr >= (ask + gcu)"
 
-        
-        # 🔐 CLEARLAND PHASE GUARD (NO-OP FOR OTHERS)
-        if workflow == "clearland":
-            phase = ClearlandPhaseService().get_current_phase(
-                db, project_id=project_id
-            )
-            if not phase:
-                raise ValueError("Clearland phase not initialized.")
-
-            if phase.phase not in {
-                ClearlandPhaseType.LOCKED.value,
-                ClearlandPhaseType.COMPLETED.value,
-            }:
-                raise ValueError(
-                    f"Matching not allowed during clearland phase {phase.phase}."
-                )
-
-        existing = self._get_existing(db, workflow, project_id, t)
-        if existing:
-            return existing
-
-        rnd = self._get_round(db, workflow, project_id, t)
-        if not rnd:
-            raise ValueError("Round not found.")
-        if not rnd.is_locked:
-            raise ValueError("Matching can be triggered only after round lock.")
-
         # -------------------------
         # DEFAULT LOGIC (SALEABLE / SLUM)
         # -------------------------
@@ -243,6 +576,8 @@ class MatchingService:
 
             notes = {
                 "rule": "min(Ask.total_ask_inr) ↔ max(Quote.qbundle_inr)",
+                "mode": MATCHING_MODE_SINGLE,
+                "price_basis": PRICE_BASIS,
                 "tiebreak": "id asc",
             }
 
@@ -278,3 +613,43 @@ class MatchingService:
         db.commit()
         db.refresh(row)
         return row
+
+    # -------------------------
+    # ASYNC (AsyncSession)
+    # -------------------------
+    # Results are written once per round, so reads are native async and
+    # only a first computation falls back to the sync engine via run_sync.
+
+    async def get_existing_async(
+        self, db: AsyncSession, workflow: str, project_id: uuid.UUID, t: int
+    ) -> Optional[MatchingResult]:
+        return (await db.execute(self._existing_stmt(workflow, project_id, t))).scalar_one_or_none()
+
+    async def list_pairs_async(
+        self, db: AsyncSession, *, matching_result_id: uuid.UUID
+    ) -> List[MatchingResultPair]:
+        return list((await db.execute(self._pairs_stmt(matching_result_id))).scalars().all())
+
+    async def compute_and_store_if_needed_async(
+        self,
+        db: AsyncSession,
+        *,
+        workflow: str,
+        project_id: uuid.UUID,
+        t: int,
+        mode: Optional[str] = None,
+    ) -> MatchingResult:
+        if mode is not None and mode not in MATCHING_MODES:
+            raise ValueError(f"Unknown matching mode: {mode}.")
+
+        existing = await self.get_existing_async(db, workflow, project_id, t)
+        if existing:
+            self._check_mode(existing, mode)
+            MATCHING_RUNS.inc(workflow=workflow, outcome="stored")
+            return existing
+
+        return await db.run_sync(
+            lambda s: self.compute_and_store_if_needed(
+                s, workflow=workflow, project_id=project_id, t=t, mode=mode
+            )
+        )
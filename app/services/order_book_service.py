@@ -0,0 +1,192 @@
+# app/services/order_book_service.py
+from __future__ import annotations
+
+import uuid
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select, func, asc, desc
+from sqlalchemy.orm import Session
+
+from app.models.round import Round
+from app.models.quote_bid import QuoteBid
+from app.models.ask_bid import AskBid
+from app.models.preference_bid import PreferenceBid
+from app.models.round_order_book import RoundOrderBook
+
+
+def _s(x) -> Optional[str]:
+    return str(x) if x is not None else None
+
+
+def _d(x) -> Optional[Decimal]:
+    return Decimal(str(x)) if x is not None else None
+
+
+class OrderBookService:
+    """
+    Ranked order book of a locked round.
+
+    Bids are immutable once locked, so the book is ranked once at lock time
+    and every downstream engine (matching, settlement, compensatory flows,
+    diagnostics) reads ranks instead of re-sorting quote_bids / ask_bids.
+
+    Rounds locked before snapshots existed have no row; callers fall back
+    to their SQL selects in that case.
+    """
+
+    def __init__(self):
+        # snapshots never change -> safe to memoize per service instance
+        self._books: Dict[Tuple[str, uuid.UUID, int], Optional[RoundOrderBook]] = {}
+
+    # ─────────────────────────────────────────────
+    # WRITE (called from bid locking, inside its transaction)
+    # ─────────────────────────────────────────────
+
+    def build_snapshot(self, db: Session, *, rnd: Round) -> RoundOrderBook:
+        """
+        Rank the locked book of `rnd` and stage the snapshot row.
+        Caller commits (same transaction as the bid lock).
+
+        Idempotent: the bids commit before the round is flagged locked, so a
+        lock retried after a failure in between finds the snapshot already
+        there (the bids it ranked are frozen) and gets that row back.
+        """
+        existing = self.get_snapshot(db, rnd.workflow, rnd.project_id, rnd.t)
+        if existing is not None:
+            return existing
+
+        quote_rows = db.execute(
+            select(
+                QuoteBid.id,
+                QuoteBid.qbundle_inr,
+                QuoteBid.signature_hash,
+            )
+            .where(
+                QuoteBid.workflow == rnd.workflow,
+                QuoteBid.project_id == rnd.project_id,
+                QuoteBid.t == rnd.t,
+                QuoteBid.state == "locked",
+            )
+            .order_by(desc(QuoteBid.qbundle_inr).nulls_last(), asc(QuoteBid.id))
+        ).all()
+
+        ask_rows = db.execute(
+            select(
+                AskBid.id,
+                AskBid.total_ask_inr,
+                AskBid.dcu_units,
+                AskBid.ask_price_per_unit_inr,
+                AskBid.signature_hash,
+            )
+            .where(
+                AskBid.workflow == rnd.workflow,
+                AskBid.project_id == rnd.project_id,
+                AskBid.t == rnd.t,
+                AskBid.state == "locked",
+            )
+            .order_by(asc(AskBid.total_ask_inr).nulls_last(), asc(AskBid.id))
+        ).all()
+
+        pref_cnt = db.execute(
+            select(func.count())
+            .select_from(PreferenceBid)
+            .where(
+                PreferenceBid.workflow == rnd.workflow,
+                PreferenceBid.project_id == rnd.project_id,
+                PreferenceBid.t == rnd.t,
+                PreferenceBid.state == "locked",
+            )
+        ).scalar_one()
+
+        book = RoundOrderBook(
+            workflow=rnd.workflow,
+            project_id=rnd.project_id,
+            round_id=rnd.id,
+            t=rnd.t,
+            quotes_json=[
+                {"id": str(quote_id), "qbundle_inr": str(price), "signature_hash": sig}
+                for quote_id, price, sig in quote_rows
+                if price is not None
+            ],
+            asks_json=[
+                {
+                    "id": str(ask_id),
+                    "total_ask_inr": _s(total),
+                    "dcu_units": _s(units),
+                    "ask_price_per_unit_inr": _s(ppu),
+                    "signature_hash": sig,
+                }
+                for ask_id, total, units, ppu, sig in ask_rows
+            ],
+            locked_quote_count=len(quote_rows),
+            locked_ask_count=len(ask_rows),
+            locked_preference_count=int(pref_cnt or 0),
+        )
+        db.add(book)
+        self._books[(rnd.workflow, rnd.project_id, rnd.t)] = book
+        return book
+
+    # ─────────────────────────────────────────────
+    # READ
+    # ─────────────────────────────────────────────
+
+    def get_snapshot(
+        self, db: Session, workflow: str, project_id: uuid.UUID, t: int
+    ) -> Optional[RoundOrderBook]:
+        key = (workflow, project_id, t)
+        if key not in self._books:
+            self._books[key] = db.execute(
+                select(RoundOrderBook).where(
+                    RoundOrderBook.workflow == workflow,
+                    RoundOrderBook.project_id == project_id,
+                    RoundOrderBook.t == t,
+                )
+            ).scalar_one_or_none()
+        return self._books[key]
+
+    @staticmethod
+    def ranked_quotes(
+        book: RoundOrderBook, exclude: Iterable[uuid.UUID] = ()
+    ) -> List[Tuple[uuid.UUID, Decimal]]:
+        """(quote id, qbundle) ordered qbundle desc, id asc."""
+        skip = {str(x) for x in exclude}
+        return [
+            (uuid.UUID(q["id"]), Decimal(q["qbundle_inr"]))
+            for q in (book.quotes_json or [])
+            if q["id"] not in skip
+        ]
+
+    @staticmethod
+    def ranked_asks(
+        book: RoundOrderBook, exclude: Iterable[uuid.UUID] = ()
+    ) -> List[Tuple[uuid.UUID, Decimal]]:
+        """(ask id, total_ask_inr) ordered total asc, id asc; asks without a total are skipped."""
+        skip = {str(x) for x in exclude}
+        return [
+            (uuid.UUID(a["id"]), Decimal(a["total_ask_inr"]))
+            for a in (book.asks_json or [])
+            if a.get("total_ask_inr") is not None and a["id"] not in skip
+        ]
+
+    @staticmethod
+    def ask_entries(book: RoundOrderBook) -> List[Dict[str, Any]]:
+        """Raw ask entries with Decimal fields (for multi-unit clearing)."""
+        return [
+            {
+                "id": uuid.UUID(a["id"]),
+                "total_ask_inr": _d(a.get("total_ask_inr")),
+                "dcu_units": _d(a.get("dcu_units")),
+                "ask_price_per_unit_inr": _d(a.get("ask_price_per_unit_inr")),
+                "signature_hash": a.get("signature_hash"),
+            }
+            for a in (book.asks_json or [])
+        ]
+
+    @staticmethod
+    def quote_signature(book: RoundOrderBook, quote_id: uuid.UUID) -> Optional[str]:
+        key = str(quote_id)
+        for q in book.quotes_json or []:
+            if q["id"] == key:
+                return q.get("signature_hash")
+        return None
@@ -6,6 +6,7 @@ from typing import Any, Dict, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import select, desc
 
+from app.core.artifact_cache import ARTIFACT_CACHE, PARAMS_SNAPSHOT
 from app.models.project import Project
 from app.models.round import Round
 from app.models.unit_inventory import UnitInventory
@@ -31,39 +32,81 @@ class ParamsService:
         project_uuid,
         published_by_participant_id: Optional[str] = None,
     ) -> Tuple[ParameterSnapshot, ParameterSnapshot]:
-        # Get t=0 snapshot if present
-        t0 = db.execute(
-            select(ParameterSnapshot)
-            .where(ParameterSnapshot.workflow == workflow, ParameterSnapshot.project_id == project_uuid, ParameterSnapshot.t == 0)
-        ).scalar_one_or_none()
+        current_t = self._current_t(db, workflow, project_uuid)
+        t0 = self._get_or_create_snapshot(db, workflow, project_uuid, 0, published_by_participant_id)
+        if current_t == 0:
+            return t0, t0
+        current = self._get_or_create_snapshot(db, workflow, project_uuid, current_t, published_by_participant_id)
+        return t0, current
 
-        # Find current round = highest t
-        current_round = db.execute(
-            select(Round)
+    def get_or_create_snapshot_payloads(
+        self,
+        db: Session,
+        workflow: str,
+        project_uuid,
+        published_by_participant_id: Optional[str] = None,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        (t=0 payload, current-round payload). Snapshots are published once
+        per round, so payloads are served from ARTIFACT_CACHE; only the
+        current round number is read from the DB on a hit. The t=0 snapshot
+        stays editable until the project is published (PUT
+        /saleable/projects/{id}), so it is read from the DB until then.
+        """
+        current_t = self._current_t(db, workflow, project_uuid)
+
+        def payload(t: int) -> Dict[str, Any]:
+            if t == 0 and not self._published(db, project_uuid):
+                return self._get_or_create_snapshot(
+                    db, workflow, project_uuid, 0, published_by_participant_id
+                ).payload_json
+            return ARTIFACT_CACHE.get_or_load(
+                workflow,
+                project_uuid,
+                t,
+                PARAMS_SNAPSHOT,
+                lambda: self._get_or_create_snapshot(
+                    db, workflow, project_uuid, t, published_by_participant_id
+                ).payload_json,
+            )
+
+        t0 = payload(0)
+        return t0, (t0 if current_t == 0 else payload(current_t))
+
+    @staticmethod
+    def _published(db: Session, project_uuid) -> bool:
+        return bool(
+            db.execute(select(Project.is_published).where(Project.id == project_uuid)).scalar_one_or_none()
+        )
+
+    @staticmethod
+    def _current_t(db: Session, workflow: str, project_uuid) -> int:
+        # current round = highest t
+        current_t = db.execute(
+            select(Round.t)
             .where(Round.workflow == workflow, Round.project_id == project_uuid)
             .order_by(desc(Round.t))
+            .limit(1)
         ).scalar_one_or_none()
+        return current_t if current_t is not None else 0
 
-        current_t = current_round.t if current_round else 0
-
-        current = db.execute(
+    def _get_or_create_snapshot(
+        self,
+        db: Session,
+        workflow: str,
+        project_uuid,
+        t: int,
+        published_by_participant_id: Optional[str],
+    ) -> ParameterSnapshot:
+        snap = db.execute(
             select(ParameterSnapshot)
-            .where(ParameterSnapshot.workflow == workflow, ParameterSnapshot.project_id == project_uuid, ParameterSnapshot.t == current_t)
+            .where(ParameterSnapshot.workflow == workflow, ParameterSnapshot.project_id == project_uuid, ParameterSnapshot.t == t)
         ).scalar_one_or_none()
-
-        if not t0:
-            t0 = self._create_snapshot_from_state(db, workflow, project_uuid, t=0, published_by_participant_id=published_by_participant_id)
-
-        if not current:
-            current = self._create_snapshot_from_state(
-                db,
-                workflow,
-                project_uuid,
-                t=current_t,
-                published_by_participant_id=published_by_participant_id,
-            )
-
-        return t0, current
+        if snap:
+            return snap
+        return self._create_snapshot_from_state(
+            db, workflow, project_uuid, t=t, published_by_participant_id=published_by_participant_id
+        )
 
     def _create_snapshot_from_state(
         self,
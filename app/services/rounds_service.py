@@ -6,9 +6,11 @@ import uuid
 from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, asc
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.round_events import ROUND_CLOSED, ROUND_EVENTS, ROUND_LOCKED, ROUND_OPENED
 from app.models.round import Round
 from app.models.enums import RoundState
 from app.services.bids_service import BidService
@@ -22,6 +24,29 @@ def _now():
     return datetime.now(timezone.utc)
 
 
+def _round_state(r: Round) -> str:
+    if r.is_locked:
+        return "locked"
+    if r.is_open:
+        return "open"
+    if r.state == RoundState.submitted.value:
+        return "closed"
+    return "new"
+
+
+def _publish(event_type: str, r: Round, **extra) -> None:
+    ROUND_EVENTS.publish(
+        r.workflow,
+        r.project_id,
+        event_type,
+        t=r.t,
+        state=_round_state(r),
+        is_open=bool(r.is_open),
+        is_locked=bool(r.is_locked),
+        **extra,
+    )
+
+
 class RoundService:
     # ---------------------------
     # READS
@@ -36,17 +61,45 @@ class RoundService:
         """
         Returns the latest round (highest t) or None.
         """
+        return db.execute(self._current_round_stmt(workflow, project_id)).scalars().first()
+
+    @staticmethod
+    def _current_round_stmt(workflow: str, project_id: uuid.UUID):
         return (
-            db.execute(
-                select(Round)
-                .where(
-                    Round.workflow == workflow,
-                    Round.project_id == project_id,
-                )
-                .order_by(desc(Round.t))
+            select(Round)
+            .where(
+                Round.workflow == workflow,
+                Round.project_id == project_id,
             )
-            .scalars()
-            .first()
+            .order_by(desc(Round.t))
+            .limit(1)
+        )
+
+    async def get_current_round_async(
+        self,
+        db: AsyncSession,
+        workflow: str,
+        project_id: uuid.UUID,
+    ) -> Optional[Round]:
+        return (await db.execute(self._current_round_stmt(workflow, project_id))).scalars().first()
+
+    async def list_rounds_async(
+        self,
+        db: AsyncSession,
+        workflow: str,
+        project_id: uuid.UUID,
+    ) -> list[Round]:
+        return list(
+            (
+                await db.execute(
+                    select(Round)
+                    .where(
+                        Round.workflow == workflow,
+                        Round.project_id == project_id,
+                    )
+                    .order_by(asc(Round.t))
+                )
+            ).scalars().all()
         )
 
     def get_round_for_update(
@@ -154,6 +207,7 @@ class RoundService:
             db.add(r)
             db.commit()
             db.refresh(r)
+            _publish(ROUND_OPENED, r)
             return r
 
         # ───────────────────────────────
@@ -171,6 +225,7 @@ class RoundService:
             latest.updated_at = _now()
             db.commit()
             db.refresh(latest)
+            _publish(ROUND_OPENED, latest)
             return latest
 
         # ───────────────────────────────
@@ -197,6 +252,7 @@ class RoundService:
         db.add(r)
         db.commit()
         db.refresh(r)
+        _publish(ROUND_OPENED, r)
         return r
 
     def close_round(
@@ -221,6 +277,7 @@ class RoundService:
 
         db.commit()
         db.refresh(rnd)
+        _publish(ROUND_CLOSED, rnd)
         return rnd
 
     def lock_round(
@@ -247,7 +304,7 @@ class RoundService:
             raise ValueError("Round must be closed before locking.")
 
         # 🔒 LOCK ALL BIDS FIRST (CRITICAL)
-        BidService().lock_all_bids_for_round(
+        locked = BidService().lock_all_bids_for_round(
             db,
             workflow=workflow,
             project_id=project_id,
@@ -262,4 +319,6 @@ class RoundService:
 
         db.commit()
         db.refresh(rnd)
+        # bid counts only: what was bid stays sealed
+        _publish(ROUND_LOCKED, rnd, locked_bids=locked)
         return rnd
@@ -5,18 +5,22 @@ import uuid
 from typing import Optional, Tuple, Dict, Any
 from decimal import Decimal
 
-from sqlalchemy import select, cast, Numeric, desc, asc
+from sqlalchemy import select, desc, asc, true
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.metrics import SETTLEMENT_COMPUTE_SECONDS, SETTLEMENT_RUNS
+from app.core.round_events import ROUND_EVENTS, SETTLEMENT_COMPLETED
 from app.models.round import Round
 from app.models.matching_result import MatchingResult
 from app.models.quote_bid import QuoteBid
 from app.models.ask_bid import AskBid
 from app.models.settlement_result import SettlementResult
-from app.models.tokenized_contract import TokenizedContractRecord  # ✅ NEW
 
-from app.services.matching_service import MatchingService
+from app.services.matching_service import MATCHING_MODE_BOOK, MatchingService, matching_mode
+from app.services.contract_service import ContractService
 from app.services.ledger_service import LedgerService
+from app.services.order_book_service import OrderBookService
 
 
 class SettlementService:
@@ -25,6 +29,9 @@ class SettlementService:
     to the immutable contract ledger.
     """
 
+    def __init__(self):
+        self.books = OrderBookService()
+
     # ─────────────────────────────────────────────
     # Internal helpers
     # ─────────────────────────────────────────────
@@ -44,6 +51,14 @@ class SettlementService:
             )
         ).scalar_one_or_none()
 
+    @staticmethod
+    def _existing_stmt(workflow: str, project_id: uuid.UUID, t: int):
+        return select(SettlementResult).where(
+            SettlementResult.workflow == workflow,
+            SettlementResult.project_id == project_id,
+            SettlementResult.t == t,
+        )
+
     def _get_existing(
         self,
         db: Session,
@@ -51,26 +66,21 @@ class SettlementService:
         project_id: uuid.UUID,
         t: int,
     ) -> Optional[SettlementResult]:
-        return db.execute(
-            select(SettlementResult).where(
-                SettlementResult.workflow == workflow,
-                SettlementResult.project_id == project_id,
-                SettlementResult.t == t,
-            )
-        ).scalar_one_or_none()
+        return db.execute(self._existing_stmt(workflow, project_id, t)).scalar_one_or_none()
 
     def _get_matching(
         self,
         db: Session,
-        workflow: str,
-        project_id: uuid.UUID,
-        t: int,
+        rnd: Round,
     ) -> MatchingResult:
-        return MatchingService().compute_and_store_if_needed(
+        match_svc = MatchingService()
+        match_svc.books = self.books  # share the memoized snapshot
+        return match_svc.compute_and_store_if_needed(
             db,
-            workflow=workflow,
-            project_id=project_id,
-            t=t,
+            workflow=rnd.workflow,
+            project_id=rnd.project_id,
+            t=rnd.t,
+            rnd=rnd,
         )
 
     def _second_highest_quote(
@@ -81,22 +91,22 @@ class SettlementService:
         t: int,
         winner_quote_id: uuid.UUID,
     ) -> Optional[Tuple[uuid.UUID, Decimal]]:
-        qbundle_num = cast(
-            QuoteBid.payload_json["qbundle_inr"].astext,
-            Numeric(20, 2),
-        )
+        book = self.books.get_snapshot(db, workflow, project_id, t)
+        if book is not None:
+            ranked = OrderBookService.ranked_quotes(book, exclude=(winner_quote_id,))
+            return ranked[0] if ranked else None
 
         row = db.execute(
-            select(QuoteBid.id, qbundle_num)
+            select(QuoteBid.id, QuoteBid.qbundle_inr)
             .where(
                 QuoteBid.workflow == workflow,
                 QuoteBid.project_id == project_id,
                 QuoteBid.t == t,
                 QuoteBid.state == "locked",
-                QuoteBid.payload_json.has_key("qbundle_inr"),
+                QuoteBid.qbundle_inr.is_not(None),
                 QuoteBid.id != winner_quote_id,
             )
-            .order_by(desc(qbundle_num), asc(QuoteBid.id))
+            .order_by(desc(QuoteBid.qbundle_inr), asc(QuoteBid.id))
             .limit(1)
         ).one_or_none()
 
@@ -125,15 +135,38 @@ class SettlementService:
         # Idempotency
         existing = self._get_existing(db, workflow, project_id, t)
         if existing:
+            SETTLEMENT_RUNS.inc(workflow=workflow, outcome="stored")
             return existing
 
+        with SETTLEMENT_COMPUTE_SECONDS.time(workflow=workflow):
+            row = self._compute_and_store(db, workflow=workflow, project_id=project_id, t=t)
+        SETTLEMENT_RUNS.inc(workflow=workflow, outcome="computed")
+        # settled is stored as 'true' / 'false'
+        settled = row.settled == "true" if isinstance(row.settled, str) else bool(row.settled)
+        ROUND_EVENTS.publish(workflow, project_id, SETTLEMENT_COMPLETED, t=t, status=row.status, settled=settled)
+        return row
+
+    def _compute_and_store(
+        self,
+        db: Session,
+        *,
+        workflow: str,
+        project_id: uuid.UUID,
+        t: int,
+    ) -> SettlementResult:
         rnd = self._get_round(db, workflow, project_id, t)
         if not rnd:
             raise ValueError("Round not found.")
         if not rnd.is_locked:
             raise ValueError("Settlement can be computed only after round lock.")
 
-        match = self._get_matching(db, workflow, project_id, t)
+        match = self._get_matching(db, rnd)
+        if matching_mode(match) == MATCHING_MODE_BOOK:
+            # a book header names only the best ask/quote of many cleared
+            # pairs; one Vickrey contract over it would misprice the round
+            raise ValueError(
+                "Round was cleared in book mode; settlement covers single-pair matching only."
+            )
 
         receipt: Dict[str, Any] = {
             "vickrey_rule": "winner pays second-highest applicable price",
@@ -172,13 +205,25 @@ class SettlementService:
         winner_quote_id = match.selected_quote_bid_id
         winning_ask_id = match.selected_ask_bid_id
 
-        winner_quote = db.execute(
-            select(QuoteBid).where(QuoteBid.id == winner_quote_id)
-        ).scalar_one()
-
-        winning_ask = db.execute(
-            select(AskBid).where(AskBid.id == winning_ask_id)
-        ).scalar_one()
+        # both sides in one round-trip (two primary-key lookups)
+        sides = db.execute(
+            select(
+                QuoteBid.participant_id.label("buyer_participant_id"),
+                QuoteBid.signature_hash.label("winner_quote_signature_hash"),
+                AskBid.participant_id.label("developer_participant_id"),
+                AskBid.signature_hash.label("winning_ask_signature_hash"),
+            )
+            .select_from(QuoteBid)
+            .join(AskBid, true())
+            .where(QuoteBid.id == winner_quote_id, AskBid.id == winning_ask_id)
+        ).one()
+
+        pair = {
+            "winner_quote_bid_id": winner_quote_id,
+            "winning_ask_bid_id": winning_ask_id,
+            "max_quote_inr": match.max_quote_inr,
+            "min_ask_total_inr": match.min_ask_total_inr,
+        }
 
         second = self._second_highest_quote(
             db, workflow, project_id, t, winner_quote_id
@@ -193,6 +238,7 @@ class SettlementService:
                 matching_result_id=match.id,
                 status="computed",
                 settled=False,
+                **pair,
                 receipt_json={**receipt, "status": "no_second_price"},
             )
             db.add(row)
@@ -201,9 +247,15 @@ class SettlementService:
             return row
 
         second_id, second_price = second
-        second_quote = db.execute(
-            select(QuoteBid).where(QuoteBid.id == second_id)
-        ).scalar_one()
+
+        # only the signature hash is needed for the second-price quote
+        book = self.books.get_snapshot(db, workflow, project_id, t)
+        if book is not None:
+            second_signature = OrderBookService.quote_signature(book, second_id)
+        else:
+            second_signature = db.execute(
+                select(QuoteBid.signature_hash).where(QuoteBid.id == second_id)
+            ).scalar_one()
 
         # ─────────────────────────────
         # CREATE SETTLEMENT RESULT
@@ -216,52 +268,91 @@ class SettlementService:
             matching_result_id=match.id,
             status="computed",
             settled=True,
+            **pair,
+            second_price_quote_bid_id=second_id,
+            second_price_inr=second_price,
             receipt_json={**receipt, "status": "settled"},
         )
 
         db.add(settlement)
-        db.commit()
-        db.refresh(settlement)
+        db.flush()
 
         # ─────────────────────────────
-        # ✅ CREATE CONTRACT (CRITICAL FIX)
+        # CREATE CONTRACT
         # ─────────────────────────────
-        contract = TokenizedContractRecord(
-            id=uuid.uuid4(),
-            workflow=workflow,
-            project_id=project_id,
-            t=t,
-            settlement_result_id=settlement.id,
-            buyer_participant_id=winner_quote.participant_id,
-            developer_participant_id=winning_ask.participant_id,
-            settlement_price_inr=second_price,
+        contract = ContractService().stage_settlement_contract(
+            db,
+            settlement=settlement,
+            buyer_participant_id=sides.buyer_participant_id,
+            developer_participant_id=sides.developer_participant_id,
         )
 
-        db.add(contract)
-        db.commit()
-        db.refresh(contract)
-
         # ─────────────────────────────
         # 🔐 LEDGER WRITE (NOW VALID)
+        # settlement, contract and ledger entry commit together
         # ─────────────────────────────
-        LedgerService().append_entry(
+        LedgerService().append_entries(
             db,
             workflow=workflow,
             project_id=project_id,
-            contract_id=contract.id,  # ✅ CORRECT
-            entry_type="SETTLEMENT_EXECUTED",
-            payload={
-                "round": t,
-                "contract_id": str(contract.id),
-                "settlement_result_id": str(settlement.id),
-                "winner_quote_bid_id": str(winner_quote_id),
-                "winning_ask_bid_id": str(winning_ask_id),
-                "second_price_quote_bid_id": str(second_id),
-                "second_price_inr": str(second_price),
-                "winner_quote_signature_hash": winner_quote.signature_hash,
-                "winning_ask_signature_hash": winning_ask.signature_hash,
-                "second_quote_signature_hash": second_quote.signature_hash,
-            },
+            entries=[
+                {
+                    "contract_id": contract.id,  # ✅ CORRECT
+                    "entry_type": "SETTLEMENT_EXECUTED",
+                    "payload": {
+                        "round": t,
+                        "contract_id": str(contract.id),
+                        "contract_hash": contract.contract_hash,
+                        "settlement_result_id": str(settlement.id),
+                        "winner_quote_bid_id": str(winner_quote_id),
+                        "winning_ask_bid_id": str(winning_ask_id),
+                        "second_price_quote_bid_id": str(second_id),
+                        "second_price_inr": str(second_price),
+                        "winner_quote_signature_hash": sides.winner_quote_signature_hash,
+                        "winning_ask_signature_hash": sides.winning_ask_signature_hash,
+                        "second_quote_signature_hash": second_signature,
+                    },
+                }
+            ],
         )
 
+        db.commit()
+        db.refresh(settlement)
+
         return settlement
+
+    # ─────────────────────────────────────────────
+    # ASYNC (AsyncSession)
+    # ─────────────────────────────────────────────
+
+    async def get_existing_async(
+        self,
+        db: AsyncSession,
+        workflow: str,
+        project_id: uuid.UUID,
+        t: int,
+    ) -> Optional[SettlementResult]:
+        return (await db.execute(self._existing_stmt(workflow, project_id, t))).scalar_one_or_none()
+
+    async def compute_and_store_if_needed_async(
+        self,
+        db: AsyncSession,
+        *,
+        workflow: str,
+        project_id: uuid.UUID,
+        t: int,
+    ) -> SettlementResult:
+        """
+        Settled rounds are a single awaited read; the first computation
+        (matching + ledger write) runs through the sync path via run_sync.
+        """
+        existing = await self.get_existing_async(db, workflow, project_id, t)
+        if existing:
+            SETTLEMENT_RUNS.inc(workflow=workflow, outcome="stored")
+            return existing
+
+        return await db.run_sync(
+            lambda s: self.compute_and_store_if_needed(
+                s, workflow=workflow, project_id=project_id, t=t
+            )
+        )
@@ -0,0 +1,65 @@
+import uuid
+
+import pytest
+
+from app.core.artifact_cache import MATCHING_RESULT, SETTLEMENT_RESULT, ArtifactCache
+
+PID = uuid.uuid4()
+
+
+def test_loader_runs_once_per_key():
+    cache = ArtifactCache(max_entries=10, max_bytes=1 << 20)
+    calls = []
+
+    def load():
+        calls.append(1)
+        return {"status": "matched"}
+
+    assert cache.get_or_load("saleable", PID, 1, MATCHING_RESULT, load) == {"status": "matched"}
+    assert cache.get_or_load("saleable", str(PID), 1, MATCHING_RESULT, load) == {"status": "matched"}
+    assert len(calls) == 1
+
+    # other rounds / artifacts are separate keys
+    cache.get_or_load("saleable", PID, 2, MATCHING_RESULT, load)
+    cache.get_or_load("saleable", PID, 1, SETTLEMENT_RESULT, load)
+    assert len(calls) == 3
+
+
+def test_loader_error_is_not_cached():
+    cache = ArtifactCache(max_entries=10, max_bytes=1 << 20)
+
+    def not_locked():
+        raise ValueError("Matching can be computed only after round lock.")
+
+    with pytest.raises(ValueError):
+        cache.get_or_load("saleable", PID, 1, MATCHING_RESULT, not_locked)
+    assert cache.get("saleable", PID, 1, MATCHING_RESULT) is None
+
+
+def test_lru_is_bounded_by_entries_and_bytes():
+    cache = ArtifactCache(max_entries=3, max_bytes=1 << 20)
+    for t in range(5):
+        cache.set("saleable", PID, t, MATCHING_RESULT, {"t": t})
+    assert cache.get("saleable", PID, 0, MATCHING_RESULT) is None
+    assert cache.get("saleable", PID, 4, MATCHING_RESULT) == {"t": 4}
+
+    cache = ArtifactCache(max_entries=100, max_bytes=100)
+    for t in range(10):
+        cache.set("saleable", PID, t, MATCHING_RESULT, {"notes": "x" * 30})
+    assert cache._bytes <= 100
+    assert cache.get("saleable", PID, 9, MATCHING_RESULT) is not None
+
+
+def test_shared_tier_serves_and_invalidates_across_instances(tmp_path):
+    a = ArtifactCache(max_entries=10, max_bytes=1 << 20, shared_dir=str(tmp_path))
+    b = ArtifactCache(max_entries=10, max_bytes=1 << 20, shared_dir=str(tmp_path))
+
+    a.set("saleable", PID, 0, MATCHING_RESULT, {"status": "matched"})
+    assert b.get("saleable", PID, 0, MATCHING_RESULT) == {"status": "matched"}
+
+    # b now holds it in-process; an invalidation in a must still reach it
+    a.invalidate("saleable", PID, 0, MATCHING_RESULT)
+    assert b.get("saleable", PID, 0, MATCHING_RESULT) is None
+
+    a.set("saleable", PID, 0, MATCHING_RESULT, {"status": "no_match"})
+    assert b.get("saleable", PID, 0, MATCHING_RESULT) == {"status": "no_match"}
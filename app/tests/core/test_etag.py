@@ -0,0 +1,48 @@
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from app.core.etag import client_has, content_etag, not_modified, set_etag, version_etag
+
+
+def _app(version):
+    app = FastAPI()
+
+    @app.get("/thing")
+    def thing(request: Request, response: Response):
+        etag = version_etag("thing", version[0])
+        if client_has(request, etag):
+            return not_modified(etag)
+        set_etag(response, etag)
+        return {"v": version[0]}
+
+    return app
+
+
+def test_conditional_get_returns_304_until_version_changes():
+    version = [1]
+    client = TestClient(_app(version))
+
+    first = client.get("/thing")
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    again = client.get("/thing", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+
+    # weak form and lists also match
+    assert client.get("/thing", headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+
+    version[0] = 2
+    changed = client.get("/thing", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_etags_are_stable_and_strong():
+    assert version_etag("a", None, 1) == version_etag("a", None, 1)
+    assert version_etag("a", 1) != version_etag("a", 2)
+    assert content_etag({"a": 1, "b": 2}) == content_etag({"b": 2, "a": 1})
+    assert content_etag({"a": 1}).startswith('"')
@@ -0,0 +1,37 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import column
+from sqlalchemy.dialects import postgresql
+
+from app.core.keyset import after, cursor_sql, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip_keeps_microseconds():
+    created = datetime(2026, 10, 17, 4, 12, 53, 851147, tzinfo=timezone.utc)
+    row_id = uuid.uuid4()
+
+    token = encode_cursor(created, row_id)
+    assert token.isascii() and "=" not in token
+    assert decode_cursor(token) == (created, row_id)
+
+
+@pytest.mark.parametrize("token", ["", "garbage!", "AAAA", encode_cursor(datetime.now(timezone.utc), uuid.uuid4())[:-2]])
+def test_malformed_cursor_is_rejected(token):
+    with pytest.raises(ValueError):
+        decode_cursor(token)
+
+
+def test_after_is_a_row_value_comparison():
+    assert after(column("created_at"), column("id"), None) is None
+
+    cursor = (datetime(2026, 1, 1, tzinfo=timezone.utc), uuid.uuid4())
+    sql = str(after(column("created_at"), column("id"), cursor).compile(dialect=postgresql.dialect()))
+    assert sql.startswith("(created_at, id) > (")
+
+
+def test_cursor_sql_packs_the_token_layout():
+    sql = str(cursor_sql(column("created_at"), column("id")).compile(dialect=postgresql.dialect()))
+    assert "int8send(CAST(EXTRACT(epoch FROM created_at)" in sql
+    assert "uuid_send(id)" in sql and sql.startswith("rtrim(translate(encode(")
@@ -0,0 +1,78 @@
+import os
+
+from app.core.metrics import (
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    _MmapValues,
+    _read_dir,
+)
+import app.core.metrics as metrics
+
+
+def _fresh_registry(monkeypatch):
+    reg = MetricsRegistry()
+    monkeypatch.setattr(metrics, "REGISTRY", reg)
+    return reg
+
+
+def test_counter_and_histogram_render_exposition_format(monkeypatch):
+    reg = _fresh_registry(monkeypatch)
+    c = Counter("t_requests_total", "Requests.", ("route",))
+    h = Histogram("t_latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+
+    c.inc(route="/a")
+    c.inc(2, route="/a")
+    for v in (0.05, 0.5, 0.5, 3.0):
+        h.observe(v, route="/a")
+
+    lines = reg.render().splitlines()
+
+    assert "# TYPE t_requests_total counter" in lines
+    assert 't_requests_total{route="/a"} 3' in lines
+    assert "# TYPE t_latency_seconds histogram" in lines
+    assert 't_latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 't_latency_seconds_bucket{route="/a",le="1"} 3' in lines
+    assert 't_latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 't_latency_seconds_count{route="/a"} 4' in lines
+    assert 't_latency_seconds_sum{route="/a"} 4.05' in lines
+
+
+def test_label_values_are_escaped_and_label_names_enforced(monkeypatch):
+    reg = _fresh_registry(monkeypatch)
+    c = Counter("t_total", "T.", ("route",))
+
+    c.inc(route='/a"b')
+    assert 't_total{route="/a\\"b"} 1' in reg.render().splitlines()
+
+    try:
+        c.inc(path="/a")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown label accepted")
+
+
+def test_worker_files_are_summed(tmp_path):
+    a = _MmapValues(str(tmp_path / "metrics_1.db"))
+    b = _MmapValues(str(tmp_path / "metrics_2.db"))
+
+    a.inc("x\x00\x00", 1.0)
+    b.inc("x\x00\x00", 2.0)
+    b.inc("y\x00\x00", 5.0)
+
+    assert _read_dir(str(tmp_path)) == {"x\x00\x00": 3.0, "y\x00\x00": 5.0}
+
+
+def test_worker_file_grows_and_reopens(tmp_path):
+    path = str(tmp_path / "metrics_1.db")
+    a = _MmapValues(path)
+    for i in range(5000):  # > initial 64 KiB of keys
+        a.inc(f"k{i:05d}" + "_" * 20, float(i))
+
+    assert os.path.getsize(path) > 1 << 16
+
+    # a reused PID picks its counters back up
+    again = _MmapValues(path)
+    again.inc("k00007" + "_" * 20, 1.0)
+    assert _read_dir(str(tmp_path))["k00007" + "_" * 20] == 8.0
@@ -0,0 +1,73 @@
+import uuid
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core import middleware_rate_limit
+from app.core.middleware import RequestIdMiddleware
+from app.core.middleware_rate_limit import BidRateLimitMiddleware
+from app.core.rate_limit import RateLimitPolicy, RouteRateLimits
+from app.core.security import create_access_token
+
+
+def _client(monkeypatch) -> TestClient:
+    # 2 quotes, then one token every 2 s
+    limits = RouteRateLimits({("POST", "/bids/quote"): RateLimitPolicy(capacity=2, refill_per_sec=0.5)})
+    monkeypatch.setattr(middleware_rate_limit, "ROUTE_RATE_LIMITS", limits)
+
+    def endpoint(request):
+        return JSONResponse({"request_id": request.state.request_id})
+
+    app = Starlette(routes=[
+        Route("/bids/quote", endpoint, methods=["GET", "POST"]),
+        Route("/other", endpoint, methods=["POST"]),
+    ])
+    app.add_middleware(BidRateLimitMiddleware)
+    app.add_middleware(RequestIdMiddleware)
+    return TestClient(app)
+
+
+def _bearer(participant_id: str) -> dict:
+    return {"Authorization": f"Bearer {create_access_token(participant_id, {'participant_id': participant_id})}"}
+
+
+def test_request_id_is_echoed_or_generated_and_on_request_state(monkeypatch):
+    client = _client(monkeypatch)
+
+    echoed = client.post("/other", headers={"X-Request-Id": "rid-1"})
+    assert echoed.headers["X-Request-Id"] == "rid-1"
+    assert echoed.json() == {"request_id": "rid-1"}
+
+    generated = client.post("/other")
+    rid = generated.headers["X-Request-Id"]
+    assert uuid.UUID(rid)
+    assert generated.json() == {"request_id": rid}
+
+
+def test_bid_post_over_budget_gets_429_with_retry_after(monkeypatch):
+    client = _client(monkeypatch)
+    headers = {**_bearer("p1"), "X-Request-Id": "rid-2"}
+
+    assert [client.post("/bids/quote", headers=headers).status_code for _ in range(2)] == [200, 200]
+    r = client.post("/bids/quote", headers=headers)
+
+    assert r.status_code == 429
+    assert r.headers["Retry-After"] == "2"
+    assert r.headers["X-Request-Id"] == "rid-2"
+    # budgets are per participant
+    assert client.post("/bids/quote", headers=_bearer("p2")).status_code == 200
+
+
+def test_other_routes_and_unauthenticated_requests_pass_through(monkeypatch):
+    client = _client(monkeypatch)
+    headers = _bearer("p1")
+    for _ in range(2):
+        client.post("/bids/quote", headers=headers)
+
+    # the budget is spent, but none of these are limited here
+    assert client.post("/other", headers=headers).status_code == 200
+    assert client.get("/bids/quote", headers=headers).status_code == 200
+    assert client.post("/bids/quote").status_code == 200
+    assert client.post("/bids/quote", headers={"Authorization": "Bearer not-a-jwt"}).status_code == 200
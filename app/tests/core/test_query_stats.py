@@ -0,0 +1,64 @@
+import logging
+
+from sqlalchemy import create_engine, text
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.middleware import RequestIdMiddleware
+from app.core.middleware_query_stats import QueryStatsMiddleware
+from app.db import query_stats
+
+
+def _client(engine, loops: int, *, debug_header: bool) -> TestClient:
+    def endpoint(request):
+        with engine.connect() as conn:
+            for i in range(loops):
+                conn.execute(text("SELECT :i"), {"i": i})
+        return PlainTextResponse("ok")
+
+    app = Starlette(routes=[Route("/x", endpoint)])
+    app.add_middleware(RequestIdMiddleware)
+    app.add_middleware(
+        QueryStatsMiddleware,
+        debug_header=debug_header,
+        slow_request_ms=60_000,
+        repeat_threshold=10,
+    )
+    return TestClient(app)
+
+
+def test_debug_header_reports_per_request_totals():
+    engine = create_engine("sqlite://")
+    query_stats.instrument(engine)
+
+    r = _client(engine, 3, debug_header=True).get("/x")
+
+    assert r.status_code == 200
+    assert r.headers["X-DB-Queries"] == "3"
+    assert float(r.headers["X-DB-Time-Ms"]) >= 0.0
+
+
+def test_repeated_statement_is_logged_with_request_id(caplog):
+    engine = create_engine("sqlite://")
+    query_stats.instrument(engine)
+
+    with caplog.at_level(logging.WARNING, logger="app.core.middleware_query_stats"):
+        r = _client(engine, 12, debug_header=False).get("/x", headers={"X-Request-Id": "rid-1"})
+
+    assert "X-DB-Queries" not in r.headers
+    [record] = caplog.records
+    assert record.request_id == "rid-1"
+    assert record.db_queries == 12
+    assert record.repeated_statements[0]["count"] == 12
+
+
+def test_no_stats_outside_a_request():
+    engine = create_engine("sqlite://")
+    query_stats.instrument(engine)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert query_stats.current() is None
@@ -0,0 +1,67 @@
+from app.core.rate_limit import (
+    InMemoryRateLimiter,
+    RateLimitPolicy,
+    RouteRateLimits,
+    SharedFileRateLimiter,
+)
+
+
+def test_shared_limiter_enforces_one_budget_across_instances(tmp_path):
+    path = str(tmp_path / "rl.bin")
+    a = SharedFileRateLimiter(3, 0.0, path=path, slots=64)
+    b = SharedFileRateLimiter(3, 0.0, path=path, slots=64)
+
+    granted = [a.allow("p1", "POST:/bids"), b.allow("p1", "POST:/bids"), a.allow("p1", "POST:/bids")]
+    assert granted == [True, True, True]
+    assert b.allow("p1", "POST:/bids") is False
+
+    # other participants / routes have their own buckets
+    assert b.allow("p2", "POST:/bids") is True
+    assert a.allow("p1", "POST:/asks") is True
+
+
+def test_shared_limiter_recycles_slots_when_table_is_full(tmp_path):
+    lim = SharedFileRateLimiter(1, 0.0, path=str(tmp_path / "rl.bin"), slots=8)
+
+    # far more keys than slots: the table stays fixed-size and keeps working
+    assert all(lim.allow(f"p{i}", "POST:/bids") for i in range(100))
+
+
+def test_in_memory_limiter_refills():
+    lim = InMemoryRateLimiter(1, 1000.0)
+    assert lim.allow("p1", "POST:/bids") is True
+    lim._buckets[("p1", "POST:/bids")].last_ts -= 1.0
+    assert lim.allow("p1", "POST:/bids") is True
+
+
+def test_in_memory_limiter_caps_tracked_keys():
+    lim = InMemoryRateLimiter(5, 0.0, max_keys=100)
+
+    for i in range(1000):
+        lim.allow(f"p{i}", "POST:/bids")
+
+    assert len(lim) == 100
+
+
+def test_in_memory_limiter_drops_buckets_once_refilled():
+    lim = InMemoryRateLimiter(2, 2.0)
+    lim.allow("p1", "POST:/bids")
+    lim._buckets[("p1", "POST:/bids")].last_ts -= 1.0  # idle long enough to be full
+
+    lim.allow("p2", "POST:/bids")
+
+    assert ("p1", "POST:/bids") not in lim._buckets
+    assert len(lim) == 1
+
+
+def test_route_rate_limits_resolve_policies_under_prefix():
+    limits = RouteRateLimits(
+        {("POST", "/bids/quote"): RateLimitPolicy(capacity=3, refill_per_sec=0.5)},
+        prefix="/api/v1",
+    )
+
+    lim = limits.limiter_for("POST", "/api/v1/bids/quote")
+    assert lim is not None and lim.capacity == 3
+    assert limits.limiter_for("POST", "/api/v1/bids/quote") is lim
+    assert limits.limiter_for("GET", "/api/v1/bids/quote") is None
+    assert limits.limiter_for("POST", "/bids/quote") is None
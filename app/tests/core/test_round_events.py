@@ -0,0 +1,77 @@
+import asyncio
+import threading
+
+from app.core.round_events import AGGREGATES_UPDATED, ROUND_LOCKED, ROUND_OPENED, RoundEvent, RoundEventBus
+
+
+def test_events_reach_subscribers_of_their_project_only():
+    async def main():
+        bus = RoundEventBus(queue_size=10)
+        mine = bus.subscribe("saleable", "p1")
+        other = bus.subscribe("saleable", "p2")
+
+        bus.publish("saleable", "p1", ROUND_OPENED, t=0, state="open")
+
+        # services also publish from threadpool threads
+        worker = threading.Thread(
+            target=bus.publish, args=("saleable", "p1", ROUND_LOCKED), kwargs={"t": 0, "locked_bids": {"quote": 3}}
+        )
+        worker.start()
+        worker.join()
+
+        first = await asyncio.wait_for(mine.queue.get(), 1)
+        second = await asyncio.wait_for(mine.queue.get(), 1)
+        assert (first.type, first.data["state"]) == (ROUND_OPENED, "open")
+        assert (second.type, second.data["locked_bids"]) == (ROUND_LOCKED, {"quote": 3})
+        assert other.queue.empty()
+
+        bus.unsubscribe(mine)
+        bus.unsubscribe(other)
+        assert bus.subscriber_count() == 0
+
+    asyncio.run(main())
+
+
+def test_slow_subscriber_is_flagged_not_blocking():
+    async def main():
+        bus = RoundEventBus(queue_size=2)
+        sub = bus.subscribe("saleable", "p1")
+        for t in range(5):
+            bus.publish("saleable", "p1", ROUND_OPENED, t=t)
+        assert sub.overflowed
+        assert sub.queue.qsize() == 2
+
+    asyncio.run(main())
+
+
+def test_throttled_events_send_the_first_and_the_newest():
+    async def main():
+        bus = RoundEventBus(queue_size=10)
+        sub = bus.subscribe("saleable", "p1")
+        for count in range(1, 4):
+            bus.publish_throttled("saleable", "p1", AGGREGATES_UPDATED, min_interval=0.05, count=count)
+        # a separate window per project
+        bus.publish_throttled("saleable", "p2", AGGREGATES_UPDATED, min_interval=0.05, count=9)
+
+        assert [e.data["count"] for e in drain(sub)] == [1]
+        await asyncio.sleep(0.08)
+        assert [e.data["count"] for e in drain(sub)] == [3]
+        await asyncio.sleep(0.08)
+        assert drain(sub) == []
+
+        # window over: the next one goes out at once
+        bus.publish_throttled("saleable", "p1", AGGREGATES_UPDATED, min_interval=0.05, count=4)
+        assert [e.data["count"] for e in drain(sub)] == [4]
+
+    def drain(sub):
+        out = []
+        while not sub.queue.empty():
+            out.append(sub.queue.get_nowait())
+        return out
+
+    asyncio.run(main())
+
+
+def test_event_json_round_trip():
+    event = RoundEvent(workflow="slum", project_id="p1", type=ROUND_OPENED, data={"t": 1})
+    assert RoundEvent.from_json(event.to_json()) == event
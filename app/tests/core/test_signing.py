@@ -0,0 +1,32 @@
+import uuid
+from decimal import Decimal
+
+from app.core.pools import get_process_pool, shutdown_process_pool
+from app.core.signing import canonical_hash, canonical_hash_many
+
+
+def _payloads():
+    return [
+        {
+            "workflow": "saleable",
+            "project_id": str(uuid.uuid4()),
+            "t": i,
+            "participant_id": f"b{i}",
+            "payload": {"qbundle_inr": str(Decimal("100.50") + i), "note": "ü", "nested": {"b": 1, "a": [2, 1]}},
+        }
+        for i in range(20)
+    ]
+
+
+def test_inline_batch_hashes_match_single_hashes():
+    payloads = _payloads()
+    assert canonical_hash_many(payloads) == [canonical_hash(p) for p in payloads]
+
+
+def test_pooled_batch_hashes_match_single_hashes():
+    payloads = _payloads()
+    try:
+        pooled = get_process_pool().submit(canonical_hash_many, payloads).result(timeout=60)
+    finally:
+        shutdown_process_pool()
+    assert pooled == [canonical_hash(p) for p in payloads]
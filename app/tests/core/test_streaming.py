@@ -0,0 +1,61 @@
+import gzip
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.streaming import coalesce, csv_stream, export_response, gzip_stream
+
+FIELDS = ["id", "action"]
+
+
+def _rows(n):
+    return ({"id": str(i), "action": "BID_SUBMITTED_QUOTE"} for i in range(n))
+
+
+def test_csv_rows_are_coalesced_into_chunks():
+    chunks = list(csv_stream(_rows(1000), FIELDS, chunk_size=4096))
+    assert len(chunks) < 10
+    assert all(len(c) >= 4096 for c in chunks[:-1])
+
+    text = b"".join(chunks).decode()
+    assert text.splitlines()[0] == "id,action"
+    assert len(text.splitlines()) == 1001
+
+    # header is still sent for an empty export
+    assert list(csv_stream(iter(()), FIELDS)) == [b"id,action\r\n"]
+
+
+def test_coalesce_and_gzip_round_trip():
+    parts = [b"x" * 10] * 100
+    assert [len(c) for c in coalesce(parts, chunk_size=256)] == [260, 260, 260, 220]
+
+    body = b"".join(gzip_stream(iter(parts), level=1))
+    assert gzip.decompress(body) == b"x" * 1000
+
+
+def _app():
+    app = FastAPI()
+
+    @app.get("/export.csv")
+    def export(request: Request):
+        return export_response(
+            request, csv_stream(_rows(500), FIELDS), media_type="text/csv; charset=utf-8", filename="a.csv"
+        )
+
+    return app
+
+
+def test_export_response_gzips_only_when_accepted():
+    client = TestClient(_app())
+
+    plain = client.get("/export.csv", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept-Encoding"
+    assert plain.headers["content-disposition"] == 'attachment; filename="a.csv"'
+
+    zipped = client.get("/export.csv", headers={"Accept-Encoding": "br, gzip;q=0.8"})
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.content == plain.content  # decoded by the client
+
+    refused = client.get("/export.csv", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "content-encoding" not in refused.headers
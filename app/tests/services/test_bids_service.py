@@ -0,0 +1,65 @@
+import uuid
+
+from sqlalchemy import select
+
+from app.core.config import get_settings
+from app.core.pools import get_process_pool, shutdown_process_pool
+from app.core.signing import canonical_hash
+from app.models.project import Project
+from app.models.quote_bid import QuoteBid
+from app.services import bids_service
+from app.services.bids_service import BidService
+from app.services.rounds_service import RoundService
+
+
+def test_lock_streams_batches_through_pool_and_inline(db, monkeypatch):
+    settings = get_settings()
+    # 57 bids in 10-row batches: five full batches go to the pool (>= 8 rows),
+    # the 7-row tail is hashed inline; one worker -> at most 2 batches in flight
+    monkeypatch.setattr(settings, "bid_lock_batch_size", 10)
+    monkeypatch.setattr(settings, "bid_lock_pool_min_batch", 8)
+    monkeypatch.setattr(settings, "cpu_pool_workers", 1)
+
+    submitted = []
+
+    class CountingPool:
+        def submit(self, fn, batch):
+            submitted.append(len(batch))
+            return get_process_pool().submit(fn, batch)
+
+    monkeypatch.setattr(bids_service, "get_process_pool", CountingPool)
+
+    project = Project(id=uuid.uuid4(), workflow="saleable", title="Test Project", status="draft")
+    db.add(project)
+    db.commit()
+    rounds = RoundService()
+    rnd = rounds.open_next_round(db, workflow="saleable", project_id=project.id, window_start=None, window_end=None)
+    for i in range(57):
+        db.add(QuoteBid(
+            workflow="saleable", project_id=project.id, round_id=rnd.id, t=0,
+            participant_id=f"b{i:02d}", state="submitted",
+            payload_json={"qbundle_inr": str(100 + i)},
+        ))
+    db.commit()
+    rounds.close_round(db, workflow="saleable", project_id=project.id, t=0)
+
+    try:
+        locked = BidService().lock_all_bids_for_round(db, "saleable", project.id, 0)
+    finally:
+        shutdown_process_pool()
+
+    assert locked["quote"] == 57
+    assert submitted == [10] * 5
+    db.expire_all()
+    bids = db.execute(select(QuoteBid).where(QuoteBid.project_id == project.id)).scalars().all()
+    assert len(bids) == 57
+    for b in bids:
+        assert b.state == "locked"
+        assert b.locked_at is not None
+        assert b.signature_hash == canonical_hash({
+            "workflow": "saleable",
+            "project_id": str(project.id),
+            "t": 0,
+            "participant_id": b.participant_id,
+            "payload": b.payload_json,
+        })
@@ -0,0 +1,40 @@
+import uuid
+
+from app.models.matching_result import MatchingResult
+from app.models.project import Project
+from app.models.settlement_result import SettlementResult
+from app.services.contract_service import ContractService
+from app.services.ledger_service import LedgerService
+from app.services.rounds_service import RoundService
+
+
+def test_contract_created_entry_goes_through_the_ledger(db):
+    project = Project(id=uuid.uuid4(), workflow="saleable", title="Test Project", status="draft")
+    db.add(project)
+    db.commit()
+    rnd = RoundService().open_next_round(
+        db, workflow="saleable", project_id=project.id, window_start=None, window_end=None
+    )
+    match = MatchingResult(workflow="saleable", project_id=project.id, round_id=rnd.id, t=0)
+    db.add(match)
+    db.flush()
+    # a settled round from before settlement wrote its own contract
+    db.add(SettlementResult(
+        workflow="saleable", project_id=project.id, round_id=rnd.id, t=0,
+        matching_result_id=match.id, settled="true",
+    ))
+    db.commit()
+
+    svc = ContractService()
+    contract = svc.create_or_get_latest_for_project(db, workflow="saleable", project_id=project.id)
+
+    ledger = LedgerService()
+    [entry] = ledger.list_entries(db, workflow="saleable", project_id=project.id)
+    assert (entry.seq, entry.entry_type, entry.contract_id) == (1, "CONTRACT_CREATED", contract.id)
+    # same envelope as every other appended entry
+    assert entry.payload_json["entry_type"] == "CONTRACT_CREATED"
+    assert entry.payload_json["payload"]["contract_hash"] == contract.contract_hash
+    assert ledger.verify_chain(db, workflow="saleable", project_id=project.id, full=True)
+
+    assert svc.create_or_get_latest_for_project(db, workflow="saleable", project_id=project.id).id == contract.id
+    assert len(ledger.list_entries(db, workflow="saleable", project_id=project.id)) == 1
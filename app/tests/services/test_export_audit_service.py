@@ -0,0 +1,109 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, literal_column, select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.keyset import cursor_sql, encode_cursor
+from app.core.streaming import csv_stream
+from app.db.pg_copy import copy_available, copy_csv
+from app.models.audit_log import AuditLogRecord
+from app.policies.export_policy import ExportScope
+from app.services.export_audit_service import ExportAuditService
+
+FULL = ExportScope(allow_full=True, participant_id="auditor-1")
+
+
+@pytest.fixture
+def db_psycopg2():
+    # docker-compose runs the app on psycopg2
+    engine = create_engine(make_url(get_settings().database_url).set(drivername="postgresql+psycopg2"))
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection)
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+        engine.dispose()
+
+
+def _audit_rows(db, project_id):
+    rows = [
+        # whole second (isoformat drops the fraction), NULL t / ref_id
+        AuditLogRecord(
+            created_at=datetime(2026, 10, 17, 4, 12, 53, tzinfo=timezone.utc),
+            request_id="rid-1", route="/api/v1/bids/quote", method="POST",
+            actor_participant_id="buyer-1", actor_role="BUYER", workflow="saleable",
+            project_id=project_id, t=None, action="BID_SUBMITTED_QUOTE", payload_hash="a" * 64, ref_id=None,
+        ),
+        # CSV quoting and an empty string (written as nothing, like NULL)
+        AuditLogRecord(
+            created_at=datetime(2026, 10, 17, 4, 12, 53, 851147, tzinfo=timezone.utc),
+            request_id="rid-2", route='/api/v1/"x",y', method="GET",
+            actor_participant_id="auditor-1", actor_role="AUDITOR", workflow="saleable",
+            project_id=project_id, t=3, action="EXPORT", payload_hash="b" * 64, ref_id="",
+        ),
+        # 7 µs: the cursor keeps microseconds
+        AuditLogRecord(
+            created_at=datetime(2026, 10, 18, 0, 0, 0, 7, tzinfo=timezone.utc),
+            request_id="rid-3", route="/api/v1/rounds", method="POST",
+            actor_participant_id="authority-1", actor_role="GOV_AUTHORITY", workflow="saleable",
+            project_id=project_id, t=0, action="ROUND_LOCKED", payload_hash="c" * 64, ref_id="ref-3",
+        ),
+    ]
+    db.add_all(rows)
+    db.flush()
+    return rows
+
+
+def test_cursor_sql_matches_encode_cursor(db):
+    rows = _audit_rows(db, uuid.uuid4())
+
+    got = db.execute(
+        select(AuditLogRecord.id, cursor_sql(AuditLogRecord.created_at, AuditLogRecord.id))
+        .where(AuditLogRecord.id.in_([r.id for r in rows]))
+    ).all()
+
+    expected = {r.id: encode_cursor(r.created_at, r.id) for r in rows}
+    assert dict(got) == expected
+
+
+@pytest.mark.parametrize("session", ["db", "db_psycopg2"])
+def test_copy_csv_matches_python_csv(session, request):
+    db = request.getfixturevalue(session)
+    assert copy_available(db)
+    project_id = uuid.uuid4()
+    rows = _audit_rows(db, project_id)
+    svc = ExportAuditService()
+
+    def python_csv(after=None):
+        out = b"".join(csv_stream(
+            svc.iter_rows(db, scope=FULL, workflow="saleable", project_id=project_id, after=after),
+            svc.fieldnames(),
+        ))
+        return out.replace(b"\r\n", b"\n")
+
+    def copy(after=None):
+        return b"".join(svc.copy_csv(db, scope=FULL, workflow="saleable", project_id=project_id, after=after))
+
+    assert copy() == python_csv()
+    assert copy().count(b"\n") == len(rows) + 1
+
+    resume = (rows[0].created_at, rows[0].id)
+    assert copy(resume) == python_csv(resume)
+
+
+def test_copy_closed_mid_stream_leaves_the_connection_usable(db_psycopg2):
+    db = db_psycopg2
+    stmt = select(literal_column("g").label("n")).select_from(text("generate_series(1, 100000) g"))
+    chunks = copy_csv(db, stmt, chunk_size=1)
+
+    assert next(chunks) == b"n\n"
+    chunks.close()  # the COPY is still running on the worker
+    assert db.execute(text("SELECT 1")).scalar() == 1
@@ -0,0 +1,61 @@
+import hashlib
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.models.export_job import ExportJob
+from app.services.export_job_service import job_params, manifest_for, params_hash, write_artifact
+
+PID = uuid.uuid4()
+
+
+def test_params_hash_is_stable_and_scoped():
+    a = job_params(kind="audit", fmt="csv", workflow="saleable", project_id=PID, t=None)
+    b = job_params(kind="audit", fmt="csv", workflow="saleable", project_id=PID, t=None)
+    assert params_hash(a) == params_hash(b)
+
+    other_format = job_params(kind="audit", fmt="ndjson", workflow="saleable", project_id=PID, t=None)
+    all_projects = job_params(kind="audit", fmt="csv", workflow="saleable", project_id=None, t=None)
+    assert len({params_hash(a), params_hash(other_format), params_hash(all_projects)}) == 3
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"kind": "ledger", "fmt": "csv", "t": None},
+        {"kind": "audit", "fmt": "xlsx", "t": None},
+        {"kind": "contracts", "fmt": "csv", "t": None},
+        {"kind": "audit", "fmt": "csv", "t": 3},
+    ],
+)
+def test_job_params_rejects_invalid_combinations(kwargs):
+    with pytest.raises(ValueError):
+        job_params(workflow=None, project_id=None, **kwargs)
+
+
+def test_write_artifact_reports_size_and_digest(tmp_path):
+    path = tmp_path / "audit.csv"
+    size, digest = write_artifact(str(path), iter([b"id,route\n", b"1,/a\n", b"2,/b\n"]))
+
+    data = path.read_bytes()
+    assert data == b"id,route\n1,/a\n2,/b\n"
+    assert size == len(data)
+    assert digest == hashlib.sha256(data).hexdigest()
+    assert not (tmp_path / "audit.csv.part").exists()
+
+
+def test_manifest_lists_the_artifact():
+    params = job_params(kind="settlement", fmt="ndjson", workflow="saleable", project_id=PID, t=2)
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    job = ExportJob(
+        id=uuid.uuid4(), kind="settlement", format="ndjson", params_json=params,
+        params_hash=params_hash(params), created_at=now, finished_at=now,
+        file_name="settlement.ndjson", row_count=1, byte_size=10, sha256="f" * 64,
+    )
+    manifest = manifest_for(job)
+    assert manifest["params"] == params
+    assert manifest["files"] == [
+        {"name": "settlement.ndjson", "bytes": 10, "rows": 1, "sha256": "f" * 64,
+         "media_type": "application/x-ndjson"}
+    ]
@@ -0,0 +1,180 @@
+import asyncio
+import uuid
+from decimal import Decimal
+
+from app.core.round_events import AGGREGATES_UPDATED, RoundEventBus
+from app.models.project import Project
+from app.models.quote_bid import QuoteBid
+from app.services import feedback_service
+from app.services.feedback_service import FeedbackService, OpenRoundStats, bid_stat_values, depth_series
+from app.services.rounds_service import RoundService
+
+PID = uuid.uuid4()
+
+
+def stats(count, qmin, qmax):
+    return {
+        "quote": {"count_total": count, "qbundle_min_inr": qmin, "qbundle_max_inr": qmax},
+        "ask": {"count_total": 0},
+        "preferences": {"count_total": 0},
+    }
+
+
+def quote(state, qbundle):
+    return QuoteBid(
+        workflow="saleable", project_id=PID, t=0, participant_id="b1", state=state,
+        qbundle_inr=Decimal(qbundle) if qbundle is not None else None,
+    )
+
+
+def test_memo_loads_once_within_ttl():
+    memo = OpenRoundStats(ttl_seconds=60)
+    calls = []
+
+    def load():
+        calls.append(1)
+        return stats(0, None, None)
+
+    memo.get_or_load("saleable", PID, 0, load)
+    memo.get_or_load("saleable", PID, 0, load)
+    assert len(calls) == 1
+
+    expired = OpenRoundStats(ttl_seconds=0)
+    expired.get_or_load("saleable", PID, 0, load)
+    expired.get_or_load("saleable", PID, 0, load)
+    assert len(calls) == 3
+
+
+def test_new_submission_is_folded_in():
+    memo = OpenRoundStats(ttl_seconds=60)
+    before = memo.get_or_load("saleable", PID, 0, lambda: stats(2, "100", "120"))
+
+    memo.bid_changed(quote("submitted", "150"), was_counted=False, previous={})
+
+    after = memo.get_or_load("saleable", PID, 0, lambda: stats(-1, None, None))
+    assert after["quote"] == {"count_total": 3, "qbundle_min_inr": "100", "qbundle_max_inr": "150"}
+    # readers holding the old dict are unaffected
+    assert before["quote"]["count_total"] == 2
+
+
+def test_replacing_a_range_boundary_reloads():
+    memo = OpenRoundStats(ttl_seconds=60)
+    memo.get_or_load("saleable", PID, 0, lambda: stats(2, "100", "120"))
+
+    old = quote("submitted", "120")
+    previous = bid_stat_values(old)
+    old.qbundle_inr = Decimal("110")
+    memo.bid_changed(old, was_counted=True, previous=previous)
+
+    reloaded = memo.get_or_load("saleable", PID, 0, lambda: stats(2, "100", "110"))
+    assert reloaded["quote"]["qbundle_max_inr"] == "110"
+
+
+def test_withdrawn_bid_inside_range_decrements_count():
+    memo = OpenRoundStats(ttl_seconds=60)
+    memo.get_or_load("saleable", PID, 0, lambda: stats(3, "100", "120"))
+
+    memo.bid_changed(quote("draft", "110"), was_counted=True, previous={"qbundle_inr": Decimal("110")})
+
+    after = memo.get_or_load("saleable", PID, 0, lambda: stats(-1, None, None))
+    assert after["quote"] == {"count_total": 2, "qbundle_min_inr": "100", "qbundle_max_inr": "120"}
+
+
+def test_bid_change_publishes_the_feedback_aggregates(db, monkeypatch):
+    project = Project(id=uuid.uuid4(), workflow="saleable", title="Test Project", status="draft")
+    db.add(project)
+    db.commit()
+    rnd = RoundService().open_next_round(
+        db, workflow="saleable", project_id=project.id, window_start=None, window_end=None
+    )
+    bus = RoundEventBus(queue_size=10)
+    monkeypatch.setattr(feedback_service, "ROUND_EVENTS", bus)
+    memo = OpenRoundStats(ttl_seconds=60)
+
+    async def main():
+        sub = bus.subscribe("saleable", project.id)
+        row = QuoteBid(
+            workflow="saleable", project_id=project.id, round_id=rnd.id, t=rnd.t, participant_id="b1",
+            state="submitted", payload_json={}, qbundle_inr=Decimal("150"),
+        )
+        db.add(row)
+        db.commit()
+        # no memo entry yet: loaded from the DB
+        memo.bid_changed(row, was_counted=False, previous={}, db=db)
+        return sub.queue.get_nowait()
+
+    event = asyncio.run(main())
+
+    assert event.type == AGGREGATES_UPDATED
+    assert event.data["t"] == rnd.t
+    # without rnd, aggregate_stats always queries
+    assert event.data["aggregates"] == FeedbackService().aggregate_stats(
+        db, workflow="saleable", project_id=project.id, t=rnd.t
+    )
+    assert event.data["aggregates"]["quote"]["count_total"] == 1
+
+
+def test_depth_series_buckets_and_suppresses_small_cells():
+    out = depth_series(
+        7, Decimal("100"), Decimal("200"), [110.0, 150.5, 190.0], {1: 2, 2: 5},
+        buckets=4, min_bids=5, min_cell=3,
+    )
+    assert (out["p10_inr"], out["p50_inr"], out["p90_inr"]) == ("110.00", "150.50", "190.00")
+    assert [(b["from_inr"], b["to_inr"], b["count"]) for b in out["histogram"]] == [
+        ("100.00", "125.00", None),
+        ("125.00", "150.00", None),  # complementary: 7 - 5 would give the first away
+        ("150.00", "175.00", 0),
+        ("175.00", "200.00", 0),
+    ]
+    assert out["suppressed"] is False
+
+
+def test_depth_series_complementary_cell_is_the_smallest_non_empty_one():
+    out = depth_series(
+        20, Decimal("0"), Decimal("40"), [5.0, 20.0, 35.0], {1: 1, 2: 9, 3: 6, 4: 4},
+        buckets=5, min_bids=5, min_cell=3,
+    )
+    assert [b["count"] for b in out["histogram"]] == [None, 9, 6, None, 0]
+
+
+def test_depth_series_thin_market_keeps_range_only():
+    out = depth_series(
+        2, Decimal("100"), Decimal("120"), [102.0, 110.0, 118.0], {},
+        buckets=10, min_bids=5, min_cell=3,
+    )
+    assert out["suppressed"] is True
+    assert (out["min_inr"], out["max_inr"]) == ("100.00", "120.00")
+    assert out["p50_inr"] is None and out["histogram"] == []
+
+
+def test_market_depth_first_read_race_returns_the_stored_row(db, monkeypatch):
+    from app.models.project import Project
+    from app.models.round_market_depth import RoundMarketDepth
+    from app.services.feedback_service import FeedbackService
+    from app.services.rounds_service import RoundService
+
+    project = Project(id=uuid.uuid4(), workflow="saleable", title="Test Project", status="draft")
+    db.add(project)
+    db.commit()
+    rounds = RoundService()
+    rnd = rounds.open_next_round(db, workflow="saleable", project_id=project.id, window_start=None, window_end=None)
+    rounds.close_round(db, workflow="saleable", project_id=project.id, t=0)
+    rounds.lock_round(db, workflow="saleable", project_id=project.id, t=0)
+
+    # the other reader inserted between our lookup and our insert
+    db.add(RoundMarketDepth(workflow="saleable", project_id=project.id, round_id=rnd.id, t=0, stats_json={"winner": 1}))
+    db.commit()
+    svc = FeedbackService()
+    stored = svc._stored_depth
+    calls = []
+
+    def lookup(*args):
+        calls.append(args)
+        return None if len(calls) == 1 else stored(*args)
+
+    monkeypatch.setattr(svc, "_stored_depth", lookup)
+
+    row = svc.market_depth(db, workflow="saleable", project_id=project.id, t=0, rnd=rnd)
+
+    assert row.stats_json == {"winner": 1}
+    assert len(calls) == 2
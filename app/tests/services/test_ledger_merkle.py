@@ -0,0 +1,43 @@
+import hashlib
+
+import pytest
+
+from app.core.merkle import (
+    inclusion_proof,
+    leaf_hash,
+    merkle_root,
+    node_hash,
+    verify_inclusion,
+)
+
+
+def _leaves(n):
+    return [leaf_hash(hashlib.sha256(str(i).encode()).digest()) for i in range(n)]
+
+
+def test_root_matches_rfc6962_shape_for_three_leaves():
+    a, b, c = _leaves(3)
+
+    assert merkle_root([a, b, c]) == node_hash(node_hash(a, b), c)
+    assert merkle_root([a]) == a
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 5, 8, 13, 1024])
+def test_every_leaf_proves_against_root(n):
+    leaves = _leaves(n)
+    root = merkle_root(leaves)
+
+    for i in (0, n // 2, n - 1):
+        proof = inclusion_proof(i, leaves)
+        assert len(proof) <= max(1, (n - 1).bit_length())
+        assert verify_inclusion(leaves[i], i, n, proof, root)
+
+
+def test_tampered_leaf_or_wrong_index_fails():
+    leaves = _leaves(7)
+    root = merkle_root(leaves)
+    proof = inclusion_proof(4, leaves)
+
+    assert not verify_inclusion(leaves[3], 4, 7, proof, root)
+    assert not verify_inclusion(leaves[4], 5, 7, proof, root)
+    assert not verify_inclusion(leaves[4], 7, 7, proof, root)
@@ -0,0 +1,272 @@
+import uuid
+
+import pytest
+
+from app.core.config import get_settings
+from app.core.pools import get_process_pool, shutdown_process_pool
+from app.services import ledger_service
+from app.services.ledger_service import (
+    _advisory_key,
+    _checkpoint_signature,
+    _LedgerTailCache,
+)
+
+
+def test_advisory_key_is_stable_signed_bigint_per_scope():
+    pid = uuid.uuid4()
+
+    k = _advisory_key("saleable", pid)
+
+    assert k == _advisory_key("saleable", pid)
+    assert k != _advisory_key("clearland", pid)
+    assert -(2**63) <= k < 2**63
+
+
+def test_tail_cache_only_moves_forward():
+    cache = _LedgerTailCache()
+    pid = uuid.uuid4()
+
+    assert cache.get("saleable", pid) is None
+
+    cache.set("saleable", pid, 2, "b" * 64)
+    cache.set("saleable", pid, 1, "a" * 64)  # late writer must not rewind
+    assert cache.get("saleable", pid) == (2, "b" * 64)
+
+    cache.invalidate("saleable", pid)
+    assert cache.get("saleable", pid) is None
+
+
+def test_checkpoint_signature_binds_scope_seq_and_hash():
+    pid = uuid.uuid4()
+    sig = _checkpoint_signature("saleable", pid, 10, "a" * 64)
+
+    assert sig == _checkpoint_signature("saleable", pid, 10, "a" * 64)
+    assert sig != _checkpoint_signature("saleable", pid, 11, "a" * 64)
+    assert sig != _checkpoint_signature("saleable", pid, 10, "b" * 64)
+    assert sig != _checkpoint_signature("saleable", uuid.uuid4(), 10, "a" * 64)
+
+
+def _contract(db):
+    from app.models.matching_result import MatchingResult
+    from app.models.project import Project
+    from app.models.settlement_result import SettlementResult
+    from app.models.tokenized_contract import TokenizedContractRecord
+    from app.services.rounds_service import RoundService
+
+    project = Project(id=uuid.uuid4(), workflow="saleable", title="Test Project", status="draft")
+    db.add(project)
+    db.commit()
+    rnd = RoundService().open_next_round(
+        db, workflow="saleable", project_id=project.id, window_start=None, window_end=None
+    )
+    match = MatchingResult(workflow="saleable", project_id=project.id, round_id=rnd.id, t=0)
+    db.add(match)
+    db.flush()
+    settlement = SettlementResult(
+        workflow="saleable", project_id=project.id, round_id=rnd.id, t=0, matching_result_id=match.id
+    )
+    db.add(settlement)
+    db.flush()
+    contract = TokenizedContractRecord(
+        workflow="saleable", project_id=project.id, settlement_result_id=settlement.id, contract_hash="c" * 64
+    )
+    db.add(contract)
+    db.flush()
+    return project.id, contract.id
+
+
+def test_append_entries_chains_one_batch_after_the_tail(db):
+    from app.services.ledger_service import LedgerService, _TAIL_CACHE
+
+    ledger = LedgerService()
+    pid, cid = _contract(db)
+
+    first = ledger.append_entry(
+        db, workflow="saleable", project_id=pid, contract_id=cid, entry_type="CONTRACT_CREATED", payload={"n": 0}
+    )
+    assert _TAIL_CACHE.get("saleable", pid) == (1, first.entry_hash)
+
+    written = ledger.append_entries(
+        db,
+        workflow="saleable",
+        project_id=pid,
+        entries=[{"contract_id": cid, "entry_type": "NOTE", "payload": {"n": n}} for n in (1, 2, 3)],
+    )
+
+    assert [e.seq for e in written] == [2, 3, 4]
+    assert [e.prev_hash for e in written] == [first.entry_hash] + [e.entry_hash for e in written[:-1]]
+    assert [e.payload_json["payload"] for e in written] == [{"n": 1}, {"n": 2}, {"n": 3}]
+    # uncommitted batch: the cached tail must not be trusted
+    assert _TAIL_CACHE.get("saleable", pid) is None
+
+    more = ledger.append_entries(
+        db, workflow="saleable", project_id=pid, entries=[{"contract_id": cid, "entry_type": "NOTE", "payload": {}}]
+    )
+    assert (more[0].seq, more[0].prev_hash) == (5, written[-1].entry_hash)
+    assert ledger.verify_chain(db, workflow="saleable", project_id=pid, full=True)
+
+
+def test_append_entries_with_nothing_to_write(db):
+    from app.services.ledger_service import LedgerService
+
+    pid, _ = _contract(db)
+
+    assert LedgerService().append_entries(db, workflow="saleable", project_id=pid, entries=[]) == []
+    assert LedgerService().list_entries(db, workflow="saleable", project_id=pid) == []
+
+
+def test_rehashed_rewrite_under_a_checkpoint_is_reported_broken(db):
+    from app.services.ledger_service import LedgerService, _hash
+
+    ledger = LedgerService()
+    pid, cid = _contract(db)
+
+    def append(n):
+        ledger.append_entries(
+            db,
+            workflow="saleable",
+            project_id=pid,
+            entries=[{"contract_id": cid, "entry_type": "NOTE", "payload": {"n": i}} for i in range(n)],
+        )
+        db.commit()
+        return ledger.verify_chain_report(db, workflow="saleable", project_id=pid)
+
+    assert append(2).verified_through_seq == 2
+    assert append(2).verified_through_seq == 4  # checkpoints at 2 and 4
+
+    # rewrite entry 3 and re-hash everything after it: the chain itself
+    # stays self-consistent, only the signed checkpoint at 4 disagrees
+    entries = ledger.list_entries(db, workflow="saleable", project_id=pid)
+    prev = entries[1].entry_hash
+    for e in entries[2:]:
+        if e.seq == 3:
+            e.payload_json = {**e.payload_json, "payload": {"n": 999}}
+        e.prev_hash, e.entry_hash = prev, _hash(prev, e.payload_json)
+        prev = e.entry_hash
+    db.flush()
+
+    for full in (False, True):
+        report = ledger.verify_chain_report(db, workflow="saleable", project_id=pid, full=full)
+        assert not report.valid
+        assert report.first_broken_seq == 4
+        assert (report.verified_through_seq, report.verified_through_hash) == (2, entries[1].entry_hash)
+
+
+@pytest.mark.parametrize("pool_min_batch, pooled_batches", [(4, [5, 5, 5, 5]), (1000, [])])
+def test_fold_stops_at_the_corrupted_entry(db, monkeypatch, pool_min_batch, pooled_batches):
+    from app.services.ledger_service import LedgerService
+
+    settings = get_settings()
+    # 23 entries in 5-row batches; one worker -> at most 2 batches in flight
+    monkeypatch.setattr(settings, "ledger_verify_batch_size", 5)
+    monkeypatch.setattr(settings, "ledger_verify_pool_min_batch", pool_min_batch)
+    monkeypatch.setattr(settings, "cpu_pool_workers", 1)
+
+    submitted = []
+
+    class CountingPool:
+        def submit(self, fn, batch):
+            submitted.append(len(batch))
+            return get_process_pool().submit(fn, batch)
+
+    monkeypatch.setattr(ledger_service, "get_process_pool", CountingPool)
+
+    ledger = LedgerService()
+    pid, cid = _contract(db)
+    entries = ledger.append_entries(
+        db,
+        workflow="saleable",
+        project_id=pid,
+        entries=[{"contract_id": cid, "entry_type": "NOTE", "payload": {"n": i}} for i in range(23)],
+    )
+    # 14 is in the third batch: the two before it fold clean first
+    corrupted = entries[13]
+    corrupted.payload_json = {**corrupted.payload_json, "payload": {"n": -1}}
+    db.flush()
+
+    try:
+        report = ledger._fold_chain(
+            db, workflow="saleable", project_id=pid, after_seq=0, prev_hash=ledger.GENESIS_HASH, full=True
+        )
+    finally:
+        shutdown_process_pool()
+
+    assert not report.valid
+    assert report.first_broken_seq == 14
+    assert (report.verified_through_seq, report.verified_through_hash) == (13, entries[12].entry_hash)
+    assert report.entries_checked == 14
+    # folding stops at the break: the 3-row tail batch is never canonicalized
+    assert submitted == pooled_batches
+
+
+def test_two_writers_on_one_scope_keep_one_chain():
+    # separate connections and real commits: the advisory lock only
+    # matters between transactions
+    import threading
+
+    from sqlalchemy import delete
+
+    from app.models.project import Project
+    from app.models.tokenized_contract import TokenizedContractRecord
+    from app.services.ledger_service import LedgerService
+    from app.tests.conftest import SessionLocal
+
+    with SessionLocal() as setup:
+        pid, cid = _contract(setup)
+        setup.commit()
+
+    ledger = LedgerService()
+    a_holds_lock = threading.Event()
+    b_started = threading.Event()
+    order = []
+    errors = []
+
+    def writer_a():
+        try:
+            with SessionLocal() as s:
+                ledger.append_entries(
+                    s,
+                    workflow="saleable",
+                    project_id=pid,
+                    entries=[{"contract_id": cid, "entry_type": "NOTE", "payload": {"w": "a", "n": n}} for n in range(3)],
+                )
+                a_holds_lock.set()
+                b_started.wait(5)
+                order.append("a")
+                s.commit()
+        except Exception as e:  # surfaced below
+            errors.append(e)
+            a_holds_lock.set()
+
+    def writer_b():
+        try:
+            a_holds_lock.wait(5)
+            with SessionLocal() as s:
+                b_started.set()
+                ledger.append_entry(
+                    s, workflow="saleable", project_id=pid, contract_id=cid, entry_type="NOTE", payload={"w": "b"}
+                )
+                order.append("b")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer_a), threading.Thread(target=writer_b)]
+    try:
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join(30)
+
+        assert errors == []
+        assert order == ["a", "b"]  # b waited for a's transaction
+        with SessionLocal() as s:
+            entries = ledger.list_entries(s, workflow="saleable", project_id=pid)
+            assert [e.seq for e in entries] == [1, 2, 3, 4]
+            assert entries[3].payload_json["payload"] == {"w": "b"}
+            assert entries[3].prev_hash == entries[2].entry_hash
+            assert ledger.verify_chain(s, workflow="saleable", project_id=pid, full=True)
+    finally:
+        with SessionLocal() as s:
+            s.execute(delete(TokenizedContractRecord).where(TokenizedContractRecord.project_id == pid))
+            s.execute(delete(Project).where(Project.id == pid))
+            s.commit()
@@ -0,0 +1,130 @@
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from app.models.matching_result import MatchingResult
+from app.services.matching_service import (
+    BookAsk,
+    BookQuote,
+    MatchingService,
+    clear_book,
+    clear_sorted_book,
+    matching_mode,
+    sort_book,
+)
+
+
+def _ask(total, units="1", ppu=None):
+    total, units = Decimal(total), Decimal(units)
+    return BookAsk(
+        id=uuid.uuid4(),
+        total_ask_inr=total,
+        units=units,
+        unit_price_inr=Decimal(ppu) if ppu else total / units,
+    )
+
+
+def _quote(price):
+    return BookQuote(id=uuid.uuid4(), qbundle_inr=Decimal(price))
+
+
+def test_clears_every_crossing_pair_as_whole_asks():
+    cheap = _ask("100.00", "2")
+    mid = _ask("300.00", "5")
+    dear = _ask("450.00", "1")
+    quotes = [_quote("150.00"), _quote("500.00"), _quote("320.00"), _quote("250.00")]
+
+    pairs = clear_book([dear, cheap, mid], quotes)
+
+    # 500 takes cheap, 320 takes mid; 250 does not cross dear (450)
+    assert [(p.quote_inr, p.ask_bid_id) for p in pairs] == [
+        (Decimal("500.00"), cheap.id),
+        (Decimal("320.00"), mid.id),
+    ]
+    assert [(p.units, p.ask_total_inr) for p in pairs] == [
+        (Decimal("2"), Decimal("100.00")),
+        (Decimal("5"), Decimal("300.00")),
+    ]
+    assert [p.rank for p in pairs] == [0, 1]
+
+
+def test_crosses_on_the_ask_total_like_single_mode():
+    # 100/unit but 300 in total: a 150 bundle quote does not buy it
+    assert clear_book([_ask("300.00", "3")], [_quote("150.00")]) == []
+    assert len(clear_book([_ask("300.00", "3")], [_quote("300.00")])) == 1
+
+
+def test_fractional_asks_are_filled_whole():
+    a = _ask("100.00", "1.5")
+    pairs = clear_book([a], [_quote("200.00"), _quote("150.00")])
+
+    assert [(p.units, p.quote_inr) for p in pairs] == [(Decimal("1.5"), Decimal("200.00"))]
+
+
+def test_no_cross_returns_no_pairs():
+    assert clear_book([_ask("500.00", "3")], [_quote("100.00")]) == []
+    assert clear_book([], [_quote("100.00")]) == []
+    assert clear_book([_ask("100.00", "1")], []) == []
+
+
+def test_sorted_sweep_matches_clear_book():
+    asks = [_ask("300.00", "1"), _ask("100.00", "2")]
+    quotes = [_quote("150.00"), _quote("500.00"), _quote("320.00")]
+
+    assert clear_sorted_book(*sort_book(asks, quotes)) == clear_book(asks, quotes)
+
+
+def test_book_header_is_the_single_mode_pair(db):
+    from app.models.ask_bid import AskBid
+    from app.models.project import Project
+    from app.models.quote_bid import QuoteBid
+    from app.services.rounds_service import RoundService
+
+    project = Project(id=uuid.uuid4(), workflow="saleable", title="Test Project", status="draft")
+    db.add(project)
+    db.commit()
+    rounds = RoundService()
+    rnd = rounds.open_next_round(db, workflow="saleable", project_id=project.id, window_start=None, window_end=None)
+    bid = dict(workflow="saleable", project_id=project.id, round_id=rnd.id, t=0, state="submitted")
+    # cheapest per unit (90) but not the lowest total
+    db.add(AskBid(participant_id="d0", dcu_units=Decimal("10"), ask_price_per_unit_inr=Decimal("90"),
+                  total_ask_inr=Decimal("900"), **bid))
+    db.add(AskBid(participant_id="d1", dcu_units=Decimal("2"), ask_price_per_unit_inr=Decimal("150"),
+                  total_ask_inr=Decimal("300"), **bid))
+    db.add(AskBid(participant_id="d2", dcu_units=Decimal("1"), ask_price_per_unit_inr=Decimal("50"), **bid))
+    for i, q in enumerate(["1000", "280"]):
+        db.add(QuoteBid(participant_id=f"b{i}", qbundle_inr=Decimal(q), payload_json={}, **bid))
+    db.commit()
+    rounds.close_round(db, workflow="saleable", project_id=project.id, t=0)
+    rounds.lock_round(db, workflow="saleable", project_id=project.id, t=0)
+
+    svc = MatchingService()
+    single_ask = svc._select_min_ask(db, "saleable", project.id, 0)
+    single_quote = svc._select_max_quote(db, "saleable", project.id, 0)
+
+    match = svc.compute_and_store_if_needed(db, workflow="saleable", project_id=project.id, t=0, mode="book")
+
+    assert (match.selected_ask_bid_id, match.min_ask_total_inr) == single_ask
+    assert (match.selected_quote_bid_id, match.max_quote_inr) == single_quote
+    assert match.min_ask_total_inr == Decimal("300")
+    assert match.notes_json["price_basis"] == "quote qbundle_inr vs ask total_ask_inr"
+
+    # 1000 takes the 300 ask; 280 does not cross 900; d2 has no total
+    [pair] = svc.list_pairs(db, matching_result_id=match.id)
+    assert (pair.ask_bid_id, pair.units, pair.ask_total_inr) == (single_ask[0], Decimal("2"), Decimal("300"))
+
+
+def test_stored_mode_must_match_requested_mode():
+    book = MatchingResult(notes_json={"mode": "book"})
+    legacy = MatchingResult(notes_json={})
+
+    assert matching_mode(book) == "book"
+    assert matching_mode(legacy) == "single"
+
+    MatchingService._check_mode(book, None)
+    MatchingService._check_mode(book, "book")
+    with pytest.raises(ValueError, match="already matched in book mode"):
+        MatchingService._check_mode(book, "single")
+    with pytest.raises(ValueError, match="already matched in single mode"):
+        MatchingService._check_mode(legacy, "book")
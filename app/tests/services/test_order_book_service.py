@@ -0,0 +1,76 @@
+import uuid
+from decimal import Decimal
+
+from app.models.round_order_book import RoundOrderBook
+from app.services.order_book_service import OrderBookService
+
+
+def _book():
+    q1, q2, q3 = (str(uuid.uuid4()) for _ in range(3))
+    a1, a2 = (str(uuid.uuid4()) for _ in range(2))
+    book = RoundOrderBook(
+        workflow="saleable",
+        project_id=uuid.uuid4(),
+        round_id=uuid.uuid4(),
+        t=0,
+        quotes_json=[
+            {"id": q1, "qbundle_inr": "950.00", "signature_hash": "h1"},
+            {"id": q2, "qbundle_inr": "900.00", "signature_hash": "h2"},
+            {"id": q3, "qbundle_inr": "850.00", "signature_hash": "h3"},
+        ],
+        asks_json=[
+            {"id": a1, "total_ask_inr": "800.00", "dcu_units": "2.0000",
+             "ask_price_per_unit_inr": "400.00", "signature_hash": "s1"},
+            {"id": a2, "total_ask_inr": None, "dcu_units": None,
+             "ask_price_per_unit_inr": None, "signature_hash": "s2"},
+        ],
+        locked_ask_count=2,
+    )
+    return book, (q1, q2, q3), (a1, a2)
+
+
+def test_ranked_quotes_skip_excluded_winner():
+    book, (q1, q2, _), _ = _book()
+
+    ranked = OrderBookService.ranked_quotes(book, exclude=(uuid.UUID(q1),))
+
+    assert ranked[0] == (uuid.UUID(q2), Decimal("900.00"))
+    assert len(ranked) == 2
+
+
+def test_ranked_asks_skip_asks_without_total():
+    book, _, (a1, _) = _book()
+
+    assert OrderBookService.ranked_asks(book) == [(uuid.UUID(a1), Decimal("800.00"))]
+    assert OrderBookService.ranked_asks(book, exclude=(uuid.UUID(a1),)) == []
+
+
+def test_quote_signature_lookup():
+    book, (_, q2, _), _ = _book()
+
+    assert OrderBookService.quote_signature(book, uuid.UUID(q2)) == "h2"
+    assert OrderBookService.quote_signature(book, uuid.uuid4()) is None
+
+
+def test_lock_retried_before_round_flag_keeps_one_snapshot(db):
+    from sqlalchemy import func, select
+
+    from app.models.project import Project
+    from app.services.bids_service import BidService
+    from app.services.rounds_service import RoundService
+
+    project = Project(id=uuid.uuid4(), workflow="saleable", title="Test Project", status="draft")
+    db.add(project)
+    db.commit()
+    rounds = RoundService()
+    rounds.open_next_round(db, workflow="saleable", project_id=project.id, window_start=None, window_end=None)
+    rnd = rounds.close_round(db, workflow="saleable", project_id=project.id, t=0)
+
+    # first lock commits bids + snapshot, then "dies" before rnd.is_locked
+    BidService().lock_all_bids_for_round(db, "saleable", project.id, 0)
+    retried = BidService().lock_all_bids_for_round(db, "saleable", project.id, 0)
+
+    assert retried == {"quote": 0, "ask": 0, "preference": 0}
+    assert db.execute(
+        select(func.count()).select_from(RoundOrderBook).where(RoundOrderBook.round_id == rnd.id)
+    ).scalar_one() == 1
@@ -0,0 +1,30 @@
+import uuid
+
+from app.models.project import Project
+from app.services.params_service import ParamsService
+
+
+def test_t0_payload_is_not_cached_until_publish(db):
+    project = Project(id=uuid.uuid4(), workflow="saleable", title="Test Project", status="draft")
+    db.add(project)
+    db.commit()
+    svc = ParamsService()
+
+    t0, _ = svc.get_or_create_snapshot_payloads(db, "saleable", project.id)
+    assert t0["t"] == 0
+
+    # PUT /saleable/projects/{id} before publish edits the t=0 snapshot in place
+    snap, _ = svc.get_or_create_snapshots(db, "saleable", project.id)
+    snap.payload_json = {"edited": 1}
+    db.commit()
+    assert svc.get_or_create_snapshot_payloads(db, "saleable", project.id)[0] == {"edited": 1}
+
+    snap.payload_json = {"edited": 2}
+    project.is_published = True
+    db.commit()
+    assert svc.get_or_create_snapshot_payloads(db, "saleable", project.id)[0] == {"edited": 2}
+
+    # published snapshots are locked: served from the cache from here on
+    snap.payload_json = {"edited": 3}
+    db.commit()
+    assert svc.get_or_create_snapshot_payloads(db, "saleable", project.id)[0] == {"edited": 2}
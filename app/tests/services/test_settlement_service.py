@@ -0,0 +1,96 @@
+import uuid
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.core.hashing import canonical_dumps, sha256_hex
+from app.models.ask_bid import AskBid
+from app.models.contract_ledger import ContractLedgerEntry
+from app.models.project import Project
+from app.models.quote_bid import QuoteBid
+from app.models.tokenized_contract import TokenizedContractRecord
+from app.services.ledger_service import LedgerService
+from app.services.rounds_service import RoundService
+from app.services.settlement_service import SettlementService
+
+
+def _locked_round(db, quotes, ask_total):
+    project = Project(id=uuid.uuid4(), workflow="saleable", title="Test Project", status="draft")
+    db.add(project)
+    db.commit()
+    rounds = RoundService()
+    rnd = rounds.open_next_round(db, workflow="saleable", project_id=project.id, window_start=None, window_end=None)
+
+    quote_ids = []
+    for i, qbundle in enumerate(quotes):
+        q = QuoteBid(
+            workflow="saleable", project_id=project.id, round_id=rnd.id, t=0,
+            participant_id=f"buyer-{i}", state="submitted", qbundle_inr=Decimal(qbundle),
+            payload_json={"qbundle_inr": qbundle},
+        )
+        db.add(q)
+        db.flush()
+        quote_ids.append(q.id)
+    ask = AskBid(
+        workflow="saleable", project_id=project.id, round_id=rnd.id, t=0,
+        participant_id="developer-0", state="submitted", total_ask_inr=Decimal(ask_total),
+        payload_json={"total_ask_inr": ask_total},
+    )
+    db.add(ask)
+    db.commit()
+
+    rounds.close_round(db, workflow="saleable", project_id=project.id, t=0)
+    rounds.lock_round(db, workflow="saleable", project_id=project.id, t=0)
+    return project, quote_ids, ask.id
+
+
+def test_matched_round_settles_at_second_price_with_contract_and_ledger_entry(db):
+    project, (q_low, q_high, q_mid), ask_id = _locked_round(db, ["900.00", "1000.00", "950.00"], "800.00")
+
+    row = SettlementService().compute_and_store_if_needed(db, workflow="saleable", project_id=project.id, t=0)
+
+    assert row.settled == "true"
+    assert row.winner_quote_bid_id == q_high
+    assert row.winning_ask_bid_id == ask_id
+    assert row.second_price_quote_bid_id == q_mid
+    assert row.second_price_inr == Decimal("950.00")
+    assert row.max_quote_inr == Decimal("1000.00")
+    assert row.min_ask_total_inr == Decimal("800.00")
+
+    contract = db.execute(
+        select(TokenizedContractRecord).where(TokenizedContractRecord.settlement_result_id == row.id)
+    ).scalar_one()
+    assert contract.version == 1
+    assert contract.ownership_details_json["buyer_participant_id"] == "buyer-1"
+    assert contract.ownership_details_json["developer_participant_id"] == "developer-0"
+    assert contract.transaction_data_json["vickrey"]["second_price_inr"] == "950.00"
+    assert contract.contract_hash == sha256_hex(canonical_dumps({
+        "ownership_details": contract.ownership_details_json,
+        "transaction_data": contract.transaction_data_json,
+        "legal_obligations": contract.legal_obligations_json,
+    }))
+
+    entries = LedgerService().list_entries(db, workflow="saleable", project_id=project.id)
+    assert [(e.entry_type, e.contract_id) for e in entries] == [("SETTLEMENT_EXECUTED", contract.id)]
+    assert entries[0].payload_json["payload"]["contract_hash"] == contract.contract_hash
+    assert LedgerService().verify_chain(db, workflow="saleable", project_id=project.id, full=True)
+
+    again = SettlementService().compute_and_store_if_needed(db, workflow="saleable", project_id=project.id, t=0)
+    assert again.id == row.id
+    assert db.execute(
+        select(ContractLedgerEntry.id).where(ContractLedgerEntry.project_id == project.id)
+    ).scalars().all() == [entries[0].id]
+
+
+def test_single_quote_records_the_pair_without_settling(db):
+    project, (q_only,), ask_id = _locked_round(db, ["1000.00"], "800.00")
+
+    row = SettlementService().compute_and_store_if_needed(db, workflow="saleable", project_id=project.id, t=0)
+
+    assert row.settled == "false"
+    assert row.receipt_json["status"] == "no_second_price"
+    assert (row.winner_quote_bid_id, row.winning_ask_bid_id) == (q_only, ask_id)
+    assert row.second_price_inr is None
+    assert db.execute(
+        select(TokenizedContractRecord.id).where(TokenizedContractRecord.project_id == project.id)
+    ).first() is None
@@ -0,0 +1,286 @@
+"""
+Throughput of the three /export routes: per-row sends (before) vs
+coalesced chunks (after), with and without gzip.
+
+    python benchmarks/bench_export.py [--audit-rows 200000] [--contract-rows 20000]
+                                      [--settlement-rows 1] [--requests 5] [--db]
+
+By default the export services are replaced by generators of rows shaped
+like the real ones, so the numbers are route + streaming + middleware cost
+without the database. --db also runs /export/audit.csv against Postgres
+(needs DATABASE_URL and the audit_log_records table; seeds --audit-rows rows
+for a throwaway project and deletes them afterwards), once through the
+Python CSV writer and once through COPY ... TO STDOUT (EXPORT_COPY).
+
+"sends" counts the http.response.body messages the app hands to the server,
+one per chunk: each is a threadpool hop for the sync generator plus a
+transport write.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import io
+import os
+import statistics
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://localhost/unused")
+os.environ.setdefault("JWT_SECRET_KEY", "bench")
+
+import httpx  # noqa: E402
+
+import app.main  # noqa: E402,F401  (registers every model)
+from app.api.v1 import export as export_routes  # noqa: E402
+from app.core.config import get_settings  # noqa: E402
+from app.core.keyset import encode_cursor  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.services.export_audit_service import ExportAuditService  # noqa: E402
+from app.services.export_contracts_service import ExportContractsService  # noqa: E402
+from app.services.export_settlement_service import ExportSettlementService  # noqa: E402
+
+sys.path.insert(0, os.path.dirname(__file__))
+from bench_middleware import _drop_audit, _seed_audit  # noqa: E402
+
+
+# The previous per-row generators, kept here as the baseline.
+
+def _legacy_csv_stream(rows: Iterable[Dict[str, Any]], fieldnames: List[str]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=fieldnames, extrasaction="ignore")
+    writer.writeheader()
+    yield buf.getvalue().encode("utf-8")
+    buf.seek(0)
+    buf.truncate(0)
+
+    for r in rows:
+        writer.writerow(r)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate(0)
+
+
+@contextmanager
+def _legacy_streaming():
+    saved = export_routes.csv_stream, export_routes.coalesce
+    export_routes.csv_stream = _legacy_csv_stream
+    export_routes.coalesce = lambda chunks: chunks
+    try:
+        yield
+    finally:
+        export_routes.csv_stream, export_routes.coalesce = saved
+
+
+# Synthetic row producers with the shapes the real services emit.
+
+_CREATED = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _audit_rows(n: int):
+    def iter_rows(self, db, *, scope, workflow, project_id, **kw):
+        for i in range(n):
+            yield {
+                "id": str(uuid.UUID(int=i)),
+                "created_at": "2026-01-01T00:00:00.000000+00:00",
+                "request_id": f"bench-{i}",
+                "route": "/api/v1/bids/quote",
+                "method": "POST",
+                "actor_participant_id": f"p{i % 97}",
+                "actor_role": "BUYER",
+                "workflow": workflow,
+                "project_id": str(project_id),
+                "t": 1,
+                "action": "BID_SUBMITTED_QUOTE",
+                "status": "ok",
+                "payload_hash": "0" * 64,
+                "ref_id": None,
+                "cursor": encode_cursor(_CREATED, uuid.UUID(int=i)),
+            }
+    return iter_rows
+
+
+def _contract_dicts(n: int):
+    def iter_contract_dicts(self, db, *, scope, workflow, project_id, **kw):
+        for i in range(n):
+            yield {
+                "contractId": str(uuid.UUID(int=i)),
+                "workflow": workflow,
+                "projectId": str(project_id),
+                "version": i + 1,
+                "createdAtIso": "2026-01-01T00:00:00.000000+00:00",
+                "recordHash": "a" * 64,
+                "prevHash": "b" * 64,
+                "ownership": {"participant_id": f"p{i % 97}", "units": 1},
+                "transaction": {"buyer_participant_id": f"p{i % 97}", "price_inr": "1250000.00"},
+                "obligations": {"penalty_inr": "0.00"},
+                "cursor": encode_cursor(_CREATED, uuid.UUID(int=i)),
+            }
+    return iter_contract_dicts
+
+
+def _settlement_rows(n: int):
+    def iter_rows(self, db, *, scope, workflow, project_id, t, **kw):
+        for i in range(n):
+            yield {
+                "settlement_result_id": str(uuid.UUID(int=i)),
+                "workflow": workflow,
+                "project_id": str(project_id),
+                "t": t,
+                "created_at": "2026-01-01T00:00:00.000000+00:00",
+                "winning_quote_bid_id": str(uuid.UUID(int=i + 1)),
+                "winning_ask_bid_id": str(uuid.UUID(int=i + 2)),
+                "second_price_reference": "1200000.00",
+                "winner_participant_id": f"p{i % 97}",
+            }
+    return iter_rows
+
+
+@contextmanager
+def _synthetic(audit: int, contracts: int, settlement: int, *, real_audit: bool = False):
+    saved = (
+        ExportAuditService.iter_rows,
+        ExportContractsService.iter_contract_dicts,
+        ExportSettlementService.iter_rows,
+    )
+    if not real_audit:
+        ExportAuditService.iter_rows = _audit_rows(audit)
+    ExportContractsService.iter_contract_dicts = _contract_dicts(contracts)
+    ExportSettlementService.iter_rows = _settlement_rows(settlement)
+    try:
+        yield
+    finally:
+        (
+            ExportAuditService.iter_rows,
+            ExportContractsService.iter_contract_dicts,
+            ExportSettlementService.iter_rows,
+        ) = saved
+
+
+class _CountSends:
+    def __init__(self, app):
+        self.app = app
+        self.sends = 0
+
+    async def __call__(self, scope, receive, send):
+        async def counting_send(message):
+            if message["type"] == "http.response.body":
+                self.sends += 1
+            await send(message)
+
+        await self.app(scope, receive, counting_send)
+
+
+async def _measure(url: str, n: int, headers: dict) -> tuple[list[float], int, int]:
+    counter = _CountSends(app.main.app)
+    transport = httpx.ASGITransport(app=counter)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        (await client.get(url, headers=headers)).raise_for_status()  # warm-up
+        counter.sends = 0
+        samples, wire = [], 0
+        for _ in range(n):
+            t0 = time.perf_counter()
+            r = await client.get(url, headers=headers)
+            samples.append(time.perf_counter() - t0)
+            r.raise_for_status()
+            wire = r.num_bytes_downloaded  # as sent (compressed), not the decoded body
+        return samples, counter.sends // n, wire
+
+
+def _report(label: str, samples: list[float], rows: int, sends: int, wire: int) -> None:
+    p50 = statistics.median(samples)
+    print(
+        f"{label:<40} p50 {p50 * 1e3:9.1f} ms   {rows / p50:>11,.0f} rows/s   "
+        f"{sends:>7,} sends   {wire / 1024:>9,.0f} KiB on the wire"
+    )
+
+
+@contextmanager
+def _engine(copy: bool):
+    settings = get_settings()
+    saved = settings.export_copy
+    settings.export_copy = copy
+    try:
+        yield
+    finally:
+        settings.export_copy = saved
+
+
+async def _run_routes(prefix: str, project_id: uuid.UUID, rows: Dict[str, int], n: int, auth: dict, only=None, modes=None) -> None:
+    routes = {
+        "audit.csv": f"{prefix}/export/audit.csv?workflow=saleable&projectId={project_id}",
+        "contracts.json": f"{prefix}/export/contracts.json?workflow=saleable&projectId={project_id}",
+        "settlement.csv": f"{prefix}/export/settlement.csv?workflow=saleable&projectId={project_id}&t=1",
+    }
+    modes = modes or [
+        ("before", {"Accept-Encoding": "identity"}, _legacy_streaming),
+        ("chunked", {"Accept-Encoding": "identity"}, None),
+        ("chunked+gzip", {"Accept-Encoding": "gzip"}, None),
+    ]
+    for route, url in routes.items():
+        if only and route not in only:
+            continue
+        for mode, enc, patch in modes:
+            headers = {**auth, **enc}
+            if patch is not None:
+                with patch():
+                    samples, sends, wire = await _measure(url, n, headers)
+            else:
+                samples, sends, wire = await _measure(url, n, headers)
+            _report(f"{route:<15} [{mode}]", samples, rows[route], sends, wire)
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--audit-rows", type=int, default=200_000)
+    ap.add_argument("--contract-rows", type=int, default=20_000)
+    ap.add_argument("--settlement-rows", type=int, default=1)  # one settlement per round
+    ap.add_argument("--requests", type=int, default=5)
+    ap.add_argument("--db", action="store_true")
+    args = ap.parse_args()
+
+    settings = get_settings()
+    print(f"chunk {settings.export_chunk_bytes} bytes, gzip level {settings.export_gzip_level}")
+
+    prefix = settings.api_prefix
+    token = create_access_token(
+        "bench", {"participant_id": "bench-auditor", "role": "GOV_AUTHORITY", "workflow": "saleable"}
+    )
+    auth = {"Authorization": f"Bearer {token}"}
+    rows = {
+        "audit.csv": args.audit_rows,
+        "contracts.json": args.contract_rows,
+        "settlement.csv": args.settlement_rows,
+    }
+    project_id = uuid.uuid4()
+
+    with _synthetic(args.audit_rows, args.contract_rows, args.settlement_rows), _engine(copy=False):
+        await _run_routes(prefix, project_id, rows, args.requests, auth)
+
+    if not args.db:
+        return
+
+    print("-- Postgres")
+    _seed_audit(project_id, args.audit_rows)
+    try:
+        identity, gzip = {"Accept-Encoding": "identity"}, {"Accept-Encoding": "gzip"}
+        modes = [
+            ("python", identity, lambda: _engine(copy=False)),
+            ("python+gzip", gzip, lambda: _engine(copy=False)),
+            ("copy", identity, lambda: _engine(copy=True)),
+            ("copy+gzip", gzip, lambda: _engine(copy=True)),
+        ]
+        with _synthetic(0, 0, 0, real_audit=True):
+            await _run_routes(prefix, project_id, rows, args.requests, auth, only={"audit.csv"}, modes=modes)
+    finally:
+        _drop_audit(project_id)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
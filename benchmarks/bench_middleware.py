@@ -0,0 +1,178 @@
+"""
+Request latency through the middleware stack: BaseHTTPMiddleware (before)
+vs plain ASGI (after).
+
+    python benchmarks/bench_middleware.py [--requests 2000] [--audit-rows 20000]
+
+- trivial endpoint: GET /api/v1/health
+- streaming export: GET /api/v1/export/audit.csv (needs DATABASE_URL and
+  the audit_log_records table; seeds --audit-rows rows for a throwaway
+  project and deletes them afterwards)
+
+Both stacks run RequestId + BidRateLimit in the same order as app.main.
+Requests go through httpx's in-process ASGI transport, so the numbers are
+framework + middleware + handler cost, without sockets.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from typing import Callable
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://localhost/unused")
+os.environ.setdefault("JWT_SECRET_KEY", "bench")
+
+import httpx  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+from sqlalchemy import delete, insert  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+from starlette.responses import JSONResponse, Response  # noqa: E402
+
+import app.main as _app_main  # noqa: E402,F401  (registers every model)
+from app.api.v1.router import v1_router  # noqa: E402
+from app.core.config import get_settings  # noqa: E402
+from app.core.middleware import RequestIdMiddleware  # noqa: E402
+from app.core.middleware_rate_limit import BidRateLimitMiddleware, _participant_id  # noqa: E402
+from app.core.rate_limit import ROUTE_RATE_LIMITS  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.models.audit_log import AuditLogRecord  # noqa: E402
+
+
+# The previous BaseHTTPMiddleware implementations, kept here as the baseline.
+
+class _LegacyRequestIdMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, header_name: str = "X-Request-Id"):
+        super().__init__(app)
+        self.header_name = header_name
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        rid = request.headers.get(self.header_name) or str(uuid.uuid4())
+        request.state.request_id = rid
+        response = await call_next(request)
+        response.headers[self.header_name] = rid
+        return response
+
+
+class _LegacyBidRateLimitMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        method = request.method.upper()
+        limiter = ROUTE_RATE_LIMITS.limiter_for(method, request.url.path)
+        if limiter is not None:
+            participant_id = _participant_id(request.scope)
+            if participant_id and not await limiter.allow_async(
+                participant_id, f"{method}:{request.url.path}"
+            ):
+                return JSONResponse(status_code=429, content={"detail": "Rate limit exceeded."})
+        return await call_next(request)
+
+
+def _build(legacy: bool) -> FastAPI:
+    settings = get_settings()
+    api = FastAPI()
+    if legacy:
+        api.add_middleware(_LegacyBidRateLimitMiddleware)
+        api.add_middleware(_LegacyRequestIdMiddleware, header_name=settings.request_id_header)
+    else:
+        api.add_middleware(BidRateLimitMiddleware)
+        api.add_middleware(RequestIdMiddleware, header_name=settings.request_id_header)
+    api.include_router(v1_router, prefix=settings.api_prefix)
+    return api
+
+
+async def _measure(api: FastAPI, url: str, n: int, headers: dict) -> list[float]:
+    transport = httpx.ASGITransport(app=api)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(min(50, n)):  # warm-up
+            (await client.get(url, headers=headers)).raise_for_status()
+        out = []
+        for _ in range(n):
+            t0 = time.perf_counter()
+            r = await client.get(url, headers=headers)
+            out.append(time.perf_counter() - t0)
+            r.raise_for_status()
+        return out
+
+
+def _report(label: str, samples: list[float]) -> None:
+    samples = sorted(samples)
+    p50 = statistics.median(samples) * 1e3
+    p99 = samples[int(len(samples) * 0.99) - 1] * 1e3
+    print(f"{label:<32} p50 {p50:8.3f} ms   p99 {p99:8.3f} ms")
+
+
+def _seed_audit(project_id: uuid.UUID, rows: int) -> None:
+    with SessionLocal() as db:
+        chunk = 5000
+        for lo in range(0, rows, chunk):
+            db.execute(
+                insert(AuditLogRecord),
+                [
+                    {
+                        "id": uuid.uuid4(),
+                        "request_id": f"bench-{i}",
+                        "route": "/api/v1/bids/quote",
+                        "method": "POST",
+                        "actor_participant_id": f"p{i % 97}",
+                        "actor_role": "BUYER",
+                        "workflow": "saleable",
+                        "project_id": project_id,
+                        "t": 1,
+                        "action": "BID_SUBMITTED_QUOTE",
+                        "payload_hash": "0" * 64,
+                    }
+                    for i in range(lo, min(rows, lo + chunk))
+                ],
+            )
+        db.commit()
+
+
+def _drop_audit(project_id: uuid.UUID) -> None:
+    with SessionLocal() as db:
+        db.execute(delete(AuditLogRecord).where(AuditLogRecord.project_id == project_id))
+        db.commit()
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=2000)
+    ap.add_argument("--audit-rows", type=int, default=20000)
+    ap.add_argument("--export-requests", type=int, default=30)
+    ap.add_argument("--no-db", action="store_true")
+    args = ap.parse_args()
+
+    prefix = get_settings().api_prefix
+    stacks = {"BaseHTTPMiddleware": _build(legacy=True), "plain ASGI": _build(legacy=False)}
+
+    for name, api in stacks.items():
+        _report(f"health      [{name}]", await _measure(api, f"{prefix}/health", args.requests, {}))
+
+    if args.no_db:
+        return
+
+    project_id = uuid.uuid4()
+    token = create_access_token(
+        "bench", {"participant_id": "bench-auditor", "role": "GOV_AUTHORITY", "workflow": "saleable"}
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+    url = f"{prefix}/export/audit.csv?workflow=saleable&projectId={project_id}"
+
+    _seed_audit(project_id, args.audit_rows)
+    try:
+        for name, api in stacks.items():
+            _report(
+                f"audit.csv   [{name}]",
+                await _measure(api, url, args.export_requests, headers),
+            )
+    finally:
+        _drop_audit(project_id)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+"""
+Per-check cost of the rate limiter backends.
+
+    python benchmarks/bench_rate_limit.py [--checks 200000] [--procs 4] [--db]
+
+- memory: per-process dict (baseline)
+- shared: mmap'd file shared by worker processes (single process, then
+  --procs processes hammering the same participants concurrently)
+- db:     Postgres UPSERT (needs DATABASE_URL and the rate_limit_buckets table)
+
+Also checks that the shared backend enforces one budget across processes:
+N processes draining one bucket together must get exactly `capacity` tokens.
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://localhost/unused")
+os.environ.setdefault("JWT_SECRET_KEY", "bench")
+
+from app.core.rate_limit import (  # noqa: E402
+    DatabaseRateLimiter,
+    InMemoryRateLimiter,
+    SharedFileRateLimiter,
+)
+
+
+def _per_check_us(limiter, checks: int, participants: int = 1000) -> float:
+    keys = [f"p{i}" for i in range(participants)]
+    t0 = time.perf_counter()
+    for i in range(checks):
+        limiter.allow(keys[i % participants], "POST:/api/v1/bids/quote")
+    return (time.perf_counter() - t0) / checks * 1e6
+
+
+def _shared_worker(path: str, checks: int, out) -> None:
+    lim = SharedFileRateLimiter(10**9, 0.0, path=path)
+    out.put(_per_check_us(lim, checks))
+
+
+def _drain_worker(path: str, key: str, tries: int, out) -> None:
+    lim = SharedFileRateLimiter(100, 0.0, path=path)
+    out.put(sum(lim.allow(key, "POST:/api/v1/bids/quote") for _ in range(tries)))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--checks", type=int, default=200_000)
+    ap.add_argument("--procs", type=int, default=4)
+    ap.add_argument("--db", action="store_true")
+    args = ap.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "rl.bin")
+    ctx = mp.get_context("spawn")
+
+    print(f"memory           {_per_check_us(InMemoryRateLimiter(10**9, 0.0), args.checks):7.2f} us/check")
+    print(f"shared (1 proc)  {_per_check_us(SharedFileRateLimiter(10**9, 0.0, path=path), args.checks):7.2f} us/check")
+
+    q = ctx.Queue()
+    procs = [ctx.Process(target=_shared_worker, args=(path, args.checks, q)) for _ in range(args.procs)]
+    for p in procs:
+        p.start()
+    per = [q.get() for _ in procs]
+    for p in procs:
+        p.join()
+    print(f"shared ({args.procs} procs) {sum(per) / len(per):7.2f} us/check (mean under contention)")
+
+    key = str(uuid.uuid4())
+    procs = [ctx.Process(target=_drain_worker, args=(path, key, 100, q)) for _ in range(args.procs)]
+    for p in procs:
+        p.start()
+    granted = sum(q.get() for _ in procs)
+    for p in procs:
+        p.join()
+    print(f"shared budget    {granted} of 100 tokens granted across {args.procs} processes")
+
+    if args.db:
+        print(f"db               {_per_check_us(DatabaseRateLimiter(10**9, 0.0), max(1, args.checks // 100)):7.2f} us/check")
+
+
+if __name__ == "__main__":
+    main()